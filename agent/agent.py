@@ -1,23 +1,97 @@
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
 from agent.schema import TradeDecision
 from agent.prompt import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
-from langchain_anthropic import ChatAnthropic
+from agent.cache import DecisionCache, decision_key
+from monitor.metrics import get_metrics
 
-llm = ChatAnthropic(model="claude-sonnet-4-20250514")
+DEFAULT_MODEL = "claude-sonnet-4-20250514"
+MODEL_NAME = DEFAULT_MODEL
 
-parser = PydanticOutputParser(pydantic_object=TradeDecision)
+# langchain and the Anthropic client take over a second to import, so the chain is
+# built on first use (or by use_llm); a rules-only run never imports them at all
+llm = None
+parser = None
+chain = None
+PROMPT_TEXT = None
+rules = None            # agent.rules.RulesDecider when the rules backend is selected
 
-prompt = ChatPromptTemplate.from_messages([
-    ("system", SYSTEM_PROMPT),
-    ("human", USER_PROMPT_TEMPLATE + "\n{format_instructions}")
-])
+decision_cache = DecisionCache()
 
-chain = prompt | llm | parser
 
+def _build_chain():
+    global parser, chain, PROMPT_TEXT
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import PydanticOutputParser
 
-def evaluate_with_agent(features: dict):
-    return chain.invoke({
-        **features,
-        "format_instructions": parser.get_format_instructions()
-    })
+    parser = PydanticOutputParser(pydantic_object=TradeDecision)
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_PROMPT),
+        ("human", USER_PROMPT_TEMPLATE + "\n{format_instructions}")
+    ])
+    chain = prompt | llm | parser
+
+    # any edit to the prompt changes the key, so stale decisions are never reused
+    PROMPT_TEXT = SYSTEM_PROMPT + USER_PROMPT_TEMPLATE + parser.get_format_instructions()
+
+
+def get_chain():
+    """The prompt | llm | parser chain; with no model selected, ChatAnthropic is created here, on first use."""
+    global llm
+    if chain is None:
+        if llm is None:
+            from monitor.backends import anthropic_llm
+            llm = anthropic_llm(MODEL_NAME)
+        _build_chain()
+    return chain
+
+
+def use_llm(new_llm=None, model_name=None):
+    """
+    Swap the chat model behind the chain (e.g. agent.stub.StubChatModel for
+    offline runs). None selects the default Claude model, built lazily.
+    """
+    global llm, chain, MODEL_NAME, rules
+    llm = new_llm
+    chain = None
+    rules = None
+    if new_llm is None:
+        MODEL_NAME = model_name or DEFAULT_MODEL
+    else:
+        MODEL_NAME = model_name or getattr(new_llm, "model", type(new_llm).__name__)
+        _build_chain()
+
+
+def use_rules(decider):
+    """Decide with `decider.decide(features)` instead of an LLM (see agent.rules)."""
+    global rules
+    rules = decider
+
+
+def agent_inputs(features: dict) -> dict:
+    get_chain()
+    return {**features, "format_instructions": parser.get_format_instructions()}
+
+
+def evaluate_with_agent(features: dict, use_cache=True, refresh=False):
+    """
+    Ask the agent for a TradeDecision. Decisions are memoized on disk by
+    (features, prompt, model); refresh=True forces a miss and overwrites the entry.
+    The rules backend answers directly: it is cheaper than a cache lookup.
+    """
+    if rules is not None:
+        get_metrics().inc("rules_decisions_total")
+        return rules.decide(features)
+
+    chain = get_chain()
+    key = decision_key(features, PROMPT_TEXT, MODEL_NAME)
+    if use_cache and not refresh:
+        cached = decision_cache.get(key)
+        if cached is not None:
+            get_metrics().inc("agent_cache_total", result="hit")
+            return TradeDecision(**cached)
+        get_metrics().inc("agent_cache_total", result="miss")
+
+    get_metrics().inc("agent_calls_total")
+    decision = chain.invoke(agent_inputs(features))
+    if use_cache:
+        decision_cache.put(key, decision.model_dump())
+    return decision
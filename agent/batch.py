@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+import agent.agent as agent
+from agent.cache import decision_key
+from agent.schema import TradeDecision
+from monitor.metrics import get_metrics
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate_per_sec apart (no limit when rate_per_sec is falsy)."""
+
+    def __init__(self, rate_per_sec=None):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def aevaluate_many(features_list, max_concurrency=8, rate_per_sec=None, use_cache=True, return_cached=False):
+    """
+    Evaluate many feature dicts concurrently through the same prompt | llm | parser
+    chain as evaluate_with_agent(). Cached decisions are served without a call;
+    at most `max_concurrency` requests are in flight and they start no faster
+    than `rate_per_sec`. Returns decisions in input order (None where a call failed);
+    with return_cached=True, also whether each one was served from the cache.
+    """
+    if agent.rules is not None:
+        decisions = [agent.evaluate_with_agent(features) for features in features_list]
+        return (decisions, [False] * len(decisions)) if return_cached else decisions
+
+    chain = agent.get_chain()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = RateLimiter(rate_per_sec)
+
+    async def one(features):
+        key = decision_key(features, agent.PROMPT_TEXT, agent.MODEL_NAME)
+        if use_cache:
+            cached = agent.decision_cache.get(key)
+            if cached is not None:
+                get_metrics().inc("agent_cache_total", result="hit")
+                return TradeDecision(**cached), True
+            get_metrics().inc("agent_cache_total", result="miss")
+
+        async with semaphore:
+            await limiter.wait()
+            get_metrics().inc("agent_calls_total")
+            try:
+                decision = await chain.ainvoke(agent.agent_inputs(features))
+            except Exception as e:
+                print(f"❌ Agent error @ {features.get('current_time')}: {e}")
+                return None, False
+
+        if use_cache:
+            agent.decision_cache.put(key, decision.model_dump())
+        return decision, False
+
+    results = await asyncio.gather(*(one(f) for f in features_list))
+    decisions, cached = [r[0] for r in results], [r[1] for r in results]
+    return (decisions, cached) if return_cached else decisions
+
+
+def evaluate_many(features_list, max_concurrency=8, rate_per_sec=None, use_cache=True, return_cached=False):
+    """Blocking wrapper around aevaluate_many()."""
+    if not features_list:
+        return ([], []) if return_cached else []
+    return asyncio.run(aevaluate_many(features_list, max_concurrency, rate_per_sec, use_cache, return_cached))
@@ -0,0 +1,142 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+
+CACHE_PATH = Path("agent_cache.sqlite")
+MAX_ENTRIES = 50_000
+MAX_AGE_DAYS = 30
+EVICT_EVERY = 100          # puts between eviction passes
+
+# not rendered into the prompt, so they must not split the cache
+IGNORED_FEATURES = {"current_time"}
+
+
+def _quantize(value, decimals):
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)) or hasattr(value, "item"):
+        value = float(value)
+        if math.isnan(value):
+            return None
+        return round(value, decimals)
+    return value
+
+
+def decision_key(features: dict, prompt_text: str, model: str, decimals=4) -> str:
+    """Canonical hash of the quantized feature dict + prompt text + model name."""
+    canonical = {
+        name: _quantize(value, decimals)
+        for name, value in sorted(features.items())
+        if name not in IGNORED_FEATURES
+    }
+    payload = json.dumps({"features": canonical, "prompt": prompt_text, "model": model},
+                         sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class DecisionCache:
+    """
+    Disk-backed (SQLite) memo of agent decisions with LRU eviction by age and
+    entry count. Also remembers the last lookup in memory so identical
+    consecutive evaluations in the live loop never touch the disk or the LLM.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_entries=MAX_ENTRIES, max_age_days=MAX_AGE_DAYS):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_age_sec = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._last = None          # (key, decision dict, created)
+        self._conn = None
+        self._pid = None
+
+    def _db(self):
+        # one connection per process — never share a sqlite handle across a fork
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS decisions ("
+                " key TEXT PRIMARY KEY, decision TEXT NOT NULL,"
+                " created REAL NOT NULL, last_access REAL NOT NULL, hit_count INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON decisions(last_access)")
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key):
+        now = time.time()
+        if self._last is not None and self._last[0] == key:
+            if now - self._last[2] <= self.max_age_sec:
+                self.hits += 1
+                return self._last[1]
+            self._last = None          # same age limit as the disk lookup
+
+        db = self._db()
+        row = db.execute("SELECT decision, created FROM decisions WHERE key = ?", (key,)).fetchone()
+        if row is None or now - row[1] > self.max_age_sec:
+            self.misses += 1
+            return None
+
+        db.execute("UPDATE decisions SET last_access = ?, hit_count = hit_count + 1 WHERE key = ?", (now, key))
+        self.hits += 1
+        decision = json.loads(row[0])
+        self._last = (key, decision, row[1])
+        return decision
+
+    def put(self, key, decision: dict):
+        now = time.time()
+        self._db().execute(
+            "INSERT OR REPLACE INTO decisions (key, decision, created, last_access) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(decision), now, now),
+        )
+        self._last = (key, decision, now)
+        self._puts += 1
+        if self._puts % EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self):
+        """Drop entries older than max_age, then least-recently-used ones beyond max_entries."""
+        db = self._db()
+        db.execute("DELETE FROM decisions WHERE created < ?", (time.time() - self.max_age_sec,))
+        db.execute(
+            "DELETE FROM decisions WHERE key IN ("
+            " SELECT key FROM decisions ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self):
+        self._db().execute("DELETE FROM decisions")
+        self._last = None
+
+    def stats(self) -> dict:
+        entries = self._db().execute("SELECT COUNT(*) FROM decisions").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Inspect or reset the agent decision cache")
+    cli.add_argument("command", choices=["stats", "evict", "clear"])
+    cli.add_argument("--path", default=str(CACHE_PATH))
+    args = cli.parse_args()
+
+    cache = DecisionCache(args.path)
+    if args.command == "evict":
+        cache.evict()
+    elif args.command == "clear":
+        cache.clear()
+    print(cache.stats())
@@ -0,0 +1,74 @@
+from agent.schema import TradeDecision
+from strategy.gate import load_thresholds
+
+
+DEFAULT_RISK = {
+    "safe_move_multiplier": 1.3,     # short strike at least this many expected moves away
+    "min_premium_ratio": 5.5,
+    "min_confidence": 0.65,
+    "max_vix": 20,
+}
+
+
+class RulesDecider:
+    """
+    Deterministic stand-in for the LLM, driven by config alone: the gate
+    thresholds, `indicators.overbought/oversold` and the `risk:` section.
+    Follows the same playbook as the prompt — stretched RSI above the neutral
+    band → SELL_CALL, below it → SELL_PUT, fade only once the move has
+    stalled — and scores confidence by how stretched RSI is, minus a penalty
+    per risk flag. Below `risk.min_confidence` the answer is NONE.
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        indicators = config.get("indicators") or {}
+        self.thresholds = load_thresholds(config)
+        self.risk = {**DEFAULT_RISK, **(config.get("risk") or {})}
+        self.overbought = indicators.get("overbought", 70)
+        self.oversold = indicators.get("oversold", 30)
+        self.flag_penalty = 0.1
+
+    def _stretch(self, rsi, side) -> float:
+        """0 at the edge of the neutral band, 1 at overbought/oversold or beyond."""
+        t = self.thresholds
+        if side == "SELL_CALL":
+            edge, full = t["rsi_neutral_high"], self.overbought
+            return min(max((rsi - edge) / max(full - edge, 1e-9), 0.0), 1.0)
+        edge, full = t["rsi_neutral_low"], self.oversold
+        return min(max((edge - rsi) / max(edge - full, 1e-9), 0.0), 1.0)
+
+    def decide(self, features: dict) -> TradeDecision:
+        rsi = features["rsi"]
+        if rsi >= self.thresholds["rsi_neutral_high"]:
+            trade = "SELL_CALL"
+        elif rsi <= self.thresholds["rsi_neutral_low"]:
+            trade = "SELL_PUT"
+        else:
+            return TradeDecision(trade="NONE", confidence=0.2, reasons=[f"RSI {rsi} is neutral"], risk_flags=[])
+
+        stretch = self._stretch(rsi, trade)
+        side = "overbought" if trade == "SELL_CALL" else "oversold"
+        level = self.overbought if trade == "SELL_CALL" else self.oversold
+        reasons = [f"RSI {rsi} is {stretch:.0%} of the way from neutral to {side} ({level})"]
+        flags = []
+
+        # still moving into the short strike → wait for the pullback
+        direction = 1 if trade == "SELL_CALL" else -1
+        if direction * features["ret_5min_pct"] > 0 and direction * features["ema21_slope_5min"] > 0:
+            flags.append("momentum_not_exhausted")
+        if features["premium_ratio"] < self.risk["min_premium_ratio"]:
+            flags.append("thin_premium")
+        if features["vix"] > self.risk["max_vix"]:
+            flags.append("high_vix")
+
+        confidence = round(min(max(0.5 + 0.4 * stretch - self.flag_penalty * len(flags), 0.0), 1.0), 2)
+        if confidence < self.risk["min_confidence"]:
+            return TradeDecision(trade="NONE", confidence=confidence,
+                                 reasons=reasons + [f"confidence {confidence} below {self.risk['min_confidence']}"],
+                                 risk_flags=flags)
+
+        distance = self.risk["safe_move_multiplier"] * features["expected_move"]
+        strike = features["current_price"] + direction * distance
+        reasons.append(f"short strike beyond {strike:.0f} ({self.risk['safe_move_multiplier']}× expected move)")
+        return TradeDecision(trade=trade, confidence=confidence, reasons=reasons, risk_flags=flags)
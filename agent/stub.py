@@ -0,0 +1,61 @@
+import asyncio
+import json
+import re
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+RSI_PATTERN = re.compile(r"RSI \(\d+\):\s*(-?[\d.]+|nan)")
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Offline stand-in for ChatAnthropic. Reads the RSI out of the rendered prompt
+    and answers with a deterministic TradeDecision JSON (overbought → SELL_CALL,
+    oversold → SELL_PUT, otherwise NONE), so the agent chain, the cache and the
+    batch path can run and be benchmarked without network.
+    """
+
+    model: str = "stub"
+    latency_sec: float = 0.0          # simulated round-trip time
+    overbought: float = 65.0
+    oversold: float = 35.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-trade-decision"
+
+    def decide(self, text: str) -> dict:
+        match = RSI_PATTERN.search(text)
+        rsi = float(match.group(1)) if match else float("nan")
+
+        if rsi >= self.overbought:
+            trade = "SELL_CALL"
+        elif rsi <= self.oversold:
+            trade = "SELL_PUT"
+        else:
+            return {"trade": "NONE", "confidence": 0.2, "reasons": [f"RSI {rsi} is not stretched"], "risk_flags": []}
+
+        confidence = round(0.5 + min(abs(rsi - 50) / 50, 0.45), 2)
+        return {"trade": trade, "confidence": confidence, "reasons": [f"RSI {rsi} is stretched"], "risk_flags": ["stub"]}
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        text = "\n".join(str(m.content) for m in messages)
+        message = AIMessage(content=json.dumps(self.decide(text)))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency_sec:
+            time.sleep(self.latency_sec)
+        return self._result(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency_sec:
+            await asyncio.sleep(self.latency_sec)
+        return self._result(messages)
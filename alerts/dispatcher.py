@@ -0,0 +1,209 @@
+import asyncio
+import queue
+import random
+import threading
+import time
+
+
+TELEGRAM_MAX_LEN = 4096
+
+
+class TelegramTransport:
+    """Sends through one long-lived telegram.Bot per token (silent → log bot, loud → alert bot)."""
+
+    def __init__(self, log_token, alert_token, chat_id):
+        self.tokens = {True: log_token, False: alert_token}
+        self.chat_id = chat_id
+        self._bots = {}
+
+    async def send(self, text, silent):
+        from telegram import Bot
+
+        token = self.tokens[silent]
+        bot = self._bots.get(token)
+        if bot is None:
+            bot = self._bots[token] = Bot(token=token)
+        await bot.send_message(
+            chat_id=self.chat_id,
+            text=text,
+            disable_notification=silent,      # silent = True → no sound/vibration
+            disable_web_page_preview=True,
+        )
+
+    async def close(self):
+        for bot in self._bots.values():
+            try:
+                await bot.shutdown()
+            except Exception:
+                pass
+        self._bots.clear()
+
+
+class FakeTransport:
+    """In-memory transport for tests/benchmarks: records messages, can add latency or fail."""
+
+    def __init__(self, latency_sec=0.0, fail_times=0):
+        self.latency_sec = latency_sec
+        self.fail_times = fail_times
+        self.sent = []          # (text, silent)
+        self.attempts = 0
+
+    async def send(self, text, silent):
+        self.attempts += 1
+        if self.latency_sec:
+            await asyncio.sleep(self.latency_sec)
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise ConnectionError("fake transport failure")
+        self.sent.append((text, silent))
+
+    async def close(self):
+        pass
+
+
+class NullTransport:
+    """Headless runs: alerts are already printed to the console, so sending is a no-op."""
+
+    async def send(self, text, silent):
+        pass
+
+    async def close(self):
+        pass
+
+
+class AlertDispatcher:
+    """
+    Non-blocking alert sender. submit() only enqueues; a background thread with
+    its own event loop drains the bounded queue, merges bursts of silent log
+    messages into one Telegram message (at most one per `coalesce_sec`), and
+    retries failed sends with jittered exponential backoff. Loud alerts are
+    never merged. Call flush()/close() before exiting.
+    """
+
+    def __init__(self, transport, maxsize=1000, coalesce_sec=2.0, max_retries=3, backoff_sec=1.0):
+        self.transport = transport
+        self.coalesce_sec = coalesce_sec
+        self.max_retries = max_retries
+        self.backoff_sec = backoff_sec
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._stash = None                 # loud message pulled while coalescing
+        self._thread = None
+        self._loop = None
+
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+    # ─── caller side ───
+
+    def start(self):
+        if self._thread is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, message: str, silent: bool = False) -> bool:
+        """Queue a message; returns False (and counts a drop) if the queue is full."""
+        self.start()
+        with self._idle:
+            try:
+                self._queue.put_nowait((message, silent))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self._pending += 1
+        return True
+
+    def flush(self, timeout=10.0) -> bool:
+        """Block until everything queued so far has been sent (or given up on)."""
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self, timeout=10.0):
+        """Flush, then stop the thread; gives up (leaving the daemon thread behind) after `timeout`."""
+        if self._thread is None:
+            return
+        deadline = time.monotonic() + timeout
+        self.flush(timeout)
+        try:
+            self._queue.put(None, timeout=max(deadline - time.monotonic(), 0.001))
+        except queue.Full:
+            print(f"⚠️ Alert queue still full after {timeout}s — closing without waiting for the sender")
+            self._thread = None
+            return
+        self._thread.join(max(deadline - time.monotonic(), 0.0))
+        self._thread = None
+
+    # ─── background thread ───
+
+    def _done(self, count):
+        with self._idle:
+            self._pending -= count
+            self._idle.notify_all()
+
+    def _next(self, timeout=None):
+        if self._stash is not None:
+            item, self._stash = self._stash, None
+            return item
+        return self._queue.get(timeout=timeout)
+
+    def _collect_silent(self, first):
+        """Merge silent messages that arrive within coalesce_sec of the first one."""
+        parts, size = [first], len(first)
+        deadline = time.monotonic() + self.coalesce_sec
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._next(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None or not item[1] or size + len(item[0]) + 2 > TELEGRAM_MAX_LEN:
+                self._stash = item
+                break
+            parts.append(item[0])
+            size += len(item[0]) + 2
+        return "\n\n".join(parts), len(parts)
+
+    async def _send_with_retry(self, text, silent):
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.transport.send(text, silent)
+                self.sent += 1
+                return True
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(f"Telegram error (giving up after {attempt + 1} tries): {e}")
+                    self.failed += 1
+                    return False
+                delay = self.backoff_sec * (2 ** attempt)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        while True:
+            item = self._next()
+            if item is None:
+                break
+            text, silent = item
+            count = 1
+            if silent and self.coalesce_sec:
+                text, count = self._collect_silent(text)
+            try:
+                self._loop.run_until_complete(self._send_with_retry(text, silent))
+            finally:
+                self._done(count)
+
+        self._loop.run_until_complete(self.transport.close())
+        self._loop.close()
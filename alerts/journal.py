@@ -0,0 +1,152 @@
+import atexit
+import glob
+import io
+import json
+import math
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import fcntl          # POSIX advisory locks; Windows falls back to plain O_APPEND
+except ImportError:
+    fcntl = None
+
+
+JOURNAL_FIELDS = [
+    "timestamp", "strategy", "spx_price", "expected_move", "vix", "rsi",
+    "macd", "macd_signal", "macd_hist", "bb_upper", "bb_middle", "bb_lower",
+    "premium_ratio", "time_to_close_min", "ema9", "ema21", "ema50",
+    "ema21_slope_5min", "ema21_slope_15min", "ema21_slope_30min",
+    "ret_5min_pct", "ret_15min_pct", "ret_30min_pct",
+    "suggestion", "confidence", "reasons",
+    "action_taken_by_you",   # entered trade, ignored
+    "result",                # profit, loss, breakeven
+]
+JOURNAL_SUFFIX = "_alert_log.jsonl"
+JOURNAL_PATTERNS = ["*" + JOURNAL_SUFFIX, "*_alert_log.csv"]      # journals + the CSV logs written before them
+
+
+def _clean(value):
+    if hasattr(value, "item"):          # numpy scalars
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class DecisionJournal:
+    """
+    Buffered, append-only decision log: one JSON line per row in
+    <directory>/<date>_alert_log.jsonl. Rows are flushed when `flush_rows`
+    are buffered, when `flush_sec` has passed since the last flush (checked
+    on append and by flush_if_due(), which the live loop calls after every
+    tick), or at exit. Each flush is a single O_APPEND write under an exclusive lock, so
+    parallel backtest workers never interleave partial rows.
+    """
+
+    def __init__(self, directory=".", flush_rows=50, flush_sec=30.0):
+        self.directory = Path(directory)
+        self.flush_rows = flush_rows
+        self.flush_sec = flush_sec
+        self._buffer = {}          # path → [encoded lines]
+        self._rows = 0
+        self._last_flush = time.monotonic()
+
+    def path_for(self, timestamp) -> Path:
+        return self.directory / (str(timestamp).split(" ")[0] + JOURNAL_SUFFIX)
+
+    def append(self, row: dict):
+        record = {field: _clean(row.get(field, "")) for field in JOURNAL_FIELDS}
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        self._buffer.setdefault(self.path_for(record["timestamp"]), []).append(line)
+        self._rows += 1
+        if self._rows >= self.flush_rows:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self):
+        """Flush buffered rows once `flush_sec` has passed since the last flush."""
+        if self._rows and time.monotonic() - self._last_flush >= self.flush_sec:
+            self.flush()
+
+    def flush(self):
+        for path, lines in self._buffer.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with lock_journal(path) as fd:
+                os.write(fd, "".join(lines).encode())
+        self._buffer.clear()
+        self._rows = 0
+        self._last_flush = time.monotonic()
+
+
+@contextmanager
+def lock_journal(path):
+    """
+    Append-only fd on `path` under an exclusive lock. If the file was swapped
+    out while waiting for the lock (backtest.score rewrites journals with
+    os.replace under this same lock), the new file is opened instead, so an
+    append never lands in a replaced copy.
+    """
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                current = os.stat(path).st_ino == os.fstat(fd).st_ino
+            except FileNotFoundError:
+                current = False
+            if not current:
+                os.close(fd)
+                continue
+        try:
+            yield fd
+        finally:
+            os.close(fd)     # also releases the lock
+        return
+
+
+def journal_paths(patterns=JOURNAL_PATTERNS) -> list:
+    """Sorted, de-duplicated files matching a glob or a list of globs / paths."""
+    patterns = [patterns] if isinstance(patterns, (str, Path)) else patterns
+    return sorted({path for pattern in patterns for path in glob.glob(str(pattern))})
+
+
+def load_journals(patterns=JOURNAL_PATTERNS) -> pd.DataFrame:
+    """
+    Load every file matching `patterns` (a glob or a list of globs / paths)
+    into one frame with a parsed, sorted `timestamp`. By default that is every
+    <date>_alert_log.jsonl journal and every <date>_alert_log.csv written
+    before the journal existed.
+    """
+    paths = journal_paths(patterns)
+
+    frames = []
+    jsonl = [p for p in paths if p.endswith(".jsonl")]
+    if jsonl:
+        data = b"".join(Path(p).read_bytes() for p in jsonl)
+        if data.strip():
+            frames.append(pd.read_json(io.BytesIO(data), lines=True, dtype=False, convert_dates=False))
+    frames += [pd.read_csv(p) for p in paths if p.endswith(".csv")]
+
+    if not frames:
+        return pd.DataFrame(columns=JOURNAL_FIELDS)
+    df = pd.concat(frames, ignore_index=True).reindex(columns=JOURNAL_FIELDS)
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    return df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+
+_journal = None
+
+
+def get_journal() -> DecisionJournal:
+    """Process-wide journal writing to the working directory, flushed at exit."""
+    global _journal
+    if _journal is None:
+        _journal = DecisionJournal()
+        atexit.register(_journal.flush)
+    return _journal
@@ -0,0 +1,216 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from data.fetcher import fetch_market_data
+from indicators.technicals import add_indicators
+from strategy.drift import DriftDetector
+from strategy.features import FeatureStore, build_feature_frame
+from strategy.gate import gate_mask, is_actionable, load_thresholds, ALERT_COOLDOWN_MINUTES
+
+
+def load_session_bars(config, date_in, mode="backtest"):
+    """
+    Warm-up day + the session itself in one frame, plus the position where the
+    session starts. Uses the same previous-business-day warm-up as main().
+    """
+    interval = config[mode]["interval_min"]
+    warmup_day = (pd.to_datetime(date_in) - pd.offsets.BDay(1)).strftime("%Y-%m-%d")
+
+    warmup = fetch_market_data(config["api"], interval, date_in=warmup_day)
+    session = fetch_market_data(config["api"], interval, date_in=date_in)
+    bars = pd.concat([warmup, session])
+    bars = bars[~bars.index.duplicated(keep="first")].sort_index()
+    return bars, len(bars) - len(session)
+
+
+def session_features(config, date_in, mode="backtest"):
+    """Indicator rows and the feature frame for every bar of one session (one indicator pass)."""
+    bars, session_start = load_session_bars(config, date_in, mode=mode)
+    indicators = add_indicators(bars, config["indicators"]["rsi_period"],
+                                bar_minutes=config[mode]["interval_min"]).iloc[session_start:]
+    return indicators, build_feature_frame(indicators)
+
+
+def run_session(config, date_in, evaluate=None, start_time=None, last_alert_time=None,
+                cooldown_minutes=ALERT_COOLDOWN_MINUTES, log=False, mode="backtest"):
+    """
+    Replay one session without the per-bar fetch/sleep loop.
+
+    Indicators and features are computed once for every bar, the gate runs as a
+    boolean mask over the whole day, and only bars that pass it (and are not in
+    cooldown) are sent to the agent, in timestamp order — debounced by the
+    configured DriftDetector, like the live loop. Returns one row per session
+    bar with the gate verdict, drift verdict, cooldown flag and agent decision.
+    """
+    from agent.agent import decision_cache
+    if evaluate is None:
+        from agent.agent import evaluate_with_agent as evaluate
+
+    started = time.perf_counter()
+    store, features, gate = _gated_session(config, date_in, start_time, mode)
+
+    def decide(i):
+        # a hit on the agent's decision cache is not an agent call
+        hits = decision_cache.hits
+        decision = evaluate(store[i])
+        return decision, decision_cache.hits > hits
+
+    results = _resolve_cooldown(features, store, gate, decide,
+                                last_alert_time, cooldown_minutes, log, drift=DriftDetector.from_config(config))
+    results.attrs["date"] = date_in
+    results.attrs["agent_calls"] = _agent_calls(results)
+    results.attrs["wall_time_sec"] = time.perf_counter() - started
+    if log:
+        _flush_logs()
+    return results
+
+
+def run_sessions_batched(config, dates, max_concurrency=8, rate_per_sec=None,
+                         cooldown_minutes=ALERT_COOLDOWN_MINUTES, log=False, mode="backtest"):
+    """
+    Like run_session() for many days, but every gated bar of every day goes to
+    the agent at once (agent.batch.evaluate_many); cooldown suppression is then
+    resolved per day in timestamp order. Bars that end up inside a cooldown
+    were still evaluated — that is the price of not waiting on each answer —
+    and there is no drift debounce, since every call is already in flight.
+    Returns {date: results}.
+    """
+    from agent.batch import evaluate_many
+
+    started = time.perf_counter()
+    sessions, candidates = {}, []
+    for date_in in dates:
+        try:
+            store, features, gate = _gated_session(config, date_in, None, mode)
+        except Exception as e:
+            print(f"⚠️ {date_in} skipped: {e}")
+            continue
+        sessions[date_in] = (store, features, gate)
+        candidates += [(date_in, i, store[i]) for i in np.flatnonzero(gate[0])]
+
+    decisions, cached = evaluate_many([c[2] for c in candidates], max_concurrency=max_concurrency,
+                                      rate_per_sec=rate_per_sec, return_cached=True)
+    by_bar = {(date_in, i): answer for (date_in, i, _), answer in zip(candidates, zip(decisions, cached))}
+    wall_time = (time.perf_counter() - started) / max(len(sessions), 1)
+
+    out = {}
+    for date_in, (store, features, gate) in sessions.items():
+        results = _resolve_cooldown(features, store, gate,
+                                    lambda i: by_bar.get((date_in, i), (None, False)),
+                                    None, cooldown_minutes, log)
+        results.attrs["date"] = date_in
+        # every call was made, including the ones a cooldown then discards
+        results.attrs["agent_calls"] = sum(not hit for (day, _), (decision, hit) in by_bar.items()
+                                           if day == date_in and decision is not None)
+        results.attrs["wall_time_sec"] = wall_time
+        out[date_in] = results
+    if log:
+        _flush_logs()
+    return out
+
+
+def _agent_calls(results) -> int:
+    """Decisions that took an agent call: not re-used by the drift check nor served from the decision cache."""
+    return int((results["evaluated"] & ~results["reused"] & ~results["cached"]).sum())
+
+
+def _flush_logs():
+    # pool workers exit without running atexit hooks, so flush explicitly
+    from alerts.console_alert import flush_alerts
+    from alerts.journal import get_journal
+    get_journal().flush()
+    flush_alerts()
+
+
+def _gated_session(config, date_in, start_time, mode):
+    indicators, features = session_features(config, date_in, mode=mode)
+    if start_time:
+        start = pd.to_datetime(f"{date_in} {start_time}").tz_localize(indicators.index.tz)
+        indicators = indicators[indicators.index >= start]
+        features = features[features.index >= start]
+
+    passed, reasons = gate_mask(features, load_thresholds(config))
+    # the agent, journal and alerts read gated bars as FeatureRecords of one column store
+    return FeatureStore.from_frame(indicators), features, (passed, reasons)
+
+
+def _resolve_cooldown(features, store, gate, decide, last_alert_time, cooldown_minutes, log, drift=None):
+    """
+    The cooldown state machine as a single sweep over the gated bars.
+    decide(i) returns the agent decision for bar i (or None if there is none)
+    and whether it came from the decision cache (`cached`).
+    With a DriftDetector, bars it debounces reuse the previous decision
+    (`reused`) or are skipped next to the last alert, as in the live loop.
+    """
+    passed, reasons = gate
+    results = features.copy()
+    results["gate_pass"] = passed
+    results["gate_reason"] = reasons
+    results["evaluated"] = False
+    results["trade"] = None
+    results["confidence"] = np.nan
+    results["reasons"] = None
+    results["alerted"] = False
+    results["drift"] = None
+    results["reused"] = False
+    results["cached"] = False
+
+    timestamps = features.index
+    cooldown = pd.Timedelta(minutes=cooldown_minutes)
+    alert_times = [last_alert_time] if last_alert_time is not None else []
+    for i in np.flatnonzero(passed):
+        now = timestamps[i]
+        if last_alert_time is not None and now - last_alert_time < cooldown:
+            continue
+
+        row = results.index[i]
+        reused = False
+        if drift is not None:
+            reason, _ = drift.check(store[i])
+            results.at[row, "drift"] = reason
+            if reason == "near_alert":
+                continue
+            reused = reason == "no_drift"
+
+        decision, cached = (drift.decision, False) if reused else decide(i)
+        if decision is None:
+            continue
+        if drift is not None and not reused:
+            drift.remember(store[i], decision)
+        alerted = is_actionable(decision)
+
+        results.at[row, "evaluated"] = True
+        results.at[row, "trade"] = decision.trade
+        results.at[row, "confidence"] = decision.confidence
+        results.at[row, "reasons"] = "; ".join(decision.reasons)
+        results.at[row, "alerted"] = alerted
+        results.at[row, "reused"] = reused
+        results.at[row, "cached"] = cached
+
+        if log:
+            from alerts.console_alert import log_decision, send_alert
+            log_decision(decision.model_dump(), store[i])
+            if alerted:
+                send_alert(decision.model_dump(), store[i])
+
+        if alerted:
+            last_alert_time = now
+            alert_times.append(now)
+            if drift is not None:
+                drift.record_alert(now, store[i]["current_price"])
+
+    # every bar that the live loop would have skipped for cooldown
+    results["in_cooldown"] = _in_cooldown(timestamps, alert_times, cooldown)
+    return results
+
+
+def _in_cooldown(timestamps, alert_times, cooldown):
+    if not alert_times:
+        return np.zeros(len(timestamps), dtype=bool)
+    alerts = pd.DatetimeIndex(alert_times).as_unit("ns").asi8
+    ts = timestamps.as_unit("ns").asi8
+    prev = np.searchsorted(alerts, ts, side="left") - 1
+    since = ts - alerts[np.maximum(prev, 0)]
+    return (prev >= 0) & (since < cooldown.value)
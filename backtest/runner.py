@@ -0,0 +1,125 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+import yaml
+from tabulate import tabulate
+
+from backtest.engine import run_session, run_sessions_batched
+from monitor.backends import AGENT_BACKENDS, configured_agent, use_agent
+
+
+def _run_day(config, date_in, log, agent_name=None):
+    """Worker: one session, with its own warm-up. Never raises so one bad day can't sink the run."""
+    started = time.perf_counter()
+    use_agent(agent_name or configured_agent(config), config)
+    try:
+        results = run_session(config, date_in, log=log)
+        error = ""
+    except Exception as e:
+        results = None
+        error = f"{type(e).__name__}: {e}"
+    return date_in, results, error, time.perf_counter() - started
+
+
+def summarize_day(date_in, results, error, wall_time):
+    bars = 0 if results is None else len(results)
+    passed = 0 if results is None else int(results["gate_pass"].sum())
+    return {
+        "date": date_in,
+        "bars": bars,
+        "gate_passed": passed,
+        "gate_pass_rate": round(passed / bars, 3) if bars else 0.0,
+        "agent_calls": 0 if results is None else results.attrs.get("agent_calls", int(results["evaluated"].sum())),
+        "alerts": 0 if results is None else int(results["alerted"].sum()),
+        "wall_time_sec": round(wall_time, 3),
+        "error": error,
+    }
+
+
+def _collect(summary, decisions, date_in, results, error, wall_time):
+    summary.append(summarize_day(date_in, results, error, wall_time))
+    if results is not None and results["evaluated"].any():
+        decisions.append(results[results["evaluated"]].assign(date=date_in))
+    print(f"{'❌' if error else '✅'} {date_in} done in {wall_time:.2f}s {error}")
+
+
+def run_range(config, start, end, workers=None, log=False, agent_name=None):
+    """
+    Fan the business days in [start, end] out over a process pool (one worker per day).
+    Returns (summary, decisions): one row per day, and every evaluated bar of every day.
+    """
+    dates = [d.strftime("%Y-%m-%d") for d in pd.bdate_range(start, end)]
+    summary, decisions = [], []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_day, config, date_in, log, agent_name) for date_in in dates]
+        for future in as_completed(futures):
+            _collect(summary, decisions, *future.result())
+
+    return _finish(summary, decisions)
+
+
+def run_range_batched(config, start, end, max_concurrency=8, rate_per_sec=None, log=False, agent_name=None):
+    """One process; every gated bar of the whole range goes to the agent concurrently."""
+    use_agent(agent_name or configured_agent(config), config)
+    dates = [d.strftime("%Y-%m-%d") for d in pd.bdate_range(start, end)]
+    sessions = run_sessions_batched(config, dates, max_concurrency=max_concurrency, rate_per_sec=rate_per_sec, log=log)
+
+    summary, decisions = [], []
+    for date_in in dates:
+        results = sessions.get(date_in)
+        error = "" if results is not None else "no session data"
+        wall_time = results.attrs["wall_time_sec"] if results is not None else 0.0
+        _collect(summary, decisions, date_in, results, error, wall_time)
+    return _finish(summary, decisions)
+
+
+def _finish(summary, decisions):
+    summary = pd.DataFrame(summary).sort_values("date").reset_index(drop=True)
+    decisions = pd.concat(decisions).sort_index() if decisions else pd.DataFrame()
+    return summary, decisions
+
+
+def print_report(summary):
+    print(tabulate(summary, headers="keys", tablefmt="psql", showindex=False))
+    ok = summary[summary["error"] == ""]
+    bars = ok["bars"].sum()
+    print(f"Days: {len(ok)}/{len(summary)} | gate pass rate: {ok['gate_passed'].sum() / bars if bars else 0:.1%} | "
+          f"agent calls: {ok['agent_calls'].sum()} | alerts: {ok['alerts'].sum()} "
+          f"({ok['alerts'].mean() if len(ok) else 0:.2f}/day) | wall time/day: {ok['wall_time_sec'].mean() if len(ok) else 0:.2f}s")
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Backtest a range of sessions in parallel")
+    cli.add_argument("start", help="first date, YYYY-MM-DD")
+    cli.add_argument("end", help="last date, YYYY-MM-DD")
+    cli.add_argument("--workers", type=int, default=None, help="process count (default: CPU count)")
+    cli.add_argument("--config", default="config/strategy.yaml")
+    cli.add_argument("--log", action="store_true", help="also write per-day decision logs / alerts")
+    cli.add_argument("--out", default=None, help="prefix for the merged summary/decisions CSVs")
+    cli.add_argument("--agent", choices=sorted(AGENT_BACKENDS), default=None,
+                     help="default: backends.agent from --config; stub = offline deterministic model, "
+                          "rules = gate + config only (no LLM)")
+    cli.add_argument("--batch", action="store_true", help="evaluate all gated bars of the range concurrently in one process")
+    cli.add_argument("--concurrency", type=int, default=8, help="max in-flight agent calls with --batch")
+    cli.add_argument("--rate", type=float, default=None, help="max agent calls started per second with --batch")
+    args = cli.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+
+    if args.batch:
+        summary, decisions = run_range_batched(config, args.start, args.end, max_concurrency=args.concurrency,
+                                               rate_per_sec=args.rate, log=args.log, agent_name=args.agent)
+    else:
+        summary, decisions = run_range(config, args.start, args.end, workers=args.workers, log=args.log,
+                                       agent_name=args.agent)
+    print_report(summary)
+
+    out = args.out or f"backtest_{args.start}_{args.end}"
+    summary.to_csv(f"{out}_summary.csv", index=False)
+    if not decisions.empty:
+        decisions.to_csv(f"{out}_decisions.csv")
+    print(f"💾 Saved {out}_summary.csv" + (f" and {out}_decisions.csv" if not decisions.empty else ""))
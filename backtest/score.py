@@ -0,0 +1,245 @@
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+from tabulate import tabulate
+
+from agent.rules import DEFAULT_RISK
+from alerts.journal import JOURNAL_FIELDS, JOURNAL_PATTERNS, journal_paths, load_journals, lock_journal
+from data.cache import is_finished_session
+from data.fetcher import fetch_market_data
+
+
+MARKET_TZ = "America/New_York"
+SIDES = {"SELL_CALL": 1, "SELL_PUT": -1}          # direction the short strike sits from the price
+CONFIDENCE_BINS = [0.0, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+
+
+# ────────────────────────────────────────────────
+# Bars
+# ────────────────────────────────────────────────
+
+def load_bars(config, dates, interval=None):
+    """
+    SPX for every listed session, concatenated in time order: epoch ns, spx,
+    session id per bar and last bar position per session. interval=None uses
+    the raw 30-second stream, so intrabar breaches are not missed. Only
+    finished sessions are loaded (from the data cache when `api.cache_dir` is set);
+    rows without an SPX print are dropped.
+    """
+    ts, spx, loaded = [], [], []
+    for date_in in dates:
+        if not is_finished_session(date_in):
+            print(f"⏳ {date_in} skipped: session not finished")
+            continue
+        try:
+            df = fetch_market_data(config["api"], interval, date_in=date_in)
+        except Exception as e:
+            print(f"⚠️ {date_in} skipped: {e}")
+            continue
+        # a missing print would poison the suffix max of its session and every earlier one
+        df = df[(df.index <= pd.Timestamp(f"{date_in} 16:00", tz=MARKET_TZ)) & df["spx"].notna()]
+        if df.empty:
+            continue
+        ts.append(df.index.as_unit("ns").asi8)
+        spx.append(df["spx"].to_numpy(dtype="float64"))
+        loaded.append(date_in)
+
+    if not loaded:
+        return {"ts": np.empty(0, "int64"), "spx": np.empty(0), "session": np.empty(0, int),
+                "last": np.empty(0, int), "dates": []}
+    sizes = np.array([len(t) for t in ts])
+    last = np.cumsum(sizes) - 1
+    return {"ts": np.concatenate(ts), "spx": np.concatenate(spx), "session": np.repeat(np.arange(len(sizes)), sizes),
+            "last": last, "dates": loaded}
+
+
+def _suffix_max(values, session):
+    """Max from each bar to the end of its session, for every session in one pass."""
+    # walking backwards, each session is lifted above every later one, so the running
+    # max restarts at each session boundary without a Python loop over sessions
+    span = np.nanmax(values) - np.nanmin(values) + 1.0
+    lift = (session.max() - session) * span
+    return np.maximum.accumulate((values + lift)[::-1])[::-1] - lift
+
+
+# ────────────────────────────────────────────────
+# Scoring
+# ────────────────────────────────────────────────
+
+def score(decisions, bars, multiples=(1.0, DEFAULT_RISK["safe_move_multiplier"])) -> pd.DataFrame:
+    """
+    Path outcome to the 16:00 close of every SELL_CALL / SELL_PUT decision,
+    for short strikes `multiples` × expected_move from the decision price.
+    Each decision is joined to the first bar at or after its timestamp with a
+    searchsorted on the sorted bar index, and the rest of its session is read
+    from precomputed suffix max/min arrays, so the cost is O(bars + decisions).
+
+    Returns one row per decision (aligned with `decisions`) with entry_price,
+    close_price, mae_pts / mae_em (max adverse excursion toward the strike, in
+    points / expected moves) and per multiple k: breach_{k}x (touched the
+    strike before the close), close_distance_{k}x (points the close finished
+    on the safe side of the strike; negative = in the money) and win_{k}x
+    (expired out of the money). Rows that are not trades, or whose session has
+    no bars, are NaN.
+    """
+    out = pd.DataFrame(index=decisions.index)
+    side = decisions["suggestion"].map(SIDES).to_numpy(dtype="float64")
+    price = pd.to_numeric(decisions["spx_price"], errors="coerce").to_numpy(dtype="float64")
+    move = pd.to_numeric(decisions["expected_move"], errors="coerce").to_numpy(dtype="float64")
+    stamps = pd.DatetimeIndex(decisions["timestamp"])
+    stamps = stamps.tz_localize(MARKET_TZ) if stamps.tz is None else stamps.tz_convert(MARKET_TZ)
+
+    # ─── join: first bar at/after the decision, same session only ───
+    valid = ~np.isnan(side) & ~np.isnan(price) & (move > 0)
+    entry = np.zeros(len(decisions), dtype=int)
+    if len(bars["ts"]):
+        entry = np.minimum(np.searchsorted(bars["ts"], stamps.as_unit("ns").asi8, side="left"), len(bars["ts"]) - 1)
+        session = bars["session"][entry]
+        day = np.array(bars["dates"], dtype=object)[session]
+        valid &= (day == np.asarray(stamps.strftime("%Y-%m-%d"), dtype=object)) & (bars["ts"][entry] >= stamps.as_unit("ns").asi8)
+    else:
+        valid[:] = False
+
+    nan = np.full(len(decisions), np.nan)
+    if not valid.any():
+        out["entry_price"] = out["close_price"] = out["mae_pts"] = out["mae_em"] = nan
+        for k in multiples:
+            out[f"breach_{k:g}x"] = out[f"close_distance_{k:g}x"] = out[f"win_{k:g}x"] = nan
+        return out
+
+    high = _suffix_max(bars["spx"], bars["session"])
+    low = -_suffix_max(-bars["spx"], bars["session"])
+    close = bars["spx"][bars["last"][bars["session"][entry]]]
+
+    # adverse = toward the short strike: up for a short call, down for a short put
+    extreme = np.where(side > 0, high[entry], low[entry])
+    mae = np.maximum(side * (extreme - price), 0.0)
+    out["entry_price"] = np.where(valid, bars["spx"][entry], nan)
+    out["close_price"] = np.where(valid, close, nan)
+    out["mae_pts"] = np.where(valid, mae.round(2), nan)
+    out["mae_em"] = np.where(valid, (mae / move).round(3), nan)
+
+    # one (decisions × multiples) matrix for every strike distance at once
+    k = np.asarray(multiples, dtype="float64")[None, :]
+    cushion = k * move[:, None]
+    breach = mae[:, None] >= cushion
+    distance = cushion - side[:, None] * (close - price)[:, None]
+    for j, m in enumerate(multiples):
+        out[f"breach_{m:g}x"] = np.where(valid, breach[:, j], nan)
+        out[f"close_distance_{m:g}x"] = np.where(valid, distance[:, j].round(2), nan)
+        out[f"win_{m:g}x"] = np.where(valid, distance[:, j] > 0, nan)
+    return out
+
+
+def report(decisions, scored, multiples, bucket_minutes=30) -> dict:
+    """Win / breach rates and mean MAE by confidence bucket and by time of day, over scored trades only."""
+    frame = pd.concat([decisions[["timestamp", "suggestion", "confidence"]], scored], axis=1)
+    frame = frame[frame["entry_price"].notna()]
+    labels = [f"{lo:.1f}–{hi:.1f}" for lo, hi in zip(CONFIDENCE_BINS[:-1], CONFIDENCE_BINS[1:])]
+    frame["confidence_bucket"] = pd.cut(pd.to_numeric(frame["confidence"], errors="coerce"), CONFIDENCE_BINS,
+                                        labels=labels, include_lowest=True)
+    frame["time_of_day"] = pd.DatetimeIndex(frame["timestamp"]).floor(f"{bucket_minutes}min").strftime("%H:%M")
+
+    aggregations = {"trades": ("entry_price", "size"), "mae_em": ("mae_em", "mean")}
+    for m in multiples:
+        aggregations[f"win_{m:g}x"] = (f"win_{m:g}x", "mean")
+        aggregations[f"breach_{m:g}x"] = (f"breach_{m:g}x", "mean")
+    tables = {}
+    for by in ("confidence_bucket", "time_of_day", "suggestion"):
+        tables[by] = frame.groupby(by, observed=True).agg(**aggregations).round(3).reset_index()
+    return tables
+
+
+# ────────────────────────────────────────────────
+# Journals
+# ────────────────────────────────────────────────
+
+def _read_journal(path) -> list:
+    return [json.loads(line) for line in Path(path).read_text().splitlines() if line.strip()]
+
+
+def fill_results(path, config, multiple, interval=None) -> int:
+    """
+    Rewrite one journal with `result` = profit / loss (expired out of / in the
+    money at `multiple` × expected_move) for every scored trade whose result is
+    still empty; hand-entered results and every other field are kept as
+    written. Scoring runs on a snapshot; the rewrite re-reads the file under
+    the journal lock, so rows a live monitor appended meanwhile are kept, and
+    swaps it in atomically. Returns the number of rows filled.
+    """
+    path = Path(path)
+    records = _read_journal(path)
+    if not records:
+        return 0
+    rows = pd.DataFrame.from_records(records).reindex(columns=JOURNAL_FIELDS)
+    rows["timestamp"] = pd.to_datetime(rows["timestamp"])
+    dates = sorted(set(rows.loc[rows["suggestion"].isin(list(SIDES)), "timestamp"].dt.strftime("%Y-%m-%d")))
+    win = score(rows, load_bars(config, dates, interval), multiples=[multiple])[f"win_{multiple:g}x"].to_numpy()
+    results = {i: "profit" if won else "loss" for i, won in enumerate(win) if not np.isnan(won)}
+    if not results:
+        return 0
+
+    filled = 0
+    with lock_journal(path):
+        records = _read_journal(path)          # the journal is append-only: scored rows keep their positions
+        for i, result in results.items():
+            if str(records[i].get("result") or "").strip() == "":
+                records[i]["result"] = result
+                filled += 1
+        if filled:
+            tmp = path.with_name(f".{path.name}.tmp")
+            tmp.write_text("".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records))
+            os.replace(tmp, path)
+    return filled
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Score logged SELL_CALL / SELL_PUT decisions against the session close")
+    cli.add_argument("patterns", nargs="*", default=JOURNAL_PATTERNS,
+                     help="journal globs or paths (default: every *_alert_log.jsonl and legacy *_alert_log.csv)")
+    cli.add_argument("--config", default="config/strategy.yaml")
+    cli.add_argument("--multiples", type=float, nargs="+", default=None,
+                     help="strike distances in expected moves (default: 1.0 and risk.safe_move_multiplier)")
+    cli.add_argument("--interval", type=int, default=0, help="bar minutes for the path (0 = raw 30-second rows)")
+    cli.add_argument("--bucket-minutes", type=int, default=30)
+    cli.add_argument("--out", default=None, help="CSV of every scored decision")
+    cli.add_argument("--write", action="store_true",
+                     help="fill empty `result` fields in the .jsonl journals (profit/loss at risk.safe_move_multiplier); "
+                          "legacy .csv rows are scored but never rewritten")
+    args = cli.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+    safe_multiple = {**DEFAULT_RISK, **(config.get("risk") or {})}["safe_move_multiplier"]
+    multiples = args.multiples or sorted({1.0, safe_multiple})
+    interval = args.interval or None
+
+    started = time.perf_counter()
+    decisions = load_journals(args.patterns)
+    trades = decisions[decisions["suggestion"].isin(list(SIDES))].reset_index(drop=True)
+    dates = sorted(set(trades["timestamp"].dt.strftime("%Y-%m-%d")))
+    bars = load_bars(config, dates, interval)
+    loaded = time.perf_counter()
+    scored = score(trades, bars, multiples)
+    print(f"⚡ Scored {int(scored['entry_price'].notna().sum())}/{len(trades)} trades over {len(bars['dates'])} sessions "
+          f"({len(bars['ts'])} bars) in {time.perf_counter() - loaded:.3f}s (+{loaded - started:.2f}s loading)")
+
+    for by, table in report(trades, scored, multiples, args.bucket_minutes).items():
+        print(f"\nBy {by.replace('_', ' ')}:")
+        print(tabulate(table, headers="keys", tablefmt="psql", showindex=False))
+
+    if args.out:
+        pd.concat([trades, scored], axis=1).to_csv(args.out, index=False)
+        print(f"💾 Saved {args.out}")
+    if args.write:
+        paths = journal_paths(args.patterns)
+        filled = sum(fill_results(p, config, safe_multiple, interval) for p in paths if p.endswith(".jsonl"))
+        print(f"📝 Filled `result` on {filled} journal row(s) at {safe_multiple:g}× expected move")
+        legacy = [p for p in paths if not p.endswith(".jsonl")]
+        if legacy:
+            print(f"ℹ️ {len(legacy)} legacy CSV log(s) scored above but left as they are")
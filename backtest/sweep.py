@@ -0,0 +1,226 @@
+import argparse
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+from tabulate import tabulate
+
+from agent.rules import DEFAULT_RISK
+from backtest.engine import session_features
+from data.cache import is_finished_session
+from strategy.gate import DEFAULT_THRESHOLDS, load_thresholds
+
+
+GATE_FEATURES = ["vix", "time_to_close_min", "ret_5min_pct", "ret_15min_pct",
+                 "ema21_slope_5min", "premium_ratio", "rsi"]
+# per-bar outcome: 1 if the session closed within risk.safe_move_multiplier × expected_move
+# of the bar's price on both sides (a short strike either way expires out of the money), NaN if unknown
+OUTCOME = "win"
+
+# Every gate rule rejects on its own, so a bar passes iff no rule rejects it.
+# rule → (threshold keys it depends on, reject(features, *threshold values))
+SWEEP_RULES = [
+    (("min_vix",), lambda f, v: f["vix"] < v),
+    (("max_vix",), lambda f, v: f["vix"] > v),
+    (("max_minutes_to_close",), lambda f, v: f["time_to_close_min"] > v),
+    (("min_minutes_to_close",), lambda f, v: f["time_to_close_min"] < v),
+    (("max_abs_ret_5min_pct",), lambda f, v: np.abs(f["ret_5min_pct"]) > v),
+    (("max_abs_ret_15min_pct",), lambda f, v: np.abs(f["ret_15min_pct"]) > v),
+    (("max_abs_ema21_slope_5min",), lambda f, v: np.abs(f["ema21_slope_5min"]) > v),
+    (("min_premium_ratio",), lambda f, v: f["premium_ratio"] <= v),
+    (("rsi_extreme_low",), lambda f, v: f["rsi"] < v),
+    (("rsi_extreme_high",), lambda f, v: f["rsi"] > v),
+    (("rsi_neutral_low", "rsi_neutral_high"), lambda f, lo, hi: (f["rsi"] > lo) & (f["rsi"] < hi)),
+]
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+
+# ────────────────────────────────────────────────
+# Feature arrays
+# ────────────────────────────────────────────────
+
+def _day_features(config, date_in):
+    try:
+        _, features = session_features(config, date_in)
+    except Exception as e:
+        print(f"⚠️ {date_in} skipped: {e}")
+        return None
+    frame = features[GATE_FEATURES].copy()
+    frame[OUTCOME] = np.nan
+    prices = features["current_price"].dropna()
+    if is_finished_session(date_in) and len(prices):
+        multiple = {**DEFAULT_RISK, **(config.get("risk") or {})}["safe_move_multiplier"]
+        band = multiple * features["expected_move"]
+        won = (prices.iloc[-1] - features["current_price"]).abs() < band
+        frame[OUTCOME] = won.astype("float64").where(band.notna() & features["current_price"].notna())
+    return frame
+
+
+def collect_features(config, start, end, workers=None) -> dict:
+    """Gate feature arrays (and the OUTCOME column) for every bar of every business day in [start, end]."""
+    dates = [d.strftime("%Y-%m-%d") for d in pd.bdate_range(start, end)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        frames = [f for f in pool.map(_day_features, [config] * len(dates), dates) if f is not None]
+    frame = pd.concat(frames) if frames else pd.DataFrame(columns=GATE_FEATURES + [OUTCOME])
+    return {col: frame[col].to_numpy(dtype="float64") for col in GATE_FEATURES + [OUTCOME]}
+
+
+def features_cache_path(config, start, end) -> Path:
+    """Default .npz for a date range, keyed on everything the arrays depend on besides the dates."""
+    series = "-".join(sorted(s.strip() for s in config["api"]["params"]["series"].split(",")))
+    multiple = {**DEFAULT_RISK, **(config.get("risk") or {})}["safe_move_multiplier"]
+    return Path(f"sweep_features_{start}_{end}_{config['backtest']['interval_min']}m"
+                f"_rsi{config['indicators']['rsi_period']}_{series}_win{multiple:g}x.npz")
+
+
+def save_features(features, path):
+    np.savez(path, **features)
+
+
+def load_features(path) -> dict:
+    with np.load(path) as data:
+        return {col: data[col] for col in GATE_FEATURES + [OUTCOME] if col in data}
+
+
+# ────────────────────────────────────────────────
+# Grid + sweep
+# ────────────────────────────────────────────────
+
+def build_grid(spec, base=None) -> pd.DataFrame:
+    """Cartesian product of {threshold: [values]}; thresholds not in spec stay at `base`."""
+    base = base or DEFAULT_THRESHOLDS
+    keys = list(spec)
+    combos = list(itertools.product(*(np.atleast_1d(spec[k]).tolist() for k in keys)))
+    grid = pd.DataFrame(combos, columns=keys)
+    for key, value in base.items():
+        if key not in grid:
+            grid[key] = value
+    return grid[list(base)]
+
+
+def sweep(features, grid, bucket_minutes=30, chunk_size=2048) -> pd.DataFrame:
+    """
+    Evaluate every threshold combination in `grid` against all bars at once.
+
+    Each rule is evaluated once per distinct threshold value and stored as a
+    bit-packed pass mask (bars grouped by time-of-day bucket, 8 bars per byte);
+    a combination is then the AND of one row per rule, and pass counts per
+    bucket are popcounts over byte ranges. Returns the grid with pass_count,
+    pass_rate and one count column per time-of-day bucket; when `features`
+    has the OUTCOME column, also wins and win_rate (wins / passed bars with a
+    known outcome).
+    """
+    minutes_from_open = 390 - features["time_to_close_min"]
+    n_buckets = int(np.ceil(390 / bucket_minutes))
+    bucket = np.clip(minutes_from_open // bucket_minutes, 0, n_buckets - 1).astype(int)
+
+    # lay bars out bucket by bucket, each bucket padded to a whole number of bytes
+    order = np.argsort(bucket, kind="stable")
+    per_bucket = np.bincount(bucket, minlength=n_buckets)
+    padded = ((per_bucket + 7) // 8) * 8
+    slot = np.concatenate([np.arange(n) + start for n, start in zip(per_bucket, np.cumsum(padded) - padded)]).astype(int)
+    size = int(padded.sum())
+
+    laid_out = {}
+    for col in GATE_FEATURES:
+        arr = np.full(size, np.nan)
+        arr[slot] = features[col][order]
+        laid_out[col] = arr
+    valid = np.zeros(size, dtype=bool)
+    valid[slot] = True
+    valid = np.packbits(valid)
+    scored = OUTCOME in features
+    if scored:
+        outcome = np.full(size, np.nan)
+        outcome[slot] = features[OUTCOME][order]
+        won, known = np.packbits(outcome == 1), np.packbits(~np.isnan(outcome))
+
+    byte_starts = (np.cumsum(padded) - padded) // 8
+    nonempty = np.flatnonzero(per_bucket)
+
+    # one packed pass mask per distinct threshold value (tuple) of each rule
+    rule_masks = []
+    for keys, reject in SWEEP_RULES:
+        values, inverse = np.unique(grid[list(keys)].to_numpy(dtype="float64"), axis=0, return_inverse=True)
+        masks = np.stack([np.packbits(~reject(laid_out, *row)) for row in values])
+        rule_masks.append((masks, inverse.reshape(-1)))
+
+    counts = np.zeros((len(grid), n_buckets), dtype=np.int64)
+    wins = np.zeros(len(grid), dtype=np.int64)
+    outcomes = np.zeros(len(grid), dtype=np.int64)
+    for lo in range(0, len(grid), chunk_size):
+        hi = min(lo + chunk_size, len(grid))
+        acc = np.broadcast_to(valid, (hi - lo, valid.size)).copy()
+        for masks, inverse in rule_masks:
+            acc &= masks[inverse[lo:hi]]
+        if len(nonempty):
+            counts[lo:hi, nonempty] = np.add.reduceat(_POPCOUNT[acc], byte_starts[nonempty], axis=1, dtype=np.int64)
+        if scored:
+            wins[lo:hi] = _POPCOUNT[acc & won].sum(axis=1, dtype=np.int64)
+            outcomes[lo:hi] = _POPCOUNT[acc & known].sum(axis=1, dtype=np.int64)
+
+    total = max(len(features["time_to_close_min"]), 1)
+    result = grid.copy()
+    result["pass_count"] = counts.sum(axis=1)
+    result["pass_rate"] = result["pass_count"] / total
+    if scored:
+        result["wins"] = wins
+        result["win_rate"] = np.where(outcomes > 0, wins / np.maximum(outcomes, 1), np.nan)
+    labels = [(pd.Timestamp("09:30") + pd.Timedelta(minutes=b * bucket_minutes)).strftime("%H:%M") for b in range(n_buckets)]
+    return pd.concat([result, pd.DataFrame(counts, columns=labels, index=result.index)], axis=1)
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Sweep should_consider_trade thresholds over many sessions")
+    cli.add_argument("start", help="first date, YYYY-MM-DD")
+    cli.add_argument("end", help="last date, YYYY-MM-DD")
+    cli.add_argument("--grid", default="config/sweep.yaml", help="YAML mapping threshold -> list of values")
+    cli.add_argument("--config", default="config/strategy.yaml")
+    cli.add_argument("--features", default=None, help=".npz of precomputed feature arrays (created if missing)")
+    cli.add_argument("--workers", type=int, default=None)
+    cli.add_argument("--bucket-minutes", type=int, default=30)
+    cli.add_argument("--sort", default="win_rate", help="ranking column (default: win_rate, see --min-pass)")
+    cli.add_argument("--min-pass", type=int, default=50,
+                     help="rank combinations that pass fewer bars than this below every other one")
+    cli.add_argument("--top", type=int, default=20)
+    cli.add_argument("--out", default=None, help="CSV for the full result table")
+    args = cli.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+    with open(args.grid, "r") as f:
+        spec = yaml.safe_load(f)
+
+    features_path = Path(args.features) if args.features else features_cache_path(config, args.start, args.end)
+    if features_path.exists():
+        features = load_features(features_path)
+    else:
+        features = collect_features(config, args.start, args.end, workers=args.workers)
+        save_features(features, features_path)
+        print(f"💾 Saved feature arrays to {features_path}")
+
+    grid = build_grid(spec, base=load_thresholds(config))
+    started = time.perf_counter()
+    result = sweep(features, grid, bucket_minutes=args.bucket_minutes)
+    print(f"⚡ {len(grid)} combinations × {len(features['vix'])} bars in {time.perf_counter() - started:.2f}s")
+
+    if args.sort not in result:
+        cli.error(f"--sort {args.sort}: no such column (a feature cache without outcomes only has pass counts)")
+    # a loose gate that passes a handful of lucky bars must not top the table
+    result["eligible"] = result["pass_count"] >= args.min_pass
+    result = result.sort_values(["eligible", args.sort, "pass_count"], ascending=False, na_position="last")
+    if not result["eligible"].iloc[0]:
+        print(f"⚠️ No combination passes {args.min_pass} bars — the top row is not a reliable pick")
+    result = result.drop(columns="eligible")
+    print(tabulate(result.head(args.top), headers="keys", tablefmt="psql", showindex=False))
+    if args.out:
+        result.to_csv(args.out, index=False)
+
+    best = result.iloc[0][list(DEFAULT_THRESHOLDS)].to_dict()
+    print("\n# paste into config/strategy.yaml to use the top row:")
+    print(yaml.safe_dump({"gate": {k: float(v) for k, v in best.items()}}, sort_keys=False))
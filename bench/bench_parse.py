@@ -0,0 +1,68 @@
+"""
+Microbenchmark: aggregateData payload → 5-minute bars frame.
+
+Compares the original pandas path (DataFrame from records, astype, tz convert,
+then filter) with data.parse.parse_aggregate. Run from the repo root:
+
+    python -m bench.bench_parse [--rows 780] [--repeat 200]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import pandas as pd
+
+from bench.synthetic import generate_session, to_payload
+from data.parse import parse_aggregate
+
+
+def make_payload(rows=780, date_in="2026-01-30", seed=0) -> bytes:
+    """One synthetic session of 30-second rows, numbers as strings like the live API."""
+    return to_payload(generate_session(date_in, seed=seed, rows=rows))
+
+
+def parse_legacy(content, interval):
+    """The original fetch_market_data() parsing path, kept here as the baseline."""
+    df = pd.DataFrame(json.loads(content))
+    for col in ["spx", "spxExpectedMove", "spxOTMBids", "vix"]:
+        df[col] = df[col].astype(float)
+    df['dateTime'] = pd.to_datetime(df['dateTime'], unit='s').dt.tz_localize('UTC').dt.tz_convert('America/New_York')
+    df.set_index('dateTime', inplace=True)
+    df.sort_index(inplace=True)
+    return df[(df.index.minute % interval == 0) & (df.index.second == 0)]
+
+
+def measure(fn, repeat):
+    fn()                                     # warm-up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    per_call = (time.perf_counter() - started) / repeat
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_call, peak
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    cli.add_argument("--rows", type=int, default=780, help="30-second rows in the payload (780 = full session)")
+    cli.add_argument("--interval", type=int, default=5)
+    cli.add_argument("--repeat", type=int, default=200)
+    args = cli.parse_args()
+
+    payload = make_payload(args.rows)
+    legacy = parse_legacy(payload, args.interval)
+    fast = parse_aggregate(payload, args.interval)
+    pd.testing.assert_frame_equal(legacy[fast.columns], fast, check_freq=False, check_index_type=False)
+
+    legacy_sec, legacy_peak = measure(lambda: parse_legacy(payload, args.interval), args.repeat)
+    fast_sec, fast_peak = measure(lambda: parse_aggregate(payload, args.interval), args.repeat)
+
+    print(f"payload: {args.rows} rows, {len(payload) / 1024:.0f} KiB → {len(fast)} bars")
+    print(f"legacy : {legacy_sec * 1e3:8.3f} ms/call  peak {legacy_peak / 1024:8.0f} KiB")
+    print(f"fast   : {fast_sec * 1e3:8.3f} ms/call  peak {fast_peak / 1024:8.0f} KiB")
+    print(f"speedup: {legacy_sec / fast_sec:.1f}x time, {legacy_peak / max(fast_peak, 1):.1f}x peak memory")
@@ -0,0 +1,326 @@
+"""
+Local stand-in for the aggregateData API, for end-to-end and soak runs.
+
+Serves synthetic sessions (bench/synthetic.py) or sessions recorded in the
+data cache (data/cache.py) on a virtual clock that runs at 1× to 1000× (or
+jumps straight to every wake-up with --speed 0, when the monitor shares the
+clock in-process). Latency, 5xx errors and missing bars can be injected.
+
+    GET /aggregateData?series=spx,vix,...&date=YYYY-MM-DD|live&interval=30
+        live (or today's date on the virtual clock) → today's rows up to now
+        an earlier date → the whole session; a later date or a closed day → []
+    GET /clock[?at=2026-01-30T09:25&speed=100]     read or move the clock
+    GET /faults[?latency_ms=40&jitter_ms=20&error_rate=0.05&gap_rate=0.01]
+    GET /stats                                      requests, errors, bytes served
+
+Point `api.url` in config/strategy.yaml at http://127.0.0.1:8765/aggregateData
+(and set `api.cache_dir: null`). Run from the repo root:
+
+    python -m bench.replay --start "2026-01-30 09:25" --speed 60
+    python -m bench.replay --cache-dir cache --start "2026-01-30 09:25"    # recorded sessions
+"""
+import argparse
+import gzip
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from bench.synthetic import MARKET_TZ, encode_rows, generate_session
+from monitor.scheduler import BarScheduler, MARKET_OPEN
+
+
+DEFAULT_PORT = 8765
+SERIES = ("spx", "vix", "spxExpectedMove", "spxOTMBids")
+CACHED_SESSIONS = 16                 # session frames kept in memory (a soak run walks through hundreds)
+
+
+# ────────────────────────────────────────────────
+# Clock
+# ────────────────────────────────────────────────
+
+class ReplayClock:
+    """
+    Virtual market time running `speed`× faster than the wall clock; speed 0
+    makes sleep_until() jump straight to the wake-up time, like VirtualClock.
+    Same interface as monitor.scheduler's clocks, so one instance can drive
+    both the server and a BarScheduler in the same process.
+    """
+
+    def __init__(self, start=None, speed=1.0, tz=MARKET_TZ):
+        self.tz = tz
+        self._lock = threading.Lock()
+        self.set(start if start is not None else pd.Timestamp.now(tz=tz), speed)
+
+    def set(self, at=None, speed=None):
+        """Move the clock to `at` and/or change its speed; the other one carries on from now."""
+        with self._lock:
+            now = self._now() if hasattr(self, "_base") else None
+            if at is not None:
+                at = pd.Timestamp(at)
+                now = at.tz_localize(self.tz) if at.tzinfo is None else at.tz_convert(self.tz)
+            if speed is not None:
+                if speed < 0:
+                    raise ValueError(f"speed must be >= 0, got {speed}")
+                self.speed = float(speed)
+            self._base = now
+            self._wall = time.monotonic()
+
+    def _now(self) -> pd.Timestamp:
+        if not self.speed:
+            return self._base
+        return self._base + pd.Timedelta(seconds=(time.monotonic() - self._wall) * self.speed)
+
+    def now(self) -> pd.Timestamp:
+        with self._lock:
+            return self._now()
+
+    def sleep_until(self, when: pd.Timestamp):
+        if not self.speed:
+            with self._lock:
+                self._base = max(self._base, when)
+            return
+        while True:
+            remaining = (when - self.now()).total_seconds() / self.speed
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 1.0))
+
+    def deadline(self, when):
+        """`when` as a time.monotonic() value; None while time only moves on sleep_until()."""
+        if not self.speed:
+            return None
+        return time.monotonic() + max((when - self.now()).total_seconds(), 0.0) / self.speed
+
+
+# ────────────────────────────────────────────────
+# Sessions
+# ────────────────────────────────────────────────
+
+def _recorded_session(cache_dir, date_in):
+    """The finest-grained cached copy of a session (raw 30-second rows if prefetched), or None."""
+    from data.cache import load_session
+
+    best = None
+    for path in (Path(cache_dir) / date_in).glob("*_*"):
+        series_key, _, interval = path.name.rpartition("_")
+        if not set(SERIES) <= set(series_key.split("-")):
+            continue
+        minutes = 0 if interval == "raw" else int(interval.rstrip("m"))
+        if best is None or minutes < best[0]:
+            best = (minutes, series_key.replace("-", ","))
+    if best is None:
+        return None
+    return load_session(cache_dir, date_in, best[1], best[0] or None)
+
+
+class SessionSource:
+    """Session frames by date: synthetic (seeded, reproducible) or from a data cache directory."""
+
+    def __init__(self, regime="mixed", seed=0, cache_dir=None, gap_seed=0):
+        self.regime = regime
+        self.seed = seed
+        self.cache_dir = cache_dir
+        self.gap_seed = gap_seed
+        self._calendar = BarScheduler(5)
+        self._frames = OrderedDict()          # date → (frame, epoch seconds, {series: encoded rows})
+
+    def is_trading_day(self, date_in) -> bool:
+        return self._calendar.is_trading_day(date_in)
+
+    def _entry(self, date_in):
+        if date_in not in self._frames:
+            if self.cache_dir:
+                frame = _recorded_session(self.cache_dir, date_in)
+                if frame is None:
+                    raise LookupError(f"no cached session for {date_in} under {self.cache_dir}")
+            else:
+                frame = generate_session(date_in, regime=self.regime, seed=self.seed)
+            self._frames[date_in] = (frame, frame.index.as_unit("s").asi8, {})
+            if len(self._frames) > CACHED_SESSIONS:
+                self._frames.popitem(last=False)
+        self._frames.move_to_end(date_in)
+        return self._frames[date_in]
+
+    def session(self, date_in) -> pd.DataFrame:
+        return self._entry(date_in)[0]
+
+    def encoded(self, date_in, series):
+        """(epoch seconds, one JSON object per row) — rows are encoded once, every poll only joins a prefix."""
+        frame, epoch, rows = self._entry(date_in)
+        key = tuple(series)
+        if key not in rows:
+            rows[key] = np.array(encode_rows(frame[list(series)]), dtype=object)
+        return epoch, rows[key]
+
+    def gaps(self, date_in, rows, gap_rate):
+        """Rows dropped from a session: the same ones on every poll, so a missing bar stays missing."""
+        rng = np.random.default_rng(self.gap_seed * 1_000_003 + int(pd.Timestamp(date_in).strftime("%Y%m%d")))
+        return rng.random(rows) < gap_rate
+
+
+# ────────────────────────────────────────────────
+# Server
+# ────────────────────────────────────────────────
+
+class ReplayServer:
+    """aggregateData over HTTP on a background thread; see the module docstring for the endpoints."""
+
+    def __init__(self, source=None, clock=None, port=DEFAULT_PORT, host="127.0.0.1",
+                 latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, gap_rate=0.0, seed=0):
+        self.source = source or SessionSource()
+        self.clock = clock or ReplayClock()
+        self.faults = {"latency_ms": latency_ms, "jitter_ms": jitter_ms, "error_rate": error_rate, "gap_rate": gap_rate}
+        self.stats = {"requests": 0, "errors_injected": 0, "bad_requests": 0, "rows_served": 0, "bytes_served": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.host, self.port = self._httpd.server_address[:2]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/aggregateData"
+
+    def start(self):
+        threading.Thread(target=self._httpd.serve_forever, name="replay-http", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def payload(self, date_in, series, interval=30):
+        """(aggregateData body, row count) for `date` at the current virtual time, gaps applied."""
+        now = self.clock.now()
+        today = now.strftime("%Y-%m-%d")
+        date_in = today if date_in in (None, "", "live") else pd.Timestamp(date_in).strftime("%Y-%m-%d")
+        if date_in > today or not self.source.is_trading_day(date_in):
+            return b"[]", 0
+
+        epoch, rows = self.source.encoded(date_in, series)
+        keep = np.ones(len(epoch), dtype=bool)
+        if date_in == today:
+            keep &= epoch <= int(now.timestamp())
+        if interval and interval > 30:
+            keep &= epoch % interval == 0
+        if self.faults["gap_rate"]:
+            keep &= ~self.source.gaps(date_in, len(epoch), self.faults["gap_rate"])
+        kept = rows[keep]
+        return b"[" + b", ".join(kept) + b"]", len(kept)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"           # keep-alive, like the real API behind the pooled client
+            disable_nagle_algorithm = True          # headers and body go out in separate writes; no 40 ms delayed-ACK stall
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                try:
+                    if url.path.endswith("/aggregateData"):
+                        status, body, content_type = server._aggregate(query)
+                    elif url.path == "/clock":
+                        status, body, content_type = server._clock(query)
+                    elif url.path == "/faults":
+                        status, body, content_type = server._faults(query)
+                    elif url.path == "/stats":
+                        status, body, content_type = 200, json.dumps(server.stats).encode(), "application/json"
+                    else:
+                        status, body, content_type = 404, b"not found", "text/plain"
+                except (ValueError, LookupError) as e:
+                    with server._lock:
+                        server.stats["bad_requests"] += 1
+                    status, body, content_type = 400, str(e).encode(), "text/plain"
+
+                gzipped = status == 200 and "gzip" in self.headers.get("Accept-Encoding", "")
+                if gzipped:
+                    body = gzip.compress(body, compresslevel=1)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                if gzipped:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _aggregate(self, query):
+        series = [s.strip() for s in query.get("series", ",".join(SERIES)).split(",") if s.strip()]
+        unknown = sorted(set(series) - set(SERIES))
+        if unknown:
+            raise ValueError(f"unknown series {unknown} (expected some of {list(SERIES)})")
+        interval = int(query.get("interval", 30))
+
+        with self._lock:
+            self.stats["requests"] += 1
+            latency = self.faults["latency_ms"] + self._rng.uniform(0, self.faults["jitter_ms"])
+            fail = self._rng.random() < self.faults["error_rate"]
+            if fail:
+                self.stats["errors_injected"] += 1
+        if latency:
+            time.sleep(latency / 1000)
+        if fail:
+            return 503, b"injected error", "text/plain"
+
+        body, rows = self.payload(query.get("date"), series, interval)
+        with self._lock:
+            self.stats["rows_served"] += rows
+            self.stats["bytes_served"] += len(body)
+        return 200, body, "application/json"
+
+    def _clock(self, query):
+        if "at" in query or "speed" in query:
+            self.clock.set(at=query.get("at"), speed=float(query["speed"]) if "speed" in query else None)
+        body = {"now": self.clock.now().isoformat(), "speed": self.clock.speed}
+        return 200, json.dumps(body).encode(), "application/json"
+
+    def _faults(self, query):
+        with self._lock:
+            for name in self.faults:
+                if name in query:
+                    self.faults[name] = float(query[name])
+        return 200, json.dumps(self.faults).encode(), "application/json"
+
+
+def session_open(date_in) -> pd.Timestamp:
+    return pd.Timestamp(f"{date_in} {MARKET_OPEN[0]:02d}:{MARKET_OPEN[1]:02d}", tz=MARKET_TZ)
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Serve the aggregateData API locally on a virtual clock")
+    cli.add_argument("--port", type=int, default=DEFAULT_PORT)
+    cli.add_argument("--start", help="virtual time to start at (default: now), e.g. '2026-01-30 09:25'")
+    cli.add_argument("--speed", type=float, default=1.0, help="virtual seconds per wall second (1–1000)")
+    cli.add_argument("--regime", default="mixed", choices=["mixed", "trend", "chop", "crash"])
+    cli.add_argument("--seed", type=int, default=0)
+    cli.add_argument("--cache-dir", help="serve sessions recorded in this data cache instead of synthetic ones")
+    cli.add_argument("--latency-ms", type=float, default=0.0)
+    cli.add_argument("--jitter-ms", type=float, default=0.0)
+    cli.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with HTTP 503")
+    cli.add_argument("--gap-rate", type=float, default=0.0, help="share of 30-second rows missing from the feed")
+    args = cli.parse_args()
+
+    server = ReplayServer(SessionSource(args.regime, args.seed, args.cache_dir),
+                          ReplayClock(args.start, args.speed), port=args.port,
+                          latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          error_rate=args.error_rate, gap_rate=args.gap_rate, seed=args.seed).start()
+    print(f"📼 Replaying {'recorded' if args.cache_dir else args.regime} sessions on {server.url} "
+          f"from {server.clock.now():%Y-%m-%d %H:%M:%S} at {args.speed:g}×")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,197 @@
+"""
+Soak test: the live loop — scheduler → monitor.loop.run_tick (fetch over
+HTTP → ring buffer → streaming indicators → features → cooldown → gate →
+drift → agent → journal → alert → checkpoint), the same tick main() runs —
+against the local replay server (bench/replay.py) for many simulated
+sessions on one machine. The monitor and the server share one ReplayClock,
+so at --speed 1000 a 5-minute bar closes every 0.3 s; --speed 0 runs the
+sessions back to back as fast as the loop allows. Overnight gaps are
+skipped. The agent is the rules backend and alerts go to the console
+backend (kept off the terminal), so nothing leaves the machine.
+
+Reports throughput, tick latency (wall time per tick and bar close →
+decision on the virtual clock) and memory per session, to catch leaks that
+only show up after days of running. Run from the repo root:
+
+    python -m bench.soak --sessions 200 --speed 0
+    python -m bench.soak --sessions 5 --speed 1000 --latency-ms 30 --error-rate 0.05 --gap-rate 0.01
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from bench.replay import ReplayClock, ReplayServer, SessionSource, session_open
+
+
+def _rss_mb() -> float:
+    """Current resident set size (Linux /proc), else the peak from getrusage."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def soak(config, start, sessions, speed=0.0, regime="mixed", seed=0, cache_dir=None,
+         latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, gap_rate=0.0, trace_memory=False, progress=True):
+    """Run the live loop over `sessions` trading days from `start`; returns per-tick and per-session records."""
+    from alerts.console_alert import flush_alerts
+    import alerts.journal as journal
+    from data.fetcher import MarketDataFetcher, fetch_market_data
+    from data.history import BarHistory
+    from indicators.streaming import StreamingIndicators
+    from monitor.backends import use_agent, use_alerts
+    from monitor.checkpoint import Checkpoint
+    from monitor.loop import LoopState, run_tick
+    from monitor.metrics import get_metrics
+    from monitor.scheduler import BarScheduler, MARKET_CLOSE
+    from strategy.drift import DriftDetector
+    from strategy.features import FeatureStore
+    from strategy.gate import load_thresholds
+
+    source = SessionSource(regime, seed, cache_dir)
+    days = [d.strftime("%Y-%m-%d") for d in pd.bdate_range(start, periods=sessions * 2 + 10)
+            if source.is_trading_day(d)]
+    warmup_day, days = days[0], days[1:sessions + 1]
+    clock = ReplayClock(session_open(days[0]) - pd.Timedelta(minutes=5), speed)
+    server = ReplayServer(source, clock, port=0, latency_ms=latency_ms, jitter_ms=jitter_ms,
+                          error_rate=error_rate, gap_rate=gap_rate, seed=seed).start()
+
+    live = config["live"]
+    interval = live["interval_min"]
+    api = {**config["api"], "url": server.url, "cache_dir": None}
+    thresholds = load_thresholds(config)
+    use_agent("rules", config)
+    use_alerts("console")
+    tmp = tempfile.TemporaryDirectory(prefix="bench-soak-")
+    journal._journal = journal.DecisionJournal(tmp.name)
+    metrics = get_metrics()
+
+    history = BarHistory(live["history_size"])
+    history.extend(fetch_market_data(api, interval, date_in=warmup_day))
+    indicators = StreamingIndicators.from_history(history.to_frame(), config["indicators"]["rsi_period"],
+                                                  bar_minutes=interval)
+    fetcher = MarketDataFetcher(api, interval, last_seen=history.last_timestamp)
+    # checkpointed every tick, as live runs are when `live.checkpoint_path` is set
+    checkpoint = Checkpoint(f"{tmp.name}/monitor_state.sqlite") if live.get("checkpoint_path") else None
+    settings = {"interval_min": interval, "history_size": live["history_size"], "rsi_period": config["indicators"]["rsi_period"]}
+    state = LoopState(history, indicators, fetcher, FeatureStore(capacity=390 // interval + 1), thresholds,
+                      DriftDetector.from_config(config), checkpoint=checkpoint, settings=settings)
+
+    if trace_memory:
+        tracemalloc.start()
+    ticks, per_session = [], []
+    started = time.perf_counter()
+    for n, date_in in enumerate(days, 1):
+        # overnight: jump to just before the open instead of sleeping through it
+        clock.set(at=session_open(date_in))
+        scheduler = BarScheduler(interval, offset_sec=live.get("bar_offset_sec", 5), clock=clock,
+                                 holidays=config.get("holidays"))
+        close = pd.Timestamp(f"{date_in} {MARKET_CLOSE[0]:02d}:{MARKET_CLOSE[1]:02d}", tz=clock.tz)
+        session_started = time.perf_counter()
+        session_ticks = 0
+        while True:
+            bar_time = scheduler.wait()
+            tick_started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = run_tick(state, bar_time, scheduler, date_in="live")
+            row = {"date": date_in, "bar": bar_time, "new_bars": result["new_bars"], "agent": result["agent"],
+                   "error": result["error"]}
+            row["tick_ms"] = (time.perf_counter() - tick_started) * 1e3
+            row["lag_sec"] = (clock.now() - bar_time).total_seconds()
+            ticks.append(row)
+            session_ticks += 1
+            if bar_time >= close:
+                break
+
+        gc.collect()
+        wall = time.perf_counter() - session_started
+        record = {"date": date_in, "regime": source.session(date_in).attrs.get("regime", "recorded"),
+                  "ticks": session_ticks, "wall_sec": round(wall, 3), "rss_mb": round(_rss_mb(), 1)}
+        if trace_memory:
+            record["traced_mb"] = round(tracemalloc.get_traced_memory()[0] / 2**20, 2)
+        per_session.append(record)
+        if progress and (n == 1 or n % max(len(days) // 10, 1) == 0 or n == len(days)):
+            print(f"  {n:>4}/{len(days)} {date_in} {record['regime']:<8} {session_ticks} ticks in {wall:.2f}s, "
+                  f"rss {record['rss_mb']} MB" + (f", traced {record['traced_mb']} MB" if trace_memory else ""))
+
+    elapsed = time.perf_counter() - started
+    flush_alerts()
+    journal.get_journal().flush()
+    if trace_memory:
+        tracemalloc.stop()
+    server.stop()
+    tmp.cleanup()
+    return {"ticks": pd.DataFrame(ticks), "sessions": pd.DataFrame(per_session), "elapsed_sec": elapsed,
+            "server": dict(server.stats),
+            "api_errors": {name: value for name, value in metrics.counters().items() if name.startswith("api_errors_total")}}
+
+
+def report(result, interval) -> dict:
+    ticks, sessions = result["ticks"], result["sessions"]
+    tick_ms = ticks["tick_ms"].to_numpy()
+    lag = ticks["lag_sec"].to_numpy()
+    expected_bars = len(sessions) * (390 // interval)      # the 16:00 tick has no bar of its own
+    rss = sessions["rss_mb"].to_numpy()
+    half = len(rss) // 2
+    return {
+        "sessions": len(sessions),
+        "ticks": len(ticks),
+        "ticks_per_sec": round(len(ticks) / result["elapsed_sec"], 1),
+        "tick_ms": {f"p{q}": round(float(np.percentile(tick_ms, q)), 2) for q in (50, 95, 99)} | {"max": round(float(tick_ms.max()), 2)},
+        # on the virtual clock: with --speed 0 this is just the bar offset
+        "bar_close_to_decision_sec": {f"p{q}": round(float(np.percentile(lag, q)), 1) for q in (50, 95, 99)},
+        "agent_calls": int(ticks["agent"].sum()),
+        "bars_received": int(ticks["new_bars"].sum()),
+        "bars_expected": expected_bars,
+        "tick_errors": ticks["error"].value_counts().to_dict(),
+        "api_errors": result["api_errors"],
+        "server": result["server"],
+        "rss_mb": {"first": float(rss[0]), "last": float(rss[-1]), "max": float(rss.max()),
+                   # median of the second half vs the first: steady growth means a leak, not noise
+                   "growth_per_100_sessions": round(float(np.median(rss[half:]) - np.median(rss[:half])) / max(len(rss) - half, 1) * 100, 2)
+                   if len(rss) > 1 else 0.0},
+    }
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Soak-test the live loop against the local replay server")
+    cli.add_argument("--config", default="config/strategy.yaml")
+    cli.add_argument("--start", default="2026-01-05", help="first simulated day (one more before it is the warm-up)")
+    cli.add_argument("--sessions", type=int, default=20)
+    cli.add_argument("--speed", type=float, default=0.0, help="virtual seconds per wall second; 0 = as fast as possible")
+    cli.add_argument("--regime", default="mixed", choices=["mixed", "trend", "chop", "crash"])
+    cli.add_argument("--seed", type=int, default=0)
+    cli.add_argument("--cache-dir", help="replay sessions recorded in this data cache instead of synthetic ones")
+    cli.add_argument("--latency-ms", type=float, default=0.0)
+    cli.add_argument("--jitter-ms", type=float, default=0.0)
+    cli.add_argument("--error-rate", type=float, default=0.0)
+    cli.add_argument("--gap-rate", type=float, default=0.0)
+    cli.add_argument("--trace-memory", action="store_true", help="also track Python allocations (slower)")
+    cli.add_argument("--json", help="write the report here")
+    args = cli.parse_args()
+
+    with open(args.config) as f:
+        config = yaml.safe_load(f)
+    print(f"🧪 Soak: {args.sessions} session(s) from {args.start}, "
+          f"{'as fast as possible' if not args.speed else f'{args.speed:g}× real time'}, "
+          f"{'recorded' if args.cache_dir else args.regime} data")
+    result = soak(config, args.start, args.sessions, args.speed, args.regime, args.seed, args.cache_dir,
+                  args.latency_ms, args.jitter_ms, args.error_rate, args.gap_rate, args.trace_memory)
+    summary = report(result, config["live"]["interval_min"])
+    print(json.dumps(summary, indent=2, default=str))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2, default=str)
+    sys.exit(1 if summary["tick_errors"] else 0)
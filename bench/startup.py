@@ -0,0 +1,125 @@
+"""
+Cold-start budget: how long a fresh interpreter takes to import the entry
+points, measured against `import numpy, pandas` in the same run, and which
+heavy stacks they pull in. A rules-only tick (console alerts) is also run
+end to end in a fresh process and must not import the LLM or Telegram
+libraries at all. Run from the repo root:
+
+    python -m bench.startup                  # check the budget (exit 1 if over)
+    python -m bench.startup --budget-ms 300
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = 250             # allowed import time on top of numpy + pandas
+HEAVY_MODULES = ("langchain_core", "langchain_anthropic", "anthropic", "telegram", "ta")
+
+# what each entry point may cost over numpy + pandas, and which heavy modules it must not load
+TARGETS = {
+    "main": HEAVY_MODULES,
+    "monitor.multi": HEAVY_MODULES,
+    "backtest.runner": HEAVY_MODULES[:-1],        # the vectorized engine needs `ta`
+}
+
+# a bar that passes the default gate with a stretched RSI (→ SELL_PUT from the rules backend)
+SAMPLE_FEATURES = {
+    "current_price": 6890.25, "expected_move": 21.4, "vix": 17.2, "rsi": 31.5,
+    "macd": -2.1, "macd_hist": -0.4, "macd_signal": -1.7,
+    "bb_upper": 6912.0, "bb_lower": 6885.5, "bb_middle": 6898.7, "premium_ratio": 6.1,
+    "ema9": 6892.1, "ema21": 6896.4, "ema50": 6899.9,
+    "ema21_slope_5min": -0.4, "ema21_slope_15min": -0.5, "ema21_slope_30min": -0.3,
+    "ret_5min_pct": 0.02, "ret_15min_pct": -0.21, "ret_30min_pct": -0.35,
+    "time_to_close_min": 200, "current_time": "2026-01-30 12:40:00",
+}
+
+_PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"sec": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+_RULES_TICK = """
+from monitor.backends import use_agent, use_alerts
+from agent.agent import evaluate_with_agent
+from alerts.console_alert import flush_alerts, log_decision, send_alert
+from strategy.gate import is_actionable, should_consider_trade
+
+features = {features!r}
+use_agent("rules", {{}})
+use_alerts("console")
+assert should_consider_trade(features)
+decision = evaluate_with_agent(features)
+log_decision(decision.model_dump(), features)
+if is_actionable(decision):
+    send_alert(decision.model_dump(), features)
+flush_alerts()
+"""
+
+
+def probe(code, cwd):
+    """Seconds `code` took in a fresh interpreter, and the heavy modules it left loaded."""
+    out = subprocess.run([sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"probe failed:\n{out.stderr.strip()}")
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return result["sec"], result["loaded"]
+
+
+def check(budget_ms=DEFAULT_BUDGET_MS, runs=5) -> list:
+    """
+    Rows of (name, median ms, overhead ms, forbidden modules loaded, ok). Probes
+    are interleaved and each one's overhead is taken against the numpy + pandas
+    probe of the same round, so machine noise and drift mostly cancel out.
+    """
+    probes = {"numpy + pandas": ("import numpy, pandas", ())}
+    probes.update({f"import {module}": (f"import {module}", forbidden) for module, forbidden in TARGETS.items()})
+    probes["rules-only tick"] = (_RULES_TICK.format(features=SAMPLE_FEATURES), HEAVY_MODULES)
+
+    times = {name: [] for name in probes}
+    loaded = {name: set() for name in probes}
+    with tempfile.TemporaryDirectory(prefix="bench-startup-") as cwd:     # keep journals out of the repo
+        for _ in range(runs):
+            for name, (body, _) in probes.items():
+                sec, modules = probe(_PROBE.format(root=str(ROOT), body=body, heavy=HEAVY_MODULES), cwd)
+                times[name].append(sec)
+                loaded[name].update(modules)
+
+    base = np.array(times["numpy + pandas"])
+    rows = []
+    for name, (_, forbidden) in probes.items():
+        overhead = float(np.median(np.array(times[name]) - base)) * 1e3
+        bad = sorted(m for m in loaded[name] if m in forbidden)
+        rows.append((name, float(np.median(times[name])) * 1e3, overhead, bad, overhead <= budget_ms and not bad))
+    return rows
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Check cold-start import time against a budget")
+    cli.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                     help="allowed time on top of importing numpy + pandas")
+    cli.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    args = cli.parse_args()
+
+    print(f"🚀 Cold start, median of {args.runs} fresh interpreters (budget: numpy + pandas + {args.budget_ms:.0f} ms)")
+    print(f"\n{'probe':<24}{'ms':>10}{'overhead':>10}  heavy modules")
+    failed = []
+    for name, ms, overhead, bad, ok in check(args.budget_ms, args.runs):
+        print(f"{name:<24}{ms:10.1f}{overhead:10.1f}  {', '.join(bad) or '—'}{'' if ok else '  ❌'}")
+        if not ok:
+            failed.append(name)
+
+    if failed:
+        print(f"\n❌ Over budget or importing heavy stacks: {', '.join(failed)}")
+        sys.exit(1)
+    print("\n✅ All entry points within budget")
@@ -0,0 +1,364 @@
+"""
+Benchmark suite for the hot paths, on deterministic synthetic sessions.
+
+Each benchmark is timed on its own (median of several rounds), plus a full
+offline tick of the live loop (monitor.loop.run_tick: cached fetch → ring
+buffer → streaming indicators → features → cooldown → gate → drift → stub
+agent → decision log → alert) with the LLM and Telegram stubbed. Results are compared with bench/baseline.json, a
+baseline recorded on this machine (git-ignored: absolute timings do not
+carry across machines). The first run records it; after that the run fails
+if any benchmark is slower than its baseline by more than the threshold.
+A baseline from a different environment (CPU, Python, numpy, pandas) is
+still printed for reference but never fails the run. Run from the repo root:
+
+    python -m bench.suite                    # compare with this machine's baseline
+    python -m bench.suite --save             # record a new baseline
+    python -m bench.suite -k indicators      # only benchmarks whose name contains "indicators"
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bench.synthetic import generate_days, to_payload
+
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25            # fail if > 25% slower than the baseline
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register `setup(args) -> callable`; the callable is what gets timed."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def time_call(fn, rounds=7, min_sec=0.05):
+    """Median seconds per call; each round repeats fn until it has run for at least min_sec."""
+    fn()
+    started, loops = time.perf_counter(), 0
+    while time.perf_counter() - started < min_sec:
+        fn()
+        loops += 1
+    loops = max(loops, 1)
+
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - started) / loops)
+    return float(np.median(samples)), loops
+
+
+# ────────────────────────────────────────────────
+# Fixtures
+# ────────────────────────────────────────────────
+
+class Fixture:
+    """Synthetic days plus everything derived from them, built once per run; close() removes its temp dirs."""
+
+    def __init__(self, days=3, history_size=200, regime="mixed", seed=0, interval=5):
+        from data.parse import parse_aggregate
+
+        self.interval = interval
+        self.history_size = history_size
+        self.sessions = generate_days("2026-01-26", days=days, regime=regime, seed=seed)
+        self.dates = list(self.sessions)
+        self.payload = to_payload(self.sessions[self.dates[-1]])
+        self.bars = pd.concat(parse_aggregate(to_payload(s), interval) for s in self.sessions.values())
+        self.history = self.bars.iloc[-history_size:]
+        self._tmp = []
+
+    def tempdir(self, prefix) -> Path:
+        tmp = tempfile.TemporaryDirectory(prefix=prefix)
+        self._tmp.append(tmp)
+        return Path(tmp.name)
+
+    def close(self):
+        for tmp in self._tmp:
+            tmp.cleanup()
+        self._tmp.clear()
+
+
+# ────────────────────────────────────────────────
+# Hot paths
+# ────────────────────────────────────────────────
+
+@benchmark("parse.aggregate")
+def _parse(fx):
+    from data.parse import parse_aggregate
+    return lambda: parse_aggregate(fx.payload, fx.interval)
+
+
+@benchmark("resample.all_timeframes")
+def _resample(fx):
+    from indicators.resample import resample_all
+    session = fx.sessions[fx.dates[-1]]
+    return lambda: resample_all(session)
+
+
+@benchmark("resample.incremental_session")
+def _resample_incremental(fx):
+    from indicators.resample import BarResampler
+    session = fx.sessions[fx.dates[-1]]
+    return lambda: BarResampler().extend(session)
+
+
+@benchmark("indicators.add_indicators")
+def _add_indicators(fx):
+    from indicators.technicals import add_indicators
+    return lambda: add_indicators(fx.history, 14, bar_minutes=fx.interval)
+
+
+@benchmark("indicators.streaming_update")
+def _streaming(fx):
+    from indicators.streaming import INPUT_COLUMNS, StreamingIndicators
+    engine = StreamingIndicators.from_history(fx.history.iloc[:-1], 14, bar_minutes=fx.interval)
+    ts = fx.history.index[-1]
+    bar = fx.history[INPUT_COLUMNS].iloc[-1].to_dict()
+    return lambda: engine.update(ts, bar)
+
+
+@benchmark("features.build_features")
+def _features(fx):
+    from indicators.streaming import StreamingIndicators
+    from strategy.features import build_features
+    latest = StreamingIndicators.from_history(fx.history, 14, bar_minutes=fx.interval).latest()
+    return lambda: build_features(latest)
+
+
+@benchmark("features.store_append")
+def _feature_store(fx):
+    from indicators.streaming import StreamingIndicators
+    from strategy.features import FeatureStore
+    engine = StreamingIndicators.from_history(fx.history, 14, bar_minutes=fx.interval)
+    store = FeatureStore(capacity=79)
+    ts, row = engine.last_timestamp, engine.last_row
+
+    def append():
+        if len(store) == store.capacity:
+            store.clear()
+        return store.append(ts, row)
+    return append
+
+
+@benchmark("features.store_session_frame")
+def _feature_frame(fx):
+    from indicators.technicals import add_indicators
+    from strategy.features import FeatureStore
+    store = FeatureStore.from_frame(add_indicators(fx.bars, 14, bar_minutes=fx.interval))
+    return store.to_frame
+
+
+@benchmark("gate.gate_check_78_bars")
+def _gate(fx):
+    from strategy.features import build_features
+    from strategy.gate import gate_check, load_thresholds
+    from indicators.technicals import add_indicators
+    indicators = add_indicators(fx.history, 14, bar_minutes=fx.interval)
+    features = [build_features(row) for _, row in indicators.iloc[-78:].iterrows()]
+    thresholds = load_thresholds({})
+    # gate_check is the decision itself; should_consider_trade only adds the queued log message
+    return lambda: [gate_check(f, thresholds) for f in features]
+
+
+@benchmark("gate.gate_mask_session")
+def _gate_mask(fx):
+    from indicators.technicals import add_indicators
+    from strategy.features import build_feature_frame
+    from strategy.gate import gate_mask, load_thresholds
+    frame = build_feature_frame(add_indicators(fx.bars, 14, bar_minutes=fx.interval))
+    thresholds = load_thresholds({})
+    return lambda: gate_mask(frame, thresholds)
+
+
+@benchmark("tick.offline")
+def _tick(fx):
+    """One full live-loop tick (monitor.loop.run_tick) for a bar, everything local: session cache, stub LLM, fake Telegram."""
+    import agent.agent as agent
+    from agent.cache import DecisionCache
+    from agent.stub import StubChatModel
+    from alerts.console_alert import set_dispatcher
+    from alerts.dispatcher import AlertDispatcher, FakeTransport
+    from alerts.journal import DecisionJournal
+    import alerts.journal as journal
+    from data.cache import save_session
+    from data.fetcher import MarketDataFetcher
+    from data.history import BarHistory
+    from indicators.streaming import StreamingIndicators
+    from monitor.loop import LoopState, run_tick
+    from strategy.drift import DriftDetector
+    from strategy.features import FeatureStore
+    from strategy.gate import load_thresholds
+
+    tmp = fx.tempdir("bench-tick-")
+    series = "spx,vix,spxExpectedMove,spxOTMBids"
+    api = {"url": "http://127.0.0.1:9/unused", "params": {"series": series}, "cache_dir": str(tmp / "cache")}
+    for date_in, frame in fx.sessions.items():
+        save_session(api["cache_dir"], date_in, series, fx.interval,
+                     frame[(frame.index.minute % fx.interval == 0) & (frame.index.second == 0)])
+
+    agent.use_llm(StubChatModel())
+    agent.decision_cache = DecisionCache(tmp / "agent_cache.sqlite")
+    set_dispatcher(AlertDispatcher(FakeTransport(), coalesce_sec=0))
+    journal._journal = DecisionJournal(tmp)
+    thresholds = {**load_thresholds({}), "rsi_neutral_low": 101}       # let most bars reach the agent
+
+    date_in = fx.dates[-1]
+    warmup = fx.bars[fx.bars.index < pd.Timestamp(date_in, tz=fx.bars.index.tz)]
+    session_bars = fx.bars[fx.bars.index >= pd.Timestamp(date_in, tz=fx.bars.index.tz)]
+    times = [ts.strftime("%H:%M:%S") for ts in session_bars.index[6:]]
+    state = {}
+
+    def reset():
+        history = BarHistory(fx.history_size)
+        history.extend(warmup)
+        indicators = StreamingIndicators.from_history(history.to_frame(), 14, bar_minutes=fx.interval)
+        fetcher = MarketDataFetcher(api, fx.interval, last_seen=history.last_timestamp)
+        state["loop"] = LoopState(history, indicators, fetcher, FeatureStore(capacity=79), thresholds,
+                                  DriftDetector.from_config({}))
+        state["i"] = 0
+
+    def tick():
+        if state.get("i", len(times)) >= len(times):
+            reset()
+        time_in = times[state["i"]]
+        state["i"] += 1
+        run_tick(state["loop"], date_in=date_in, time_in=time_in)
+
+    # the log/alert prints are part of the tick, but keep them off the terminal
+    def quiet_tick():
+        stdout, sys.stdout = sys.stdout, _NULL
+        try:
+            tick()
+        finally:
+            sys.stdout = stdout
+    return quiet_tick
+
+
+class _Null:
+    def write(self, _):
+        return 0
+
+    def flush(self):
+        pass
+
+
+_NULL = _Null()
+
+
+# ────────────────────────────────────────────────
+# Baseline
+# ────────────────────────────────────────────────
+
+def run(pattern=None, fixture=None, rounds=7):
+    fixture = fixture or Fixture()
+    results = {}
+    try:
+        for name, setup in BENCHMARKS.items():
+            if pattern and pattern not in name:
+                continue
+            seconds, loops = time_call(setup(fixture), rounds=rounds)
+            results[name] = {"median_us": round(seconds * 1e6, 2), "loops": loops}
+            print(f"  {name:<32} {seconds * 1e6:12.1f} µs")
+    finally:
+        fixture.close()
+    return results
+
+
+def environment() -> dict:
+    """What the timings depend on; a baseline only gates runs on the same environment."""
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu = next((line.split(":", 1)[1].strip() for line in f if line.startswith("model name")), cpu)
+    except OSError:
+        pass
+    return {"python": platform.python_version(), "machine": platform.machine(), "cpu": cpu,
+            "numpy": np.__version__, "pandas": pd.__version__}
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Rows of (name, baseline_us, now_us, ratio, regressed)."""
+    rows = []
+    for name, now in results.items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if base is None:
+            rows.append((name, None, now["median_us"], None, False))
+            continue
+        ratio = now["median_us"] / base["median_us"]
+        rows.append((name, base["median_us"], now["median_us"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def save_baseline(results, path=BASELINE_PATH, fixture_args=None):
+    data = {
+        "created": pd.Timestamp.now(tz="UTC").isoformat(timespec="seconds"),
+        "environment": environment(),
+        "fixture": fixture_args or {},
+        "benchmarks": results,
+    }
+    Path(path).write_text(json.dumps(data, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Benchmark the hot paths on synthetic sessions")
+    cli.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    cli.add_argument("--days", type=int, default=3, help="synthetic business days (last one is the benchmark session)")
+    cli.add_argument("--history", type=int, default=200, help="bars of indicator history")
+    cli.add_argument("--regime", default="mixed", choices=["mixed", "trend", "chop", "crash"])
+    cli.add_argument("--seed", type=int, default=0)
+    cli.add_argument("--rounds", type=int, default=7)
+    cli.add_argument("--baseline", default=str(BASELINE_PATH))
+    cli.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                     help="allowed slowdown vs. the baseline (0.25 = 25%%)")
+    cli.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    args = cli.parse_args()
+
+    fixture_args = {"days": args.days, "history_size": args.history, "regime": args.regime, "seed": args.seed}
+    print(f"🏁 Benchmarks on {args.days} synthetic day(s), regime={args.regime}, history={args.history}")
+    results = run(args.pattern, Fixture(**fixture_args), rounds=args.rounds)
+
+    if args.save or not Path(args.baseline).exists():
+        save_baseline(results, args.baseline, fixture_args)
+        print(f"💾 Baseline for this machine written to {args.baseline}")
+        sys.exit(0)
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    # absolute timings only mean something against the same machine and stack
+    gating = True
+    if baseline.get("environment") != environment():
+        print(f"⚠️ Baseline was recorded on {baseline.get('environment')}, this is {environment()} — "
+              f"shown for reference only; re-record with --save")
+        gating = False
+    if baseline.get("fixture") and baseline["fixture"] != fixture_args:
+        print(f"⚠️ Baseline was recorded with {baseline['fixture']}, this run used {fixture_args} — "
+              f"shown for reference only")
+        gating = False
+
+    regressed = []
+    print(f"\n{'benchmark':<34}{'baseline µs':>14}{'now µs':>12}{'ratio':>8}")
+    for name, base, now, ratio, bad in compare(results, baseline, args.threshold):
+        base_txt = f"{base:14.1f}" if base is not None else f"{'—':>14}"
+        ratio_txt = f"{ratio:8.2f}" if ratio is not None else f"{'new':>8}"
+        print(f"{name:<34}{base_txt}{now:12.1f}{ratio_txt}{'  ❌' if bad else ''}")
+        if bad:
+            regressed.append(name)
+
+    if regressed and not gating:
+        print(f"\n⚠️ {len(regressed)} benchmark(s) slower than a baseline from another environment or fixture — not failing the run")
+        sys.exit(0)
+    if regressed:
+        print(f"\n❌ {len(regressed)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressed)}")
+        sys.exit(1)
+    print(f"\n✅ No benchmark regressed by more than {args.threshold:.0%}")
@@ -0,0 +1,97 @@
+"""
+Deterministic synthetic SPX sessions for benchmarks and offline runs.
+
+Every session is 780 rows of 30-second data (09:30–15:59:30 ET) with the
+four API series. Regimes:
+
+- trend: steady drift with moderate noise
+- chop:  mean-reverting around the open, low volatility
+- crash: calm first half, then a sell-off with rising VIX and fatter premiums
+- mixed: a random regime per day (seeded)
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from indicators.resample import INPUT_COLUMNS
+
+
+MARKET_TZ = "America/New_York"
+ROWS_PER_SESSION = 780
+REGIMES = ("trend", "chop", "crash")
+
+
+def _session_index(date_in, rows):
+    start = pd.Timestamp(f"{date_in} 09:30", tz=MARKET_TZ)
+    return pd.DatetimeIndex(start + pd.to_timedelta(np.arange(rows) * 30, unit="s"), name="dateTime").as_unit("ns")
+
+
+def generate_session(date_in, regime="mixed", seed=0, rows=ROWS_PER_SESSION, open_price=6900.0, open_vix=16.0):
+    """One session of 30-second rows as a float DataFrame indexed like parse_aggregate(..., None)."""
+    day_seed = seed * 1_000_003 + int(pd.Timestamp(date_in).strftime("%Y%m%d"))
+    rng = np.random.default_rng(day_seed)
+    if regime == "mixed":
+        regime = REGIMES[rng.integers(len(REGIMES))]
+
+    t = np.arange(rows)
+    step_vol = open_price * 0.00035 * np.sqrt(open_vix / 16)
+    if regime == "trend":
+        drift = rng.choice([-1, 1]) * open_price * rng.uniform(0.004, 0.012) / rows
+        spx = open_price + np.cumsum(drift + rng.normal(0, step_vol, rows))
+        vix = open_vix - np.sign(drift) * np.linspace(0, 1.0, rows) + rng.normal(0, 0.08, rows)
+    elif regime == "chop":
+        spx = np.empty(rows)
+        x = 0.0
+        for i in range(rows):                       # Ornstein–Uhlenbeck around the open
+            x += -0.03 * x + rng.normal(0, step_vol * 0.7)
+            spx[i] = open_price + x
+        vix = open_vix - 0.5 * t / rows + rng.normal(0, 0.05, rows)
+    elif regime == "crash":
+        start = int(rows * rng.uniform(0.35, 0.6))
+        shock = np.zeros(rows)
+        shock[start:] = -open_price * rng.uniform(0.02, 0.04) / (rows - start)
+        vol = np.where(t < start, step_vol, step_vol * 3)
+        spx = open_price + np.cumsum(shock + rng.normal(0, 1, rows) * vol)
+        vix = open_vix + np.where(t < start, 0, (t - start) / (rows - start) * rng.uniform(6, 12)) + rng.normal(0, 0.15, rows)
+    else:
+        raise ValueError(f"unknown regime {regime!r} (expected one of {REGIMES + ('mixed',)})")
+
+    vix = np.clip(vix, 9, 80)
+    minutes_left = (rows - t) * 0.5
+    expected_move = spx * vix / 100 * np.sqrt(np.maximum(minutes_left, 1) / (252 * 390)) * 1.8
+    otm_bids = expected_move * rng.uniform(3.2, 4.2) * (1 + 0.4 * np.clip(vix - open_vix, 0, None) / 10)
+    otm_bids *= np.exp(rng.normal(0, 0.03, rows))
+
+    frame = pd.DataFrame(
+        {"spx": spx, "spxExpectedMove": expected_move, "spxOTMBids": otm_bids, "vix": vix},
+        index=_session_index(date_in, rows),
+    ).round(2)
+    frame.attrs["regime"] = regime
+    return frame[INPUT_COLUMNS]
+
+
+def generate_days(start, days=1, regime="mixed", seed=0):
+    """{date: session frame} for `days` business days from `start`, each opening where the last one closed."""
+    sessions = {}
+    price, vix = 6900.0, 16.0
+    for day in pd.bdate_range(start, periods=days):
+        date_in = day.strftime("%Y-%m-%d")
+        frame = generate_session(date_in, regime=regime, seed=seed, open_price=price, open_vix=min(vix, 30))
+        sessions[date_in] = frame
+        price, vix = float(frame["spx"].iloc[-1]), float(frame["vix"].iloc[-1])
+    return sessions
+
+
+def encode_rows(frame) -> list:
+    """One aggregateData JSON object (bytes) per row of a session frame."""
+    epoch = frame.index.as_unit("s").asi8
+    return [
+        json.dumps({"dateTime": int(ts), **{col: f"{row[i]:.2f}" for i, col in enumerate(frame.columns)}}).encode()
+        for ts, row in zip(epoch, frame.to_numpy())
+    ]
+
+
+def to_payload(frame) -> bytes:
+    """aggregateData JSON for a session frame: epoch seconds, numbers as strings like the live API."""
+    return b"[" + b", ".join(encode_rows(frame)) + b"]"
@@ -0,0 +1,100 @@
+import argparse
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+
+MARKET_TZ = "America/New_York"
+INDEX_FILE = "dateTime.npy"
+
+
+# ────────────────────────────────────────────────
+# Layout: <cache_dir>/<date>/<series>_<interval>m/<column>.npy  (<series>_raw for the 30-second stream)
+# ────────────────────────────────────────────────
+
+def session_dir(cache_dir, date_in, series, interval) -> Path:
+    series_key = "-".join(sorted(s.strip() for s in series.split(",")))
+    return Path(cache_dir) / date_in / f"{series_key}_{f'{interval}m' if interval else 'raw'}"
+
+
+def is_finished_session(date_in) -> bool:
+    """Only sessions strictly before today (ET) are final and safe to cache."""
+    if not date_in or date_in == "live":
+        return False
+    today = pd.Timestamp.now(tz=MARKET_TZ).normalize().tz_localize(None)
+    return pd.Timestamp(date_in) < today
+
+
+def load_session(cache_dir, date_in, series, interval):
+    """Load a cached session (one np.load per column, no parsing); returns None on a cache miss."""
+    path = session_dir(cache_dir, date_in, series, interval)
+    if not (path / INDEX_FILE).exists():
+        return None
+
+    # plain loads: the frame consolidates the columns into one block anyway, so a memory map would be copied
+    ts = np.load(path / INDEX_FILE)
+    columns = {
+        f.stem: np.load(f)
+        for f in sorted(path.glob("*.npy")) if f.name != INDEX_FILE
+    }
+    index = pd.DatetimeIndex(pd.to_datetime(ts, unit="ns", utc=True), name="dateTime").tz_convert(MARKET_TZ)
+    return pd.DataFrame(columns, index=index)
+
+
+def save_session(cache_dir, date_in, series, interval, df):
+    """Write one column per .npy file into a temp dir, then swap it in atomically."""
+    path = session_dir(cache_dir, date_in, series, interval)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = Path(tempfile.mkdtemp(dir=path.parent, prefix=".tmp-"))
+    try:
+        np.save(tmp / INDEX_FILE, df.index.as_unit("ns").asi8)
+        for col in df.columns:
+            np.save(tmp / f"{col}.npy", df[col].to_numpy(dtype="float64"))
+        if path.exists():
+            shutil.rmtree(path)
+        os.replace(tmp, path)
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def prefetch(api_config, interval, start, end):
+    """Download and cache every business day in [start, end] that is not cached yet."""
+    from data.fetcher import fetch_market_data
+
+    cache_dir = api_config["cache_dir"]
+    series = api_config["params"]["series"]
+    for day in pd.bdate_range(start, end):
+        date_in = day.strftime("%Y-%m-%d")
+        if not is_finished_session(date_in):
+            print(f"⏭️ {date_in} not finished yet, skipping")
+            continue
+        if session_dir(cache_dir, date_in, series, interval).exists():
+            print(f"✅ {date_in} already cached")
+            continue
+        try:
+            df = fetch_market_data(api_config, interval, date_in=date_in)
+            print(f"💾 {date_in} cached ({len(df)} bars)")
+        except Exception as e:
+            print(f"❌ {date_in} failed: {e}")
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Local bar cache for finished sessions")
+    sub = cli.add_subparsers(dest="command", required=True)
+    pre = sub.add_parser("prefetch", help="download a range of dates into the cache")
+    pre.add_argument("start", help="first date, YYYY-MM-DD")
+    pre.add_argument("end", help="last date, YYYY-MM-DD")
+    pre.add_argument("--config", default="config/strategy.yaml")
+    pre.add_argument("--mode", default="backtest", help="config section holding interval_min")
+    args = cli.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+    prefetch(config["api"], config[args.mode]["interval_min"], args.start, args.end)
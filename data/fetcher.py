@@ -1,43 +1,74 @@
-import requests
+import time
+
 import pandas as pd
 
+from data.cache import is_finished_session, load_session, save_session
+from data.http import get_client
+from data.parse import parse_aggregate
+
 
-def fetch_market_data(api_config,interval,date_in="live",time_in=None):
+def fetch_market_data(api_config,interval,date_in="live",time_in=None,since=None,deadline=None):
 
     # if date is null or empty, set to "live"
     if not date_in or date_in.strip() == "":
         date_in = "live"
-    
-    response = requests.get(
+
+    # finished sessions never change → serve them from the local cache when enabled
+    cache_dir = api_config.get("cache_dir")
+    if cache_dir and is_finished_session(date_in):
+        series = api_config["params"]["series"]
+        df_m = load_session(cache_dir, date_in, series, interval)
+        if df_m is None:
+            df_m = _download(api_config, interval, date_in, deadline=deadline)
+            save_session(cache_dir, date_in, series, interval, df_m)
+        if since is not None:
+            df_m = df_m[df_m.index > since]
+    else:
+        df_m = _download(api_config, interval, date_in, since=since, deadline=deadline)
+
+    # if time_in is provided, filter dataframe to only include rows before time_in on date_in
+    if time_in:
+        time_filter = pd.to_datetime(f"{date_in} {time_in}").tz_localize('America/New_York')
+        df_m = df_m[df_m.index <= time_filter]
+
+    return df_m
+
+
+def _download(api_config, interval, date_in, since=None, deadline=None):
+    # pooled keep-alive session with deadline-aware retry/hedging (data/http.py)
+    response = get_client(api_config).get(
         api_config["url"],
         params=api_config["params"] | {"date": date_in} | {"interval": "30"},
-        timeout=10
+        deadline=deadline,
     )
     response.raise_for_status()
     # if response status code is not 200, raise exception
     if response.status_code != 200:
         raise Exception(f"API request failed with status code {response.status_code}")
 
-    df = pd.DataFrame(response.json())
-
-    for col in ["spx", "spxExpectedMove", "spxOTMBids", "vix"]:
-        df[col] = df[col].astype(float)
+    # decode straight into typed columns, selecting interval bars on raw epoch seconds
+    series = [col.strip() for col in api_config["params"]["series"].split(",")]
+    return parse_aggregate(response.content, interval, since=since, columns=series)
 
-    df['dateTime'] = pd.to_datetime(df['dateTime'], unit='s').dt.tz_localize('UTC').dt.tz_convert('America/New_York')
 
-    # set dateTime as index and sort by dateTime
-    df.set_index('dateTime', inplace=True)
-    df.sort_index(inplace=True)
+class MarketDataFetcher:
+    """
+    Remembers the last bar it has returned so each poll only yields new bars.
+    Seed `last_seen` with the newest bar of the warm-up history.
+    """
 
-    df_m = df[
-        (df.index.minute % interval == 0) &
-        (df.index.second == 0)
-    ]
+    def __init__(self, api_config, interval, last_seen=None):
+        self.api_config = api_config
+        self.interval = interval
+        self.last_seen = last_seen
 
-    # if time_in is provided, filter dataframe to only include rows before time_in on date_in
-    if time_in:
-        time_filter = pd.to_datetime(f"{date_in} {time_in}").tz_localize('America/New_York')
-        df_m = df_m[df_m.index <= time_filter]
-
-    
-    return df_m
+    def fetch_new(self, date_in="live", time_in=None, deadline=None):
+        if deadline is None and self.api_config.get("deadline_sec"):
+            deadline = time.monotonic() + self.api_config["deadline_sec"]
+        df = fetch_market_data(self.api_config, self.interval, date_in=date_in, time_in=time_in,
+                               since=self.last_seen, deadline=deadline)
+        if self.last_seen is not None:
+            df = df[df.index > self.last_seen]
+        if not df.empty:
+            self.last_seen = df.index[-1]
+        return df
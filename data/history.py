@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from indicators.streaming import INPUT_COLUMNS
+
+
+class BarHistory:
+    """
+    Fixed-capacity, timestamp-keyed ring buffer of bars.
+
+    Bars must arrive in time order: anything at or before the newest stored
+    timestamp is a duplicate (or stale) and is rejected, so re-fetched bars
+    can never pile up in the window. Memory is allocated once up front.
+    """
+
+    def __init__(self, capacity, columns=INPUT_COLUMNS, tz="America/New_York"):
+        self.capacity = capacity
+        self.columns = list(columns)
+        self.tz = tz
+        self._ts = np.empty(capacity, dtype="int64")           # epoch ns
+        self._values = np.empty((capacity, len(self.columns)), dtype="float64")
+        self._end = 0      # next write position
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def last_timestamp(self):
+        if not self._size:
+            return None
+        return pd.Timestamp(int(self._ts[(self._end - 1) % self.capacity]), tz="UTC").tz_convert(self.tz)
+
+    def append(self, ts, bar) -> bool:
+        """Add one bar; returns False if the timestamp is not newer than the last one."""
+        ts_ns = pd.Timestamp(ts).value
+        if self._size and ts_ns <= self._ts[(self._end - 1) % self.capacity]:
+            return False
+        self._ts[self._end] = ts_ns
+        self._values[self._end] = [bar[col] for col in self.columns]
+        self._end = (self._end + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return True
+
+    def extend(self, df) -> pd.DataFrame:
+        """Add every new bar of a DatetimeIndex frame; returns only the rows that were accepted."""
+        if df.empty:
+            return df
+
+        ts = df.index.as_unit("ns").asi8
+        keep = np.ones(len(ts), dtype=bool)
+        keep[1:] = ts[1:] > np.maximum.accumulate(ts)[:-1]    # drop in-frame repeats / out-of-order
+        if self._size:
+            keep &= ts > self._ts[(self._end - 1) % self.capacity]
+        accepted = df[keep]
+        if accepted.empty:
+            return accepted
+
+        ts = ts[keep][-self.capacity:]
+        values = accepted[self.columns].to_numpy(dtype="float64")[-self.capacity:]
+        pos = (self._end + np.arange(len(ts))) % self.capacity
+        self._ts[pos] = ts
+        self._values[pos] = values
+        self._end = (self._end + len(ts)) % self.capacity
+        self._size = min(self._size + len(ts), self.capacity)
+        return accepted
+
+    def to_frame(self) -> pd.DataFrame:
+        """Oldest-to-newest copy of the window as a DataFrame indexed by dateTime."""
+        order = (self._end - self._size + np.arange(self._size)) % self.capacity
+        index = pd.DatetimeIndex(pd.to_datetime(self._ts[order], unit="ns", utc=True), name="dateTime").tz_convert(self.tz)
+        return pd.DataFrame(self._values[order], index=index, columns=self.columns)
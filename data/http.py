@@ -0,0 +1,170 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from monitor.metrics import get_metrics
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RetryableError(Exception):
+    pass
+
+
+class FetchClient:
+    """
+    Keep-alive HTTP client for the market-data API.
+
+    - one pooled requests.Session (no TCP+TLS handshake per poll), gzip accepted
+    - jittered exponential retry on timeouts, connection errors and 429/5xx,
+      but never past the caller's deadline
+    - optional hedging: if an attempt is still running after `hedge_after_sec`,
+      a second identical request is fired and the first good answer wins
+    - per-request timings and byte counts in `metrics` (see stats())
+    """
+
+    def __init__(self, timeout_sec=10.0, max_retries=3, backoff_sec=0.5, hedge_after_sec=None,
+                 pool_size=4, history=500):
+        self.timeout_sec = timeout_sec
+        self.max_retries = max_retries
+        self.backoff_sec = backoff_sec
+        self.hedge_after_sec = hedge_after_sec
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="fetch") if hedge_after_sec else None
+        self._lock = threading.Lock()
+        self.metrics = deque(maxlen=history)
+        self.errors = 0
+
+    # ─── single attempt ───
+
+    def _attempt(self, url, params, timeout):
+        started = time.perf_counter()
+        response = self.session.get(url, params=params, timeout=timeout)
+        if response.status_code in RETRY_STATUSES:
+            raise RetryableError(f"HTTP {response.status_code}")
+        response.raise_for_status()
+        response.elapsed_sec = time.perf_counter() - started
+        return response
+
+    def _hedged(self, url, params, timeout):
+        if not self._executor:
+            return self._attempt(url, params, timeout), False
+
+        # both requests share the first one's budget: a failed answer must not restart the clock
+        expires = time.monotonic() + timeout
+        first = self._executor.submit(self._attempt, url, params, timeout)
+        done, _ = wait([first], timeout=min(self.hedge_after_sec, timeout))
+        if done:
+            return first.result(), False
+
+        second = self._executor.submit(self._attempt, url, params, max(expires - time.monotonic(), 0.001))
+        pending, error = {first, second}, None
+        while pending:
+            remaining = expires - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    return future.result(), True
+                error = future.exception()
+        raise error or requests.Timeout("hedged request timed out")
+
+    # ─── public ───
+
+    def get(self, url, params=None, deadline=None):
+        """
+        GET with retries. `deadline` is a time.monotonic() value the whole call
+        must finish by (e.g. the next bar close); no attempt or backoff sleep
+        is started that would overrun it.
+        """
+        started = time.perf_counter()
+        attempts = 0
+        while True:
+            attempts += 1
+            timeout = self.timeout_sec
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    raise requests.Timeout("tick deadline reached before the request could complete")
+            try:
+                response, hedged = self._hedged(url, params, timeout)
+                self._record(url, response, attempts, hedged, time.perf_counter() - started)
+                return response
+            except (requests.ConnectionError, requests.Timeout, RetryableError) as e:
+                with self._lock:
+                    self.errors += 1
+                get_metrics().inc("api_errors_total", error=type(e).__name__)
+                if attempts > self.max_retries:
+                    raise
+                delay = self.backoff_sec * (2 ** (attempts - 1)) * random.uniform(0.5, 1.5)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    raise
+                print(f"⚠️ Fetch attempt {attempts} failed ({e}); retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+    def _record(self, url, response, attempts, hedged, total_sec):
+        with self._lock:
+            self.metrics.append({
+                "url": url,
+                "status": response.status_code,
+                "attempts": attempts,
+                "hedged": hedged,
+                "latency_sec": response.elapsed_sec,
+                "total_sec": total_sec,
+                "wire_bytes": int(response.headers.get("Content-Length") or len(response.content)),
+                "bytes": len(response.content),
+            })
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = list(self.metrics)
+            errors = self.errors
+        if not rows:
+            return {"requests": 0, "errors": errors}
+        total = np.array([r["total_sec"] for r in rows])
+        return {
+            "requests": len(rows),
+            "errors": errors,
+            "retried": sum(r["attempts"] > 1 for r in rows),
+            "hedged": sum(r["hedged"] for r in rows),
+            "p50_sec": round(float(np.percentile(total, 50)), 4),
+            "p95_sec": round(float(np.percentile(total, 95)), 4),
+            "p99_sec": round(float(np.percentile(total, 99)), 4),
+            "wire_bytes": sum(r["wire_bytes"] for r in rows),
+            "bytes": sum(r["bytes"] for r in rows),
+        }
+
+    def close(self):
+        self.session.close()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+
+
+_clients = {}
+
+
+def get_client(api_config) -> FetchClient:
+    """One shared client per process, configured from the `api:` section of strategy.yaml."""
+    # keyed by pid too: a pooled session must never be shared across a fork
+    key = (os.getpid(), api_config.get("timeout_sec", 10), api_config.get("max_retries", 3),
+           api_config.get("backoff_sec", 0.5), api_config.get("hedge_after_sec"))
+    if key not in _clients:
+        _clients[key] = FetchClient(timeout_sec=key[1], max_retries=key[2], backoff_sec=key[3], hedge_after_sec=key[4])
+    return _clients[key]
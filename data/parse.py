@@ -0,0 +1,115 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+SERIES_COLUMNS = ["spx", "spxExpectedMove", "spxOTMBids", "vix"]
+MARKET_TZ = "America/New_York"
+
+_DATETIME_KEY = np.frombuffer(b'"dateTime":', dtype=np.uint8)
+_EPOCH_DIGITS = 10
+
+
+def _select(epoch, interval, since):
+    # minute-of-hour / second on raw epoch seconds — ET is a whole-hour offset from UTC,
+    # so this is the same as the local-time filter, without any datetime work
+    if interval:
+        mask = ((epoch // 60) % 60 % interval == 0) & (epoch % 60 == 0)
+    else:                                            # raw 30-second stream
+        mask = np.ones(epoch.size, dtype=bool)
+    if since is not None:
+        mask &= epoch > int(pd.Timestamp(since).timestamp())
+    keep = np.flatnonzero(mask)
+    return keep[np.argsort(epoch[keep], kind="stable")]
+
+
+def _scan_epochs(buf):
+    """
+    Read every "dateTime":<10-digit epoch> straight out of the raw bytes with
+    NumPy. Returns (epoch, key_positions) or None when the payload does not look
+    like that (the caller then decodes it fully).
+    """
+    arr = np.frombuffer(buf, dtype=np.uint8)
+    k = _DATETIME_KEY.size
+    if arr.size <= k + _EPOCH_DIGITS:
+        return None
+
+    # anchor on the rare "eT" inside "dateTime", then check the whole key around each hit
+    anchor = 4
+    cand = np.flatnonzero((arr[:-1] == _DATETIME_KEY[anchor]) & (arr[1:] == _DATETIME_KEY[anchor + 1])) - anchor
+    cand = cand[(cand >= 0) & (cand + k <= arr.size)]
+    match = np.ones(cand.size, dtype=bool)
+    for j in range(k):
+        match &= arr[cand + j] == _DATETIME_KEY[j]
+    pos = cand[match] + k
+    pos += arr[pos] == ord(" ")                      # tolerate '"dateTime": 123'
+    if not pos.size or pos[-1] + _EPOCH_DIGITS >= arr.size:
+        return None
+
+    # one digit column at a time; uint8 wrap-around makes every non-digit > 9
+    epoch = np.zeros(pos.size, dtype=np.int64)
+    for j in range(_EPOCH_DIGITS):
+        digit = arr[pos + j] - ord("0")
+        if (digit > 9).any():
+            return None
+        epoch = epoch * 10 + digit
+    if ((arr[pos + _EPOCH_DIGITS] - ord("0")) <= 9).any():
+        return None
+    return epoch, pos
+
+
+def _decode_kept(buf, pos, keep):
+    """JSON-decode only the records holding the kept keys; None if they are not flat objects."""
+    try:
+        records = []
+        for p in pos[keep].tolist():
+            start = buf.rindex(b"{", 0, p)
+            records.append(buf[start:buf.index(b"}", p) + 1])
+        rows = _loads(b"[" + b",".join(records) + b"]")
+    except ValueError:            # also orjson.JSONDecodeError / json.JSONDecodeError
+        return None
+    return rows if all(isinstance(row, dict) for row in rows) else None
+
+
+def parse_aggregate(content, interval, since=None, columns=SERIES_COLUMNS, tz=MARKET_TZ) -> pd.DataFrame:
+    """
+    Decode an aggregateData payload (bytes or str) into the interval bars frame
+    (interval=None keeps every 30-second row, e.g. for indicators.resample).
+
+    Fast path: epochs are read straight out of the raw bytes, the interval /
+    `since` selection is done on them, and only the kept records are JSON-
+    decoded into float columns. Anything irregular (dict of columns, other
+    number formats) falls back to a full decode with the same selection.
+    """
+    buf = content.encode() if isinstance(content, str) else bytes(content)
+
+    rows = None
+    scanned = _scan_epochs(buf)
+    if scanned is not None:
+        epoch, pos = scanned
+        keep = _select(epoch, interval, since)
+        rows = _decode_kept(buf, pos, keep)
+
+    if rows is not None:
+        values = {col: np.asarray([row.get(col) for row in rows], dtype="float64") for col in columns}     # missing → NaN
+    else:
+        data = _loads(buf)
+        if isinstance(data, dict):
+            epoch = np.asarray(data["dateTime"], dtype="float64").astype("int64")
+            keep = _select(epoch, interval, since)
+            values = {col: np.asarray(data[col], dtype="float64")[keep] for col in columns}
+        else:
+            epoch = np.asarray([row["dateTime"] for row in data], dtype="float64").astype("int64")
+            keep = _select(epoch, interval, since)
+            values = {col: np.asarray([data[i].get(col) for i in keep], dtype="float64") for col in columns}
+
+    index = pd.DatetimeIndex((epoch[keep] * 1_000_000_000).view("datetime64[ns]"), name="dateTime")
+    index = index.tz_localize("UTC").tz_convert(tz)
+    return pd.DataFrame(np.column_stack([values[col] for col in columns]), index=index, columns=columns)
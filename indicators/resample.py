@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+
+INPUT_COLUMNS = ["spx", "spxExpectedMove", "spxOTMBids", "vix"]
+PRICE_COLUMN = "spx"
+OHLC_COLUMNS = [f"{PRICE_COLUMN}_open", f"{PRICE_COLUMN}_high", f"{PRICE_COLUMN}_low"]
+TIMEFRAMES = (1, 5, 15, 30)
+
+# slope / return lookbacks, in minutes (the ema21_slope_<n>min / ret_<n>min features)
+LOOKBACK_MINUTES = (5, 15, 30)
+
+
+def lookback_rows(window_min, bar_minutes) -> int:
+    """Bars spanning `window_min` minutes on `bar_minutes` bars (at least one bar)."""
+    return max(1, round(window_min / bar_minutes))
+
+
+def infer_bar_minutes(index, default=5) -> float:
+    """Typical spacing of a DatetimeIndex in minutes (median gap, so overnight gaps don't count)."""
+    if len(index) < 2:
+        return default
+    gaps = np.diff(index.as_unit("ns").asi8)
+    return float(np.median(gaps)) / 60e9
+
+
+# ────────────────────────────────────────────────
+# Incremental: one 30-second point at a time, every timeframe at once
+# ────────────────────────────────────────────────
+
+class BarResampler:
+    """
+    Builds bars for several timeframes from the raw 30-second stream in one
+    pass. A bar labelled t covers (t - timeframe, t]: open/high/low/close of
+    `spx` over those points, last value of the other columns, so its close is
+    exactly the snapshot the fetcher used to keep at t. A bar is emitted as
+    soon as the point at its boundary arrives (or, if that point is missing,
+    when the first point of the next bar does).
+    """
+
+    def __init__(self, timeframes=TIMEFRAMES, columns=INPUT_COLUMNS):
+        self.timeframes = sorted(timeframes)
+        self.columns = list(columns)
+        self._steps = {tf: tf * 60 * 1_000_000_000 for tf in self.timeframes}
+        self._open = {}             # tf → (bar end ns, partial bar dict)
+        self.last_timestamp = None
+
+    def update(self, ts, point) -> list:
+        """Push one point (mapping with `columns`); returns [(timeframe, bar_ts, bar)] completed by it."""
+        ts = pd.Timestamp(ts)
+        if self.last_timestamp is not None and ts <= self.last_timestamp:
+            return []
+        self.last_timestamp = ts
+        ts_ns = ts.value
+        price = float(point[PRICE_COLUMN])
+
+        done = []
+        for tf in self.timeframes:
+            step = self._steps[tf]
+            end = -(-ts_ns // step) * step
+            current = self._open.get(tf)
+            if current is not None and current[0] != end:          # boundary point never came
+                done.append(self._close(tf, ts.tz))
+                current = None
+            if current is None:
+                bar = {OHLC_COLUMNS[0]: price, OHLC_COLUMNS[1]: price, OHLC_COLUMNS[2]: price}
+                self._open[tf] = current = (end, bar)
+            bar = current[1]
+            bar[OHLC_COLUMNS[1]] = max(bar[OHLC_COLUMNS[1]], price)
+            bar[OHLC_COLUMNS[2]] = min(bar[OHLC_COLUMNS[2]], price)
+            for col in self.columns:
+                bar[col] = float(point[col])
+            if ts_ns == end:
+                done.append(self._close(tf, ts.tz))
+        return done
+
+    def _close(self, tf, tz):
+        end, bar = self._open.pop(tf)
+        return tf, pd.Timestamp(end, tz="UTC").tz_convert(tz), bar
+
+    def extend(self, df) -> dict:
+        """Push every row of a 30-second frame; returns {timeframe: frame of the bars it completed}."""
+        rows = {tf: ([], []) for tf in self.timeframes}
+        for ts, *values in df[self.columns].itertuples():
+            for tf, bar_ts, bar in self.update(ts, dict(zip(self.columns, values))):
+                rows[tf][0].append(bar_ts)
+                rows[tf][1].append(bar)
+        return {tf: pd.DataFrame(bars, index=pd.DatetimeIndex(index, name=df.index.name),
+                                 columns=self.columns + OHLC_COLUMNS, dtype="float64")
+                for tf, (index, bars) in rows.items()}
+
+
+# ────────────────────────────────────────────────
+# Vectorized: whole frames (backtests, checks)
+# ────────────────────────────────────────────────
+
+def resample_frame(df, minutes, columns=INPUT_COLUMNS) -> pd.DataFrame:
+    """
+    Same bars as BarResampler for one timeframe, for a whole frame at once.
+    The input is either raw 30-second rows or finer bars (then their
+    open/high/low are re-aggregated rather than rebuilt from closes).
+    """
+    out_columns = list(columns) + OHLC_COLUMNS
+    if df.empty:
+        return pd.DataFrame(columns=out_columns, index=df.index[:0], dtype="float64")
+
+    ts = df.index.as_unit("ns").asi8
+    step = minutes * 60 * 1_000_000_000
+    end = -(-ts // step) * step
+    starts = np.flatnonzero(np.r_[True, end[1:] != end[:-1]])
+    last = np.r_[starts[1:], len(ts)] - 1
+
+    price = df[PRICE_COLUMN].to_numpy(dtype="float64")
+    opens, highs, lows = (df[col].to_numpy(dtype="float64") if col in df else price for col in OHLC_COLUMNS)
+    out = {col: df[col].to_numpy(dtype="float64")[last] for col in columns}
+    out[OHLC_COLUMNS[0]] = opens[starts]
+    out[OHLC_COLUMNS[1]] = np.maximum.reduceat(highs, starts)
+    out[OHLC_COLUMNS[2]] = np.minimum.reduceat(lows, starts)
+
+    index = pd.DatetimeIndex(end[starts].view("datetime64[ns]"), name=df.index.name)
+    if df.index.tz is not None:
+        index = index.tz_localize("UTC").tz_convert(df.index.tz)
+    return pd.DataFrame(out, index=index, columns=out_columns)
+
+
+def resample_all(df, timeframes=TIMEFRAMES, columns=INPUT_COLUMNS) -> dict:
+    """{timeframe: bars}; each timeframe is built from the next finer one, not from the raw rows again."""
+    out, source, source_tf = {}, df, None
+    for tf in sorted(timeframes):
+        if source_tf and tf % source_tf == 0:
+            out[tf] = resample_frame(source, tf, columns)
+        else:
+            out[tf] = resample_frame(df, tf, columns)
+        source, source_tf = out[tf], tf
+    return out
@@ -0,0 +1,192 @@
+from collections import deque
+import math
+
+import pandas as pd
+
+from indicators.resample import INPUT_COLUMNS, LOOKBACK_MINUTES, infer_bar_minutes, lookback_rows
+
+
+class _Ema:
+    """
+    pandas ewm(adjust=False) recurrence, seeded with the first value seen.
+    A NaN input is skipped like ewm does: the average carries forward, and the
+    next value is weighted as if the missing bars had decayed the old one.
+    """
+
+    decay = None            # (1 - alpha) ** bars since the last value, while there is a gap
+
+    def __init__(self, span=None, alpha=None, min_periods=0):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1)
+        self.min_periods = min_periods
+        self.value = None
+        self.count = 0
+
+    def update(self, x):
+        if math.isnan(x):
+            if self.value is not None:
+                self.decay = (self.decay or 1.0) * (1 - self.alpha)
+            return self.current()
+        if self.value is None:
+            self.value = x
+        elif self.decay is None:
+            self.value += self.alpha * (x - self.value)
+        else:
+            old_weight = self.decay * (1 - self.alpha)
+            self.value = (old_weight * self.value + self.alpha * x) / (old_weight + self.alpha)
+            self.decay = None
+        self.count += 1
+        return self.current()
+
+    def current(self):
+        if self.value is None or self.count < self.min_periods:
+            return math.nan
+        return self.value
+
+
+class StreamingIndicators:
+    """
+    Stateful, O(1)-per-bar version of add_indicators().
+
+    Seed it once with from_history(), then call update() for every new bar.
+    The values match the `ta`/pandas path (same recurrences, same warm-up
+    periods), so per-tick cost no longer grows with history_size.
+    """
+
+    def __init__(self, rsi_period=14, bb_window=20, bb_dev=2, bar_minutes=5):
+        self.rsi_period = rsi_period
+        self.bb_window = bb_window
+        self.bb_dev = bb_dev
+        self.bar_minutes = bar_minutes
+
+        # RSI (Wilder smoothing, alpha = 1/period)
+        self._prev_spx = None
+        self._rsi_up = _Ema(alpha=1 / rsi_period, min_periods=rsi_period)
+        self._rsi_dn = _Ema(alpha=1 / rsi_period, min_periods=rsi_period)
+
+        # MACD 12/26/9
+        self._macd_fast = _Ema(span=12, min_periods=12)
+        self._macd_slow = _Ema(span=26, min_periods=26)
+        self._macd_signal = _Ema(span=9, min_periods=9)
+
+        # Bollinger Bands (rolling window, population std)
+        self._bb_window = deque(maxlen=bb_window)
+
+        # EMAs
+        self._ema9 = _Ema(span=9)
+        self._ema21 = _Ema(span=21)
+        self._ema50 = _Ema(span=50)
+
+        # Lookbacks for slopes / returns, in minutes → rows (30 min = 6 rows on 5-min bars)
+        self._lookbacks = {window: lookback_rows(window, bar_minutes) for window in LOOKBACK_MINUTES}
+        depth = max(self._lookbacks.values()) + 1
+        self._spx_lags = deque(maxlen=depth)
+        self._ema21_lags = deque(maxlen=depth)
+
+        self.last_timestamp = None
+        self.last_row = None
+
+    @classmethod
+    def from_history(cls, df, rsi_period=14, bar_minutes=None):
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise ValueError("DataFrame must have DatetimeIndex")
+
+        if bar_minutes is None:
+            bar_minutes = infer_bar_minutes(df.index)
+        engine = cls(rsi_period=rsi_period, bar_minutes=bar_minutes)
+        for ts, *values in df[INPUT_COLUMNS].itertuples():
+            engine.update(ts, dict(zip(INPUT_COLUMNS, values)))
+        return engine
+
+    def update(self, ts, bar):
+        """Push one bar (mapping with INPUT_COLUMNS) and return the full indicator row."""
+        spx = float(bar["spx"])
+        expected_move = float(bar["spxExpectedMove"])
+        otm_bids = float(bar["spxOTMBids"])
+
+        # ─── RSI ───
+        # a missing print (or the first bar after one) counts as no change, like `ta`'s diff().where()
+        if self._prev_spx is None or math.isnan(spx) or math.isnan(self._prev_spx):
+            up = dn = 0.0
+        else:
+            change = spx - self._prev_spx
+            up = change if change > 0 else 0.0
+            dn = -change if change < 0 else 0.0
+        self._prev_spx = spx
+        emaup = self._rsi_up.update(up)
+        emadn = self._rsi_dn.update(dn)
+        if emadn == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - (100 / (1 + emaup / emadn))
+
+        # ─── MACD ───
+        fast = self._macd_fast.update(spx)
+        slow = self._macd_slow.update(spx)
+        macd = fast - slow
+        macd_signal = self._macd_signal.update(macd)          # NaN during the slow EMA's warm-up
+        macd_hist = macd - macd_signal
+
+        # ─── Bollinger Bands ───
+        self._bb_window.append(spx)
+        if len(self._bb_window) < self.bb_window:
+            bb_middle = bb_upper = bb_lower = math.nan
+        else:
+            bb_middle = sum(self._bb_window) / self.bb_window
+            std = math.sqrt(sum((x - bb_middle) ** 2 for x in self._bb_window) / self.bb_window)
+            bb_upper = bb_middle + self.bb_dev * std
+            bb_lower = bb_middle - self.bb_dev * std
+
+        # ─── EMAs + lookback features ───
+        ema9 = self._ema9.update(spx)
+        ema21 = self._ema21.update(spx)
+        ema50 = self._ema50.update(spx)
+
+        self._spx_lags.append(spx)
+        self._ema21_lags.append(ema21)
+
+        row = {
+            **{col: float(bar[col]) for col in INPUT_COLUMNS},
+            "rsi": rsi,
+            "macd": macd,
+            "macd_signal": macd_signal,
+            "macd_hist": macd_hist,
+            "bb_upper": bb_upper,
+            "bb_middle": bb_middle,
+            "bb_lower": bb_lower,
+            "premium_ratio": otm_bids / expected_move if expected_move != 0 else math.nan,
+            "time_to_close": (16 * 60) - (ts.hour * 60 + ts.minute),
+            "ema9": ema9,
+            "ema21": ema21,
+            "ema50": ema50,
+        }
+        for window, rows in self._lookbacks.items():
+            row[f"ema21_slope_{window}min"] = self._lag_diff(self._ema21_lags, rows) / (rows * self.bar_minutes)
+        for window, rows in self._lookbacks.items():
+            row[f"ret_{window}min"] = self._lag_return(rows)
+
+        self.last_timestamp = ts
+        self.last_row = row
+        return row
+
+    def is_valid(self) -> bool:
+        """False if a running average has gone NaN (state saved before NaN prints were skipped)."""
+        return not any(isinstance(ema, _Ema) and ema.value is not None and math.isnan(ema.value)
+                       for ema in vars(self).values())
+
+    def latest(self):
+        """Last indicator row as a Series named by its timestamp (same shape as history.iloc[-1])."""
+        return pd.Series(self.last_row, name=self.last_timestamp)
+
+    @staticmethod
+    def _lag_diff(lags, periods):
+        if len(lags) <= periods:
+            return math.nan
+        return lags[-1] - lags[-1 - periods]
+
+    def _lag_return(self, periods):
+        if len(self._spx_lags) <= periods:
+            return math.nan
+        base = self._spx_lags[-1 - periods]
+        if base == 0:
+            return math.nan
+        return (self._spx_lags[-1] / base - 1) * 100
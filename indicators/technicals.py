@@ -4,15 +4,17 @@ from ta.trend import MACD
 import pandas as pd
 import numpy as np
 
+from indicators.resample import LOOKBACK_MINUTES, infer_bar_minutes, lookback_rows
 
-def add_indicators(df, rsi_period=14):
+
+def add_indicators(df, rsi_period=14, bar_minutes=None):
     """
     Adds standard technical indicators + context / regime features
     to help detect trend strength, exhaustion, crash/rally/chop regimes, etc.
     
     Assumes:
     - df has DatetimeIndex
-    - 30-second SPX bars
+    - regular bars of `bar_minutes` minutes (inferred from the index if None)
     - columns: 'spx', 'spxExpectedMove', 'spxOTMBids', ...
     """
     if not isinstance(df.index, pd.DatetimeIndex):
@@ -52,15 +54,20 @@ def add_indicators(df, rsi_period=14):
     df['ema50']  = df['spx'].ewm(span=50, adjust=False).mean()
     
 
-    # EMA slope / momentum (positive = rising, negative = falling)
-    # scaled roughly to per-minute change
-    df['ema21_slope_5min']  = df['ema21'].diff(1) / 5     # 5 min = 1 row
-    df['ema21_slope_15min'] = df['ema21'].diff(3) / 15    # 15 min = 3 rows
-    df['ema21_slope_30min'] = df['ema21'].diff(6) / 30    # 30 min = 6 rows
+    # Lookbacks are in minutes; on 5-min bars 5/15/30 min = 1/3/6 rows.
+    # A window shorter than a bar uses one bar, and slopes are divided by the
+    # minutes actually spanned, so they stay per-minute on any bar size.
+    if bar_minutes is None:
+        bar_minutes = infer_bar_minutes(df.index)
+
+    lookbacks = {window: lookback_rows(window, bar_minutes) for window in LOOKBACK_MINUTES}
+
+    # EMA slope / momentum (positive = rising, negative = falling), per-minute change
+    for window, rows in lookbacks.items():
+        df[f'ema21_slope_{window}min'] = df['ema21'].diff(rows) / (rows * bar_minutes)
 
     # Recent returns (very interpretable for "keeps falling / rising")
-    df['ret_5min']   = df['spx'].pct_change(1) * 100            # 5 min = 1 row
-    df['ret_15min']  = df['spx'].pct_change(3) * 100      # 15 min = 3 rows
-    df['ret_30min']  = df['spx'].pct_change(6) * 100      # 30 min = 6 rows
+    for window, rows in lookbacks.items():
+        df[f'ret_{window}min'] = df['spx'].pct_change(rows) * 100
 
     return df
\ No newline at end of file
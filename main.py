@@ -1,30 +1,19 @@
-import time
+import asyncio
 import yaml
 import pandas as pd
 
-from data.fetcher import fetch_market_data
-from indicators.technicals import add_indicators
-from alerts.console_alert import send_alert, load_last_alert_state , log_decision , save_last_alert_state,del_last_alert_state, alert
+from data.fetcher import fetch_market_data, MarketDataFetcher
+from data.history import BarHistory
+from indicators.streaming import StreamingIndicators, INPUT_COLUMNS
 from agent.agent import evaluate_with_agent
-from dotenv import load_dotenv
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
-import numpy as np
-
-
-# ✅ Load environment variables from .env file
-load_dotenv()
-ALERT_COOLDOWN_MINUTES = 30          # minimum time between alerts
-PRICE_TOLERANCE_POINTS = 18          # skip if SPX moved less than this from last alert
-MARKET_TZ = ZoneInfo("America/New_York")
-MARKET_OPEN = (9, 30)     # 10:00 AM ET
-MARKET_CLOSE = (16, 00)  # 2:30 PM ET
-
-
-def is_market_window(now_et: datetime) -> bool:
-    start = now_et.replace(hour=MARKET_OPEN[0], minute=MARKET_OPEN[1], second=0, microsecond=0)
-    end = now_et.replace(hour=MARKET_CLOSE[0], minute=MARKET_CLOSE[1], second=0, microsecond=0)
-    return start <= now_et <= end
+from strategy.drift import DriftDetector
+from strategy.features import FeatureStore
+from strategy.gate import load_thresholds
+from monitor.metrics import configure_metrics
+from monitor.scheduler import BarScheduler, VirtualClock
+from monitor.backends import configure_backends
+from monitor.checkpoint import Checkpoint
+from monitor.loop import LoopState, run_tick
 
 
 def load_config():
@@ -32,199 +21,107 @@ def load_config():
         return yaml.safe_load(f)
 
 
-def should_consider_trade(features: dict) -> bool:
-    """
-    Basic gate / pre-filter: should we even look at PCS or CCS setups right now?
-    Returns True only if general conditions are acceptable to consider a credit spread.
-    """
-    message = ""
-
-    # ─── Required minimum conditions ────────────────────────────────────────
-    
-    # 1. VIX not too low → premiums need to be decent
-    if features["vix"] < 14.0:
-        message = f"VIX too low ({features['vix']}) — premiums likely too thin for good credit spreads."
-    
-    # 2. Not ridiculously high VIX (extreme fear / gap risk)
-    elif features["vix"] > 38.0:
-        message = f"VIX too high ({features['vix']}) — extreme fear, gap risk, and likely not ideal for new credit spreads."
-    
-    # 3. Time window — best theta decay & lower gamma risk
-    else:
-        minutes_left = features["time_to_close_min"]
-        if minutes_left > 360:   # before ~9:45–10:00 ET
-            message = f"Too early in the day ({features['current_time']}) — market just opened, not ideal for new credit spreads."
-        elif minutes_left < 60:    # last hour — gamma explosion risk, especially 0DTE
-            message = f"Too late in the day ({features['current_time']}) — last hour, gamma risk increases significantly for 0DTE credit spreads."
-        
-        # 4. Trend filter — avoid fighting very strong short-term momentum
-        #    We want mild trend or range → good for credit spreads
-        else:
-            slope_5  = features["ema21_slope_5min"]
-            slope_15 = features["ema21_slope_15min"]
-            ret5     = features["ret_5min_pct"]
-            ret15    = features["ret_15min_pct"]
-
-            # Very strong momentum in last 5–15 min → usually bad for new credit spreads
-            if abs(ret5) > 0.80 or abs(ret15) > 1.40:
-                message = f"Strong momentum detected (5min: {ret5}%, 15min: {ret15}%) — usually not ideal for new credit spreads."
-            # Very steep short-term slope → momentum is probably not exhausted yet
-            elif abs(slope_5) > 3.0:   # adjust threshold after backtesting (~3–4 pts/min is fast)
-                message = f"Steep short-term slope detected (5min EMA21 slope: {slope_5} pts/min) — momentum may not be exhausted, not ideal for new credit spreads."
-            
-            # ─── Optional / tunable filters (comment out if too restrictive) ─────────
-            elif features["premium_ratio"] <= 3.0:
-                message = f"Premium ratio too low ({features['premium_ratio']}) — may indicate directional bias, not ideal for balanced credit spreads."
-            elif features["rsi"] < 18 or features["rsi"] > 82:
-                message = f"RSI in extreme territory ({features['rsi']}) — may indicate overbought/oversold conditions, often better to wait for mean reversion before opening new credit spreads."
-            elif features["rsi"] > 40 and features["rsi"] < 60:
-                message = f"RSI is neutral ({features['rsi']}) — may indicate lack of momentum, not ideal for new credit spreads which often benefit from some directional bias."
-
-    # ─── If we passed everything → okay to evaluate PCS / CCS logic next ─────
-    if not message:
-        return True
-
-    alert(features["current_time"] + "--" + message,silent=True)
-    print(message)
-    return False
-
 def main():
 
     ##"2026-02-12" -- big down day
     date_in = None #"2026-02-26" #"2026-02-23" #"2026-02-23" #"2026-01-29" #"2026-01-30" # live
     time_in = None #"12:00:00" #"09:30:00" #"09:30:00" #"10:30:00" #"10:30:00"
     config = load_config()
+    thresholds = load_thresholds(config)
+    # agent + alert backends are imported here, and only the selected ones (rules/console need neither LLM nor Telegram)
+    agent_backend, alerts_backend = configure_backends(config)
+    print(f"🔌 Agent: {agent_backend} | alerts: {alerts_backend}")
 
-    state = load_last_alert_state()
-    last_alert_time = state["last_alert_time"]
-    last_alert_price = state["last_alert_price"]
-
-    print(f"Loaded last alert: time={last_alert_time}, price={last_alert_price}")
-    
     # get data for last working day from date_in as string
     if not date_in or date_in.strip() == "":
         last_working_day = pd.Timestamp.now(tz="America/New_York") - pd.offsets.BDay(3)
-        current_day_end = pd.Timestamp.now(tz="America/New_York").replace(hour=16, minute=0, second=0, microsecond=0)
         run_type = "live"
     else:
         last_working_day = pd.to_datetime(date_in) - pd.offsets.BDay(1)
-        current_day_end = pd.to_datetime(date_in).replace(hour=16, minute=0, second=0, microsecond=0)
         run_type = "backtest"
-    
-    last_working_day = last_working_day.strftime("%Y-%m-%d")
-    history = fetch_market_data(config["api"],config[run_type]['interval_min'],date_in=last_working_day)
 
+    # several strategy variants → one shared fetch/indicator pipeline fanned out to each (monitor/multi.py);
+    # each strategy keeps its own alert state there
+    if len(config.get("strategies") or []) > 1 and not (run_type == "backtest" and config["backtest"].get("engine") == "vectorized"):
+        from monitor.multi import run_monitor
+        configure_metrics(config)
+        asyncio.run(run_monitor(config, date_in=date_in, time_in=time_in))
+        return
+
+    # live runs keep history, indicator and alert state in one checkpoint (monitor/checkpoint.py);
+    # backtests always start from scratch and never touch it
+    checkpoint_path = config["live"].get("checkpoint_path") if run_type == "live" else None
+    checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+    state = checkpoint.load_alert() if checkpoint else {"last_alert_time": None, "last_alert_price": None}
+    last_alert_time = state["last_alert_time"]
+    last_alert_price = state["last_alert_price"]
+
+    print(f"Loaded last alert: time={last_alert_time}, price={last_alert_price}")
+
+    # skips agent calls for bars that barely moved since the last answer, or sit at the last alert's price
+    drift = DriftDetector.from_config(config)
+    drift.record_alert(last_alert_time, last_alert_price)
+
+    # whole-session replay: one indicator pass, vectorized gate, no per-bar sleep
+    if run_type == "backtest" and config["backtest"].get("engine") == "vectorized":
+        from backtest.engine import run_session
+        results = run_session(config, date_in, evaluate=evaluate_with_agent, start_time=time_in,
+                              last_alert_time=last_alert_time, log=True)
+        print(f"📊 {date_in}: {int(results['gate_pass'].sum())}/{len(results)} bars passed the gate, "
+              f"{int(results['evaluated'].sum())} agent calls, {int(results['alerted'].sum())} alerts "
+              f"({results.attrs['wall_time_sec']:.2f}s)")
+        return
+
+    last_working_day = last_working_day.strftime("%Y-%m-%d")
+    session_settings = {"interval_min": config[run_type]['interval_min'], "history_size": config[run_type]["history_size"],
+                        "rsi_period": config["indicators"]["rsi_period"]}
+    restored = checkpoint.load_session(session_settings) if checkpoint else None
+    if restored and restored[0].last_timestamp >= pd.Timestamp(last_working_day, tz="America/New_York"):
+        # warm restart: no warm-up download; the first tick fetches whatever today is missing
+        history, indicators = restored
+        resumed_from = history.last_timestamp
+        if resumed_from.date() < pd.Timestamp.now(tz="America/New_York").date():
+            # the rest of an earlier session that closed while we were down
+            missed = history.extend(fetch_market_data(config["api"], config[run_type]['interval_min'],
+                                                      date_in=resumed_from.strftime("%Y-%m-%d"), since=resumed_from))
+            for ts, *values in missed[INPUT_COLUMNS].itertuples():
+                indicators.update(ts, dict(zip(INPUT_COLUMNS, values)))
+        print(f"♻️ Resumed from checkpoint at {resumed_from}: {len(history)} bars up to {history.last_timestamp}")
+    else:
+        history = BarHistory(config[run_type]["history_size"])
+        history.extend(fetch_market_data(config["api"],config[run_type]['interval_min'],date_in=last_working_day))
+        indicators = StreamingIndicators.from_history(history.to_frame(), config["indicators"]["rsi_period"],
+                                                      bar_minutes=config[run_type]['interval_min'])
+    fetcher = MarketDataFetcher(config["api"], config[run_type]['interval_min'], last_seen=history.last_timestamp)
+
+    # wake a few seconds after every bar close in market hours (a live start evaluates the last closed bar at once);
+    # backtests run the same schedule on a virtual clock
+    offset_sec = config[run_type].get("bar_offset_sec", 5)
+    clock = None
+    if run_type == "backtest":
+        clock = VirtualClock(pd.Timestamp(f"{date_in} {time_in or '09:30:00'}") - pd.Timedelta(seconds=offset_sec))
+    scheduler = BarScheduler(config[run_type]['interval_min'], offset_sec=offset_sec, clock=clock,
+                             holidays=config.get("holidays"), start_now=run_type == "live")
+
+    # the session's features, one preallocated column per bar (reused from day to day)
+    feature_store = FeatureStore(capacity=390 // config[run_type]['interval_min'] + 1)
+    state = LoopState(history, indicators, fetcher, feature_store, thresholds, drift,
+                      last_alert_time, last_alert_price, checkpoint=checkpoint, settings=session_settings)
+
+    configure_metrics(config)
     print("📡 SPX 0-DTE Monitor Started...\n")
 
-    
     while True:
-        try:
-            df = fetch_market_data(config["api"],config[run_type]['interval_min'],date_in=date_in, time_in=time_in)
-
-            history = pd.concat([history, df])
-            history = history.tail(config[run_type]["history_size"])
-
-            history = add_indicators(history, config["indicators"]["rsi_period"])
-
-            latest = history.iloc[-1]
-
-            # check if current_time is equal to the time_in or todays date if time_in is None
-            
-
-
-            features = {
-                        # ─── Core level & fear ───
-                        "current_price": round(latest["spx"], 2),
-                        "expected_move": round(latest["spxExpectedMove"], 2),
-                        "vix": round(latest["vix"], 2),
-                        
-                        # ─── Momentum classics ───
-                        "rsi": round(latest["rsi"], 1),
-                        "macd": round(latest["macd"], 4),
-                        "macd_hist": round(latest["macd_hist"], 4),
-                        "macd_signal": round(latest["macd_signal"], 4),
-
-                        # Add missing BB fields (adjust calculation if not directly in 'latest')
-                        "bb_upper": round(latest.get("bb_upper", np.nan), 2),  # e.g., if it's price relative to upper band
-                        "bb_lower": round(latest.get("bb_lower", np.nan), 2),  # e.g., if it's price relative to lower band
-                        "bb_middle": round(latest.get("bb_middle", np.nan), 2), # e.g., if it's price relative to middle band
-
-                        # ─── 0DTE + time sensitive ───
-                        "premium_ratio": round(latest["premium_ratio"], 2),
-                        "time_to_close_min": int(latest["time_to_close"]),
-                        "current_time": latest.name.strftime('%Y-%m-%d %H:%M:%S'),
-                        
-
-                        # ─── Position vs structure (most important upgrades) ───
-                        "ema9": round(latest.get("ema9", np.nan), 4),
-                        "ema21": round(latest.get("ema21", np.nan), 4),
-                        "ema50": round(latest.get("ema50", np.nan), 4),
-                        
-
-                        "ema21_slope_5min": round(latest["ema21_slope_5min"], 6),
-                        "ema21_slope_15min": round(latest["ema21_slope_15min"], 6),
-                        "ema21_slope_30min": round(latest["ema21_slope_30min"], 6),
-
-                        
-                        "ret_5min_pct":   round(latest.get("ret_5min", 0) , 2),
-                        "ret_15min_pct":  round(latest.get("ret_15min", 0) , 2),
-                        "ret_30min_pct":  round(latest.get("ret_30min", 0) , 2),
-
-                        # Optional safety net: full row if you want to allow pattern spotting
-                        #"raw_row": latest.to_dict()   # ← only if token budget allows
-                    }
-            
-
-            # if time_in is is not none then increment time_in by config["runtime"]['interval_min']
-            if time_in:
-                t = pd.to_datetime(time_in) + pd.Timedelta(minutes=config[run_type]['interval_min'])
-                time_in = t.strftime("%H:%M:%S")
-
-
-            now = latest.name
-            if last_alert_time:
-                minutes_since = (now - last_alert_time).total_seconds() / 60
-                if minutes_since < ALERT_COOLDOWN_MINUTES:
-                    print(f"⏳ Cooldown active — {minutes_since:.1f} min since last alert (need ≥ {ALERT_COOLDOWN_MINUTES})")
-                    time.sleep(config[run_type]["fetch_interval_sec"])
-                    continue
-                else:
-                    print(f"✅ Cooldown passed — {minutes_since:.1f} min since last alert")
-                    last_alert_time = None  # reset to allow new alerts
-                    last_alert_price = None
-                    del_last_alert_state()
-
-            print(latest.name.strftime(("%Y-%m-%d %H:%M:%S")) )
-            if should_consider_trade(features):   
-                #print(latest)  
-                decision = evaluate_with_agent(features)
-                log_decision(decision.model_dump(), features)
-
-                if decision.trade and decision.confidence >= 0.7:
-                    send_alert(decision.model_dump(), latest)
-                    
-                    # Update persistent state
-                    last_alert_time = now
-                    last_alert_price = round(latest["spx"], 2)
-                    save_last_alert_state(last_alert_time, last_alert_price)
-
-                else:
-                    print("🤖 Agent says: no clean setup.")     
-
-
-        except Exception as e:
-            print("❌ Error:", e)
-
-        print("slleping for", config[run_type]["fetch_interval_sec"], "seconds...\n")
-        time.sleep(config[run_type]["fetch_interval_sec"])
-        print("-" * 50)
-
-        # exit the loop if we latest.name.strftime('%Y-%m-%d %H:%M:%S') is equal to  current_day_end
-        # if latest.name >= current_day_end.tz_localize(latest.name.tzinfo):
-        #     print(f"Reached end of day ({current_day_end}), exiting.")
-        #     break
-
-        
+        bar_time = scheduler.wait()
+        if run_type == "backtest":
+            if bar_time.strftime("%Y-%m-%d") != date_in:
+                print(f"Reached end of day ({date_in}), exiting.")
+                break
+            time_in = bar_time.strftime("%H:%M:%S")
+
+        # fetch → indicators → features → cooldown → gate → drift → agent → journal → alert → checkpoint
+        run_tick(state, bar_time, scheduler, date_in=date_in, time_in=time_in)
+
 
 if __name__ == "__main__":
     main()
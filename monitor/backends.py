@@ -0,0 +1,118 @@
+"""
+Named agent and alert backends. Each is imported only when it is selected
+(or first needed), so a run pays for langchain + the Anthropic client or
+python-telegram-bot only if it actually uses them.
+
+    agent:   anthropic — Claude through the prompt | llm | parser chain (default)
+             stub      — agent.stub.StubChatModel, same chain, no network
+             rules     — agent.rules.RulesDecider, gate + config thresholds only; no LLM stack
+    alerts:  telegram  — background dispatcher → Telegram (default)
+             console   — printed only, nothing is sent; no Telegram stack
+
+Pick them under `backends:` in config/strategy.yaml.
+"""
+import functools
+import os
+
+
+DEFAULT_AGENT = "anthropic"
+DEFAULT_ALERTS = "telegram"
+
+AGENT_BACKENDS = {}          # name → factory(config) that installs the backend in agent.agent
+ALERT_BACKENDS = {}          # name → factory(config) returning a dispatcher transport
+
+
+def _register(registry, name):
+    def register(factory):
+        registry[name] = factory
+        return factory
+    return register
+
+
+def _lookup(registry, kind, name):
+    try:
+        return registry[name]
+    except KeyError:
+        raise ValueError(f"unknown {kind} backend {name!r} (expected one of {sorted(registry)})") from None
+
+
+@functools.cache
+def load_env():
+    """Read .env into the environment, once per process (only backends that need credentials call it)."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+# ────────────────────────────────────────────────
+# Agent backends
+# ────────────────────────────────────────────────
+
+def anthropic_llm(model):
+    load_env()
+    from langchain_anthropic import ChatAnthropic
+    return ChatAnthropic(model=model)
+
+
+@_register(AGENT_BACKENDS, "anthropic")
+def _anthropic(config):
+    from agent.agent import use_llm
+    use_llm(None)          # ChatAnthropic (and langchain) are loaded by the first evaluation that needs them
+
+
+@_register(AGENT_BACKENDS, "stub")
+def _stub(config):
+    from agent.agent import use_llm
+    from agent.stub import StubChatModel
+    use_llm(StubChatModel())
+
+
+@_register(AGENT_BACKENDS, "rules")
+def _rules(config):
+    from agent.agent import use_rules
+    from agent.rules import RulesDecider
+    use_rules(RulesDecider(config))
+
+
+def configured_agent(config) -> str:
+    """The agent backend named under `backends:` (DEFAULT_AGENT if none)."""
+    return ((config or {}).get("backends") or {}).get("agent") or DEFAULT_AGENT
+
+
+def use_agent(name=DEFAULT_AGENT, config=None):
+    _lookup(AGENT_BACKENDS, "agent", name)(config or {})
+
+
+# ────────────────────────────────────────────────
+# Alert backends
+# ────────────────────────────────────────────────
+
+@_register(ALERT_BACKENDS, "telegram")
+def _telegram(config):
+    load_env()
+    from alerts.dispatcher import TelegramTransport
+    return TelegramTransport(os.getenv("TELEGRAM_LOG_TOKEN"), os.getenv("TELEGRAM_ALERT_TOKEN"),
+                             os.getenv("TELEGRAM_CHAT_ID"))
+
+
+@_register(ALERT_BACKENDS, "console")
+def _console(config):
+    from alerts.dispatcher import NullTransport
+    return NullTransport()
+
+
+def alert_transport(name=DEFAULT_ALERTS, config=None):
+    return _lookup(ALERT_BACKENDS, "alerts", name)(config or {})
+
+
+def use_alerts(name=DEFAULT_ALERTS, config=None):
+    from alerts.console_alert import use_transport
+    use_transport(alert_transport(name, config))
+
+
+def configure_backends(config) -> tuple:
+    """Install the agent and alert backends named under `backends:` in strategy.yaml; returns their names."""
+    agent_name = configured_agent(config)
+    alerts_name = (config.get("backends") or {}).get("alerts") or DEFAULT_ALERTS
+    use_agent(agent_name, config)
+    use_alerts(alerts_name, config)
+    return agent_name, alerts_name
@@ -0,0 +1,170 @@
+"""
+Warm-restart checkpoint for the live monitor: one SQLite file (WAL mode)
+holding the bar history ring buffer, the streaming indicator state and the
+alert/cooldown state (one record per strategy when several run). main()
+rewrites it after every tick in a single transaction, so a crash or
+redeploy mid-session resumes from the last completed tick — only the bars
+missed while down are fetched — and a torn write can never lose the alert
+state.
+
+    python -m monitor.checkpoint show       # what a restart would resume from
+    python -m monitor.checkpoint clear      # force a cold start
+"""
+import argparse
+import json
+import os
+import pickle
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from indicators.streaming import StreamingIndicators
+
+
+CHECKPOINT_PATH = Path("monitor_state.sqlite")
+LEGACY_STATE_FILE = Path("last_alert_state.json")      # alert state before the checkpoint existed
+TZ = "America/New_York"
+
+
+class Checkpoint:
+    """
+    Named state blobs in one table. History and indicators are pickled as-is
+    (both are plain numpy/deque state), the alert state is JSON. `settings`
+    records what the state was built with; a checkpoint taken with a
+    different interval, RSI period or history size is ignored, and indicator
+    state with NaN averages is recomputed from the history on restore.
+    """
+
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = Path(path)
+        self._conn = None
+        self._pid = None
+
+    def _db(self):
+        # one connection per process — never share a sqlite handle across a fork
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value BLOB NOT NULL, saved REAL NOT NULL)")
+            self._pid = os.getpid()
+        return self._conn
+
+    def _get(self, name):
+        row = self._db().execute("SELECT value FROM state WHERE name = ?", (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def _put(self, values: dict):
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany("INSERT OR REPLACE INTO state (name, value, saved) VALUES (?, ?, ?)",
+                           [(name, value, now) for name, value in values.items()])
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    # ─── alert / cooldown state ───
+
+    def load_alert(self, name="alert") -> dict:
+        """
+        {"last_alert_time", "last_alert_price"} saved under `name` (one per
+        strategy when several run, see monitor/multi.py); the default one
+        imports (and removes) a leftover last_alert_state.json once.
+        """
+        raw = self._get(name)
+        if raw is None and name == "alert" and LEGACY_STATE_FILE.exists():
+            try:
+                legacy = json.loads(LEGACY_STATE_FILE.read_text())
+                self.save_alert(legacy.get("last_alert_time") and datetime.fromisoformat(legacy["last_alert_time"]),
+                                legacy.get("last_alert_price"))
+                LEGACY_STATE_FILE.unlink()
+                print(f"📦 Moved {LEGACY_STATE_FILE} into {self.path}")
+                raw = self._get("alert")
+            except Exception as e:
+                print(f"⚠️ Could not import {LEGACY_STATE_FILE}: {e}")
+        if raw is None:
+            return {"last_alert_time": None, "last_alert_price": None}
+        data = json.loads(raw)
+        last_time = pd.Timestamp(data["last_alert_time"]) if data.get("last_alert_time") else None
+        if last_time is not None and last_time.tzinfo is not None:
+            last_time = last_time.tz_convert(TZ)
+        return {
+            "last_alert_time": last_time,
+            "last_alert_price": data.get("last_alert_price"),
+        }
+
+    def save_alert(self, last_time, last_price, name="alert"):
+        self._put({name: _alert_json(last_time, last_price)})
+
+    # ─── bar history + indicator state ───
+
+    def load_session(self, settings: dict):
+        """(BarHistory, StreamingIndicators) from the last checkpoint, or None if there is none or it does not match."""
+        raw = self._get("settings")
+        if raw is None:
+            return None
+        saved = json.loads(raw)
+        if saved != settings:
+            print(f"⚠️ Checkpoint was taken with {saved}, running with {settings} — cold start")
+            return None
+        try:
+            history, indicators = pickle.loads(self._get("history")), pickle.loads(self._get("indicators"))
+        except Exception as e:
+            print(f"⚠️ Could not restore checkpoint: {e} — cold start")
+            return None
+        if not indicators.is_valid():
+            # the history is fine; rebuild the indicators from it rather than carry NaN state forward
+            print("⚠️ Checkpointed indicator state has NaN averages — recomputing it from the saved history")
+            indicators = StreamingIndicators.from_history(history.to_frame(), settings["rsi_period"],
+                                                          bar_minutes=settings["interval_min"])
+        return history, indicators
+
+    def save(self, settings: dict, history, indicators, last_alert_time, last_alert_price):
+        """Everything a restart needs, in one transaction."""
+        self._put({
+            "settings": json.dumps(settings, sort_keys=True),
+            "history": pickle.dumps(history, protocol=pickle.HIGHEST_PROTOCOL),
+            "indicators": pickle.dumps(indicators, protocol=pickle.HIGHEST_PROTOCOL),
+            "alert": _alert_json(last_alert_time, last_alert_price),
+        })
+
+    def clear(self):
+        self._db().execute("DELETE FROM state")
+
+    def describe(self) -> dict:
+        rows = self._db().execute("SELECT name, length(value), saved FROM state ORDER BY name").fetchall()
+        info = {name: {"bytes": size, "saved": datetime.fromtimestamp(saved).isoformat(timespec="seconds")}
+                for name, size, saved in rows}
+        if "settings" in info:
+            restored = self.load_session(json.loads(self._get("settings")))
+            if restored is not None:
+                history, _ = restored
+                info["history"].update(bars=len(history), last_bar=str(history.last_timestamp))
+        for name in info:
+            if name == "alert" or name.startswith("alert:"):
+                info[name].update(json.loads(self._get(name)))
+        return info
+
+
+def _alert_json(last_time, last_price) -> str:
+    return json.dumps({
+        "last_alert_time": last_time.isoformat() if last_time else None,
+        "last_alert_price": last_price,
+    })
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Inspect or reset the live monitor's warm-restart checkpoint")
+    cli.add_argument("command", choices=["show", "clear"])
+    cli.add_argument("--path", default=str(CHECKPOINT_PATH))
+    args = cli.parse_args()
+
+    checkpoint = Checkpoint(args.path)
+    if args.command == "clear":
+        checkpoint.clear()
+    print(json.dumps(checkpoint.describe(), indent=2))
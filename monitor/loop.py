@@ -0,0 +1,160 @@
+"""
+One tick of the single-strategy monitor: fetch new bars → ring buffer →
+streaming indicators → features → cooldown → gate → drift → agent →
+journal → alert → checkpoint. main() runs it on every bar close;
+bench/suite.py and bench/soak.py run the same function, so they time and
+soak the loop that ships.
+"""
+
+import agent.agent as agent
+from alerts.console_alert import log_decision, send_alert
+from alerts.journal import get_journal
+from indicators.streaming import INPUT_COLUMNS
+from monitor.metrics import get_metrics
+from strategy.gate import ALERT_COOLDOWN_MINUTES, is_actionable, should_consider_trade
+
+
+class LoopState:
+    """
+    Everything the loop carries from one tick to the next. `checkpoint` and
+    `settings` are set on live runs only: the state is then saved after every
+    tick (see monitor/checkpoint.py).
+    """
+
+    def __init__(self, history, indicators, fetcher, feature_store, thresholds, drift,
+                 last_alert_time=None, last_alert_price=None, checkpoint=None, settings=None,
+                 cooldown_minutes=ALERT_COOLDOWN_MINUTES):
+        self.history = history
+        self.indicators = indicators
+        self.fetcher = fetcher
+        self.feature_store = feature_store
+        self.thresholds = thresholds
+        self.drift = drift
+        self.last_alert_time = last_alert_time
+        self.last_alert_price = last_alert_price
+        self.checkpoint = checkpoint
+        self.settings = settings
+        self.cooldown_minutes = cooldown_minutes
+        self.first_tick = True
+
+    def save(self):
+        if self.checkpoint:
+            self.checkpoint.save(self.settings, self.history, self.indicators, self.last_alert_time, self.last_alert_price)
+
+
+def run_tick(state, bar_time=None, scheduler=None, date_in=None, time_in=None) -> dict:
+    """
+    One loop iteration for the bar that closed at `bar_time`. With a
+    scheduler, the fetch may run until the next bar's wake-up and the bar
+    close → decision latency is recorded. Errors are counted and printed,
+    never raised. Returns {"new_bars", "agent", "alerted", "error"}.
+    """
+    metrics = get_metrics()
+    result = {"new_bars": 0, "agent": False, "alerted": False, "error": None}
+    metrics.start_tick()
+    try:
+        _tick(state, metrics, result, date_in, time_in, scheduler.deadline() if scheduler else None)
+    except Exception as e:
+        result["error"] = type(e).__name__
+        metrics.inc("tick_errors_total", error=type(e).__name__)
+        print("❌ Error:", e)
+
+    get_journal().flush_if_due()          # a quiet stretch never holds decisions in memory past one tick
+    if scheduler is not None and bar_time is not None:
+        metrics.observe("bar_close_to_decision", (scheduler.clock.now() - bar_time).total_seconds())
+    metrics.end_tick()
+    print(metrics.last_tick_line())
+    print("-" * 50)
+    return result
+
+
+def _tick(state, metrics, result, date_in, time_in, deadline):
+    # only bars newer than the last one we have; the ring buffer rejects repeats.
+    # the request may run until the next bar's wake-up, never into it
+    with metrics.span("fetch"):
+        df = state.fetcher.fetch_new(date_in=date_in, time_in=time_in, deadline=deadline)
+
+    # O(1) indicator update per new bar
+    with metrics.span("indicators"):
+        new_bars = state.history.extend(df)
+        rows = [(ts, state.indicators.update(ts, dict(zip(INPUT_COLUMNS, values))))
+                for ts, *values in new_bars[INPUT_COLUMNS].itertuples()]
+    metrics.inc("bars_total", len(new_bars))
+    result["new_bars"] = len(new_bars)
+
+    # written in place; `features` is a read-only view of the newest bar, not a dict
+    store = state.feature_store
+    with metrics.span("features"):
+        for ts, row in rows:
+            store.rollover(ts)
+            store.append(ts, row)
+        if not len(store):          # nothing new since start-up: the warm-up's last bar
+            store.append(state.indicators.last_timestamp, state.indicators.last_row)
+        features = store[-1]
+
+    now = features.timestamp
+    # no new bar: the last one was already gated, evaluated and logged (the warm-up's last bar is, once)
+    skip = len(new_bars) == 0 and not state.first_tick
+    state.first_tick = False
+    if skip:
+        print(f"💤 No new bar since {now} — nothing to evaluate")
+        metrics.inc("stale_ticks_total")
+    elif state.last_alert_time:
+        minutes_since = (now - state.last_alert_time).total_seconds() / 60
+        if minutes_since < state.cooldown_minutes:
+            print(f"⏳ Cooldown active — {minutes_since:.1f} min since last alert (need ≥ {state.cooldown_minutes})")
+            metrics.inc("cooldown_skips_total")
+            skip = True
+        else:
+            print(f"✅ Cooldown passed — {minutes_since:.1f} min since last alert")
+            state.last_alert_time = None  # reset to allow new alerts (checkpointed at the end of the tick)
+            state.last_alert_price = None
+
+    if not skip:
+        print(features["current_time"])
+        _decide(state, features, metrics, result)
+
+    # one transaction per tick: a restart resumes from here instead of re-downloading the warm-up
+    if state.checkpoint:
+        with metrics.span("checkpoint"):
+            state.save()
+
+
+def _decide(state, features, metrics, result):
+    drift = state.drift
+    with metrics.span("gate"):
+        consider = should_consider_trade(features, state.thresholds)
+    if not consider:
+        return
+    drift_reason, drift_message = drift.check(features)
+    metrics.inc("drift_total", reason=drift_reason)
+    if drift_message:
+        print(drift_message)
+    if drift_reason == "near_alert":
+        return
+
+    if drift_reason == "no_drift":
+        decision = drift.decision
+    else:
+        with metrics.span("agent"):
+            decision = agent.evaluate_with_agent(features)
+        drift.remember(features, decision)
+        result["agent"] = True
+    with metrics.span("log"):
+        log_decision(decision.model_dump(), features)
+
+    if not is_actionable(decision):
+        print("🤖 Agent says: no clean setup.")
+        return
+    with metrics.span("alert"):
+        send_alert(decision.model_dump(), features)
+    metrics.inc("alerts_total")
+    result["alerted"] = True
+
+    # Update persistent state
+    state.last_alert_time = features.timestamp
+    state.last_alert_price = features["current_price"]
+    if state.checkpoint:
+        state.checkpoint.save_alert(state.last_alert_time, state.last_alert_price)
+        print("💾 Saved last alert state")
+    drift.record_alert(state.last_alert_time, state.last_alert_price)
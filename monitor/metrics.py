@@ -0,0 +1,223 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())) + "}"
+
+
+class TickMetrics:
+    """
+    Stage timers and counters for the live loop.
+
+    - span("fetch") times one stage; the last `window` samples per stage give
+      rolling p50/p95/p99, plus lifetime count and sum
+    - inc("gate_total", reason="vix_low") bumps a labelled counter
+    - start_tick()/end_tick() (or the tick() block) bracket one loop iteration:
+      it is timed as stage "tick", optionally profiled, and the metrics file
+      is rewritten afterwards
+    - export as Prometheus text: to_prometheus(), write(path) or serve(port)
+    """
+
+    def __init__(self, window=500, path=None):
+        self.window = window
+        self.path = path
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._count = defaultdict(int)
+        self._sum = defaultdict(float)
+        self._counters = defaultdict(float)       # (name, labels) → value
+        self._last_tick = {}                      # stage → seconds, for the per-tick line
+        self._profiler = None
+        self._profile_left = 0
+        self._profile_path = None
+        self._server = None
+        self._tick_started = None
+        self.ticks = 0
+
+    # ─── recording ───
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            self._samples[stage].append(seconds)
+            self._count[stage] += 1
+            self._sum[stage] += seconds
+            self._last_tick[stage] = self._last_tick.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def span(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def start_tick(self):
+        with self._lock:
+            self._last_tick = {}
+        self._tick_started = time.perf_counter()
+        if self._profile_left:
+            self._profiler.enable()
+
+    def end_tick(self):
+        """Close the tick opened by start_tick(): record it, advance the profiler, rewrite the metrics file."""
+        if self._tick_started is None:
+            return
+        if self._profile_left:
+            self._profiler.disable()
+            self._profile_left -= 1
+            if not self._profile_left:
+                self._dump_profile()
+        self.observe("tick", time.perf_counter() - self._tick_started)
+        self._tick_started = None
+        self.ticks += 1
+        self.inc("ticks_total")
+        if self.path:
+            self.write(self.path)
+
+    @contextmanager
+    def tick(self):
+        self.start_tick()
+        try:
+            yield
+        except Exception as e:
+            self.inc("tick_errors_total", error=type(e).__name__)
+            raise
+        finally:
+            self.end_tick()
+
+    # ─── profiling ───
+
+    def profile(self, ticks, path="tick_profile.prof"):
+        """cProfile the next `ticks` ticks, then write `path` and print the top functions."""
+        if ticks <= 0:
+            return
+        self._profiler = cProfile.Profile()
+        self._profile_left = ticks
+        self._profile_path = path
+        print(f"🔬 Profiling the next {ticks} ticks → {path}")
+
+    def _dump_profile(self):
+        self._profiler.dump_stats(self._profile_path)
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(15)
+        print(out.getvalue())
+        print(f"🔬 Profile written to {self._profile_path} (view with: python -m pstats {self._profile_path})")
+        self._profiler = None
+
+    # ─── reading ───
+
+    def summary(self) -> dict:
+        """{stage: {count, sum_sec, p50_sec, p95_sec, p99_sec}} over the rolling window."""
+        with self._lock:
+            samples = {stage: np.fromiter(values, dtype=float) for stage, values in self._samples.items()}
+            count, total = dict(self._count), dict(self._sum)
+        out = {}
+        for stage, values in samples.items():
+            q = np.quantile(values, QUANTILES) if values.size else [float("nan")] * len(QUANTILES)
+            out[stage] = {"count": count[stage], "sum_sec": round(total[stage], 6),
+                          **{f"p{int(p * 100)}_sec": round(float(v), 6) for p, v in zip(QUANTILES, q)}}
+        return out
+
+    def counters(self) -> dict:
+        with self._lock:
+            return {name + _labels(dict(labels)): value for (name, labels), value in self._counters.items()}
+
+    def last_tick_line(self) -> str:
+        """'⏱️ tick 412.3 ms — fetch 380.1 · indicators 1.2 · …' for the tick that just ran."""
+        with self._lock:
+            stages = dict(self._last_tick)
+        total = stages.pop("tick", sum(stages.values()))
+        parts = " · ".join(f"{stage} {sec * 1e3:.1f}" for stage, sec in stages.items())
+        return f"⏱️ tick {total * 1e3:.1f} ms" + (f" — {parts}" if parts else "")
+
+    def to_prometheus(self) -> str:
+        lines = ["# TYPE tick_stage_seconds summary"]
+        for stage, s in sorted(self.summary().items()):
+            for p in QUANTILES:
+                lines.append(f'tick_stage_seconds{{stage="{stage}",quantile="{p}"}} {s[f"p{int(p * 100)}_sec"]}')
+            lines.append(f'tick_stage_seconds_count{{stage="{stage}"}} {s["count"]}')
+            lines.append(f'tick_stage_seconds_sum{{stage="{stage}"}} {s["sum_sec"]}')
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+        seen = set()
+        for (name, labels), value in counters:
+            if name not in seen:
+                lines.append(f"# TYPE {name} counter")
+                seen.add(name)
+            lines.append(f"{name}{_labels(dict(labels))} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    # ─── export ───
+
+    def write(self, path):
+        """Atomically rewrite a Prometheus text file (node_exporter textfile collector friendly)."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+    def serve(self, port, host="127.0.0.1"):
+        """Expose /metrics on a background thread."""
+        if self._server is not None:
+            return self._server
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"📈 Metrics on http://{host}:{self._server.server_address[1]}/metrics")
+        return self._server
+
+
+_metrics = None
+
+
+def get_metrics() -> TickMetrics:
+    """Process-wide metrics registry (counters from the gate, agent and HTTP client land here)."""
+    global _metrics
+    if _metrics is None:
+        _metrics = TickMetrics()
+    return _metrics
+
+
+def configure_metrics(config) -> TickMetrics:
+    """Apply the `monitoring:` section of strategy.yaml to the process-wide registry."""
+    section = config.get("monitoring") or {}
+    metrics = get_metrics()
+    metrics.path = section.get("metrics_file")
+    if section.get("metrics_port"):
+        metrics.serve(section["metrics_port"])
+    metrics.profile(section.get("profile_ticks") or 0, section.get("profile_path", "tick_profile.prof"))
+    return metrics
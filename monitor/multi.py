@@ -0,0 +1,298 @@
+import asyncio
+import math
+
+import pandas as pd
+
+from agent.batch import aevaluate_many
+from alerts.console_alert import log_decision, send_alert
+from alerts.journal import get_journal
+from data.fetcher import MarketDataFetcher, fetch_market_data
+from data.history import BarHistory
+from indicators.resample import BarResampler
+from indicators.streaming import INPUT_COLUMNS, StreamingIndicators
+from monitor.checkpoint import Checkpoint
+from monitor.metrics import get_metrics
+from monitor.scheduler import BarScheduler, VirtualClock
+from strategy.drift import DriftDetector, load_drift
+from strategy.features import FeatureStore
+from strategy.gate import ALERT_COOLDOWN_MINUTES, is_actionable, load_thresholds, should_consider_trade
+
+
+def load_strategies(config, mode="live") -> list:
+    """
+    Expand the `strategies:` list of strategy.yaml. Every entry inherits the
+    top-level interval, history size, RSI period, series, gate and drift
+    settings, and only overrides what it lists (`gate:` and `drift:` are
+    merged key by key).
+    """
+    base = {
+        "interval_min": config[mode]["interval_min"],
+        "history_size": config[mode]["history_size"],
+        "rsi_period": config["indicators"]["rsi_period"],
+        "series": config["api"]["params"]["series"],
+        "cooldown_minutes": ALERT_COOLDOWN_MINUTES,
+    }
+    specs = config.get("strategies") or [{"name": "default"}]
+    strategies = []
+    for i, spec in enumerate(specs):
+        merged = {**base, **{k: v for k, v in spec.items() if k not in ("gate", "drift")}}
+        merged.setdefault("name", f"strategy{i + 1}")
+        merged["thresholds"] = {**load_thresholds(config), **(spec.get("gate") or {})}
+        merged["drift"] = load_drift(config, spec.get("drift"))
+        strategies.append(Strategy(**merged))
+    return strategies
+
+
+def _series_key(series) -> str:
+    return ",".join(sorted(col.strip() for col in series.split(",")))
+
+
+class Strategy:
+    """One gate/agent/cooldown configuration; holds only its own alert and drift state."""
+
+    def __init__(self, name, interval_min, history_size, rsi_period, series, cooldown_minutes, thresholds,
+                 drift=None):
+        self.name = name
+        self.interval_min = interval_min
+        self.history_size = history_size
+        self.rsi_period = rsi_period
+        self.series = series
+        self.cooldown = pd.Timedelta(minutes=cooldown_minutes)
+        self.thresholds = thresholds
+        self.drift = DriftDetector(**(drift or load_drift({})))
+        self.last_alert_time = None
+        self.last_alert_price = None
+        self.checkpoint = None
+
+    @property
+    def checkpoint_key(self):
+        return f"alert:{self.name}"
+
+    def restore(self, checkpoint):
+        """
+        Resume this strategy's cooldown and post-alert price filter; later
+        alerts are saved there too. Until it has alerted once, a strategy
+        inherits the single-strategy alert state (and last_alert_state.json).
+        """
+        self.checkpoint = checkpoint
+        state = checkpoint.load_alert(self.checkpoint_key)
+        if state["last_alert_time"] is None:
+            state = checkpoint.load_alert()
+        self.last_alert_time, self.last_alert_price = state["last_alert_time"], state["last_alert_price"]
+        self.drift.record_alert(self.last_alert_time, self.last_alert_price)
+        if self.last_alert_time is not None:
+            print(f"♻️ [{self.name}] Last alert: time={self.last_alert_time}, price={self.last_alert_price}")
+
+    @property
+    def feed_key(self):
+        return _series_key(self.series)
+
+    @property
+    def indicator_key(self):
+        return self.interval_min, self.rsi_period
+
+    def wants_agent(self, features, now) -> bool:
+        if self.last_alert_time is not None:
+            if now - self.last_alert_time < self.cooldown:
+                get_metrics().inc("cooldown_skips_total")
+                return False
+            self.last_alert_time = None
+            self.last_alert_price = None
+        return should_consider_trade(features, self.thresholds, label=self.name)
+
+    def on_decision(self, decision, features):
+        log_decision(decision.model_dump(), features, strategy=self.name)
+        if is_actionable(decision):
+            send_alert(decision.model_dump(), features, strategy=self.name)
+            get_metrics().inc("alerts_total")
+            self.last_alert_time = features.timestamp
+            self.last_alert_price = features["current_price"]
+            if self.checkpoint:
+                self.checkpoint.save_alert(self.last_alert_time, self.last_alert_price, self.checkpoint_key)
+            self.drift.record_alert(self.last_alert_time, self.last_alert_price)
+        else:
+            print(f"🤖 [{self.name}] Agent says: no clean setup.")
+
+
+class Feed:
+    """
+    One API subscription per series set. The API serves 30-second rows: they
+    are fetched once per bar and a single BarResampler pass turns them into
+    every timeframe the strategies use. Each timeframe keeps its own
+    BarHistory, and each (interval, RSI period) pair one StreamingIndicators
+    and one FeatureStore for the session.
+    """
+
+    def __init__(self, api_config, series, strategies):
+        self.api_config = {**api_config, "params": {**api_config["params"], "series": series}}
+        sizes = {}
+        for s in strategies:
+            sizes[s.interval_min] = max(sizes.get(s.interval_min, 0), s.history_size)
+        self.interval_min = math.gcd(*sizes)          # poll cadence
+        self.resampler = BarResampler(timeframes=sizes)
+        self.histories = {interval: BarHistory(size) for interval, size in sizes.items()}
+        self.indicator_keys = sorted({s.indicator_key for s in strategies})
+        self.indicators = {}
+        self.features = {key: FeatureStore(capacity=390 // key[0] + 1) for key in self.indicator_keys}
+        self.fetcher = None
+
+    def warm_up(self, date_in):
+        bars = self.resampler.extend(fetch_market_data(self.api_config, None, date_in=date_in))
+        for interval, history in self.histories.items():
+            history.extend(bars[interval])
+        self.indicators = {
+            (interval, period): StreamingIndicators.from_history(self.histories[interval].to_frame(), period,
+                                                                 bar_minutes=interval)
+            for interval, period in self.indicator_keys
+        }
+        self.fetcher = MarketDataFetcher(self.api_config, None, last_seen=self.resampler.last_timestamp)
+
+    def poll(self, date_in, time_in, deadline):
+        """Fetch new 30-second rows, close bars on every timeframe and update their indicators; {(interval, rsi_period): features}."""
+        metrics = get_metrics()
+        with metrics.span("fetch"):
+            df = self.fetcher.fetch_new(date_in=date_in, time_in=time_in, deadline=deadline)
+
+        updated = []
+        with metrics.span("indicators"):
+            bars = self.resampler.extend(df)
+            for interval, history in self.histories.items():
+                new_bars = history.extend(bars[interval])
+                if new_bars.empty:
+                    continue
+                keys = [key for key in self.indicator_keys if key[0] == interval]
+                for ts, *values in new_bars[INPUT_COLUMNS].itertuples():
+                    bar = dict(zip(INPUT_COLUMNS, values))
+                    for key in keys:
+                        updated.append((key, ts, self.indicators[key].update(ts, bar)))
+        metrics.inc("points_total", len(df))
+
+        out = {}
+        with metrics.span("features"):
+            for key, ts, row in updated:
+                store = self.features[key]
+                store.rollover(ts)
+                out[key] = store.append(ts, row)
+        return out
+
+
+class MultiMonitor:
+    """
+    Runs N strategies off shared data: strategies on the same series share
+    one Feed (one request and one resampling pass per bar, whatever their
+    intervals), and those that also share an interval and RSI period share
+    one indicator pass and one feature dict — so the agent is asked once per
+    distinct feature set, however many strategies pass their gates on it.
+    """
+
+    def __init__(self, config, strategies):
+        self.config = config
+        self.strategies = strategies
+        self.feeds = {}
+        for key in dict.fromkeys(s.feed_key for s in strategies):
+            users = [s for s in strategies if s.feed_key == key]
+            self.feeds[key] = Feed(config["api"], users[0].series, users)
+        self.base_interval = math.gcd(*(feed.interval_min for feed in self.feeds.values()))
+        print(f"📡 {len(strategies)} strategies on {len(self.feeds)} feed(s): "
+              + "; ".join(f"{key} @ {feed.interval_min}m → {', '.join(s.name for s in strategies if s.feed_key == key)}"
+                          for key, feed in self.feeds.items()))
+
+    def warm_up(self, date_in):
+        for feed in self.feeds.values():
+            feed.warm_up(date_in)
+
+    def due_feeds(self, bar_time):
+        return {key: feed for key, feed in self.feeds.items() if bar_time.minute % feed.interval_min == 0}
+
+    async def on_bar(self, bar_time, date_in=None, time_in=None, deadline=None):
+        due = self.due_feeds(bar_time)
+        # blocking HTTP on worker threads, all due feeds at once
+        results = await asyncio.gather(*(asyncio.to_thread(feed.poll, date_in, time_in, deadline)
+                                         for feed in due.values()), return_exceptions=True)
+
+        # gate every strategy on its shared features; one agent call per distinct feature set
+        pending = {}          # id(features) → (features, [strategies])
+        for key, result in zip(due, results):
+            if isinstance(result, Exception):
+                get_metrics().inc("tick_errors_total", error=type(result).__name__)
+                print(f"❌ Error on feed {key}: {result}")
+                continue
+            for strategy in self.strategies:
+                if strategy.feed_key != key or strategy.indicator_key not in result:
+                    continue
+                features = result[strategy.indicator_key]
+                with get_metrics().span("gate"):
+                    wanted = strategy.wants_agent(features, features.timestamp)
+                if not wanted:
+                    continue
+                # barely moved since this strategy's last answer → reuse it (or skip, next to its last alert)
+                reason, message = strategy.drift.check(features)
+                get_metrics().inc("drift_total", reason=reason)
+                if message:
+                    print(f"[{strategy.name}] {message}")
+                if reason == "no_drift":
+                    strategy.on_decision(strategy.drift.decision, features)
+                elif reason != "near_alert":
+                    pending.setdefault(id(features), (features, []))[1].append(strategy)
+
+        if not pending:
+            return
+        with get_metrics().span("agent"):
+            decisions = await aevaluate_many([features for features, _ in pending.values()])
+        for (features, strategies), decision in zip(pending.values(), decisions):
+            if decision is None:
+                continue
+            for strategy in strategies:
+                strategy.drift.remember(features, decision)
+                strategy.on_decision(decision, features)
+
+
+async def run_monitor(config, date_in=None, time_in=None):
+    """
+    Live (date_in=None) or stepwise replay of one session for every configured
+    strategy, woken on each bar close of the finest feed interval.
+    """
+    mode = "backtest" if date_in else "live"
+    strategies = load_strategies(config, mode)
+    monitor = MultiMonitor(config, strategies)
+
+    # live runs keep each strategy's alert state in the checkpoint, so a restart honours its cooldown
+    checkpoint_path = config["live"].get("checkpoint_path") if mode == "live" else None
+    if checkpoint_path:
+        checkpoint = Checkpoint(checkpoint_path)
+        for strategy in strategies:
+            strategy.restore(checkpoint)
+
+    if date_in:
+        warm_up_day = pd.to_datetime(date_in) - pd.offsets.BDay(1)
+    else:
+        warm_up_day = pd.Timestamp.now(tz="America/New_York") - pd.offsets.BDay(3)
+    monitor.warm_up(warm_up_day.strftime("%Y-%m-%d"))
+
+    offset_sec = config[mode].get("bar_offset_sec", 5)
+    clock = None
+    if date_in:
+        clock = VirtualClock(pd.Timestamp(f"{date_in} {time_in or '09:30:00'}") - pd.Timedelta(seconds=offset_sec))
+    scheduler = BarScheduler(monitor.base_interval, offset_sec=offset_sec, clock=clock,
+                             holidays=config.get("holidays"), start_now=not date_in)
+    metrics = get_metrics()
+
+    while True:
+        bar_time = await asyncio.to_thread(scheduler.wait)
+        if date_in and bar_time.strftime("%Y-%m-%d") != date_in:
+            print(f"Reached end of day ({date_in}), exiting.")
+            return monitor
+
+        print(bar_time.strftime("%Y-%m-%d %H:%M:%S"))
+        metrics.start_tick()
+        try:
+            await monitor.on_bar(bar_time, date_in=date_in, time_in=bar_time.strftime("%H:%M:%S") if date_in else None,
+                                 deadline=scheduler.deadline())
+        except Exception as e:
+            metrics.inc("tick_errors_total", error=type(e).__name__)
+            print("❌ Error:", e)
+        get_journal().flush_if_due()
+        metrics.observe("bar_close_to_decision", (scheduler.clock.now() - bar_time).total_seconds())
+        metrics.end_tick()
+        print(metrics.last_tick_line())
+        print("-" * 50)
@@ -0,0 +1,171 @@
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, GoodFriday, Holiday, USLaborDay, USMartinLutherKingJr, USMemorialDay,
+    USPresidentsDay, USThanksgivingDay, nearest_workday, sunday_to_monday,
+)
+
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = (9, 30)
+MARKET_CLOSE = (16, 00)
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """Full-day NYSE closures (early closes still trade and are not listed)."""
+    rules = [
+        Holiday("NewYearsDay", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01", observance=nearest_workday),
+        Holiday("IndependenceDay", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+def is_market_window(now_et: datetime) -> bool:
+    start = now_et.replace(hour=MARKET_OPEN[0], minute=MARKET_OPEN[1], second=0, microsecond=0)
+    end = now_et.replace(hour=MARKET_CLOSE[0], minute=MARKET_CLOSE[1], second=0, microsecond=0)
+    return start <= now_et <= end
+
+
+# ────────────────────────────────────────────────
+# Clocks
+# ────────────────────────────────────────────────
+
+class WallClock:
+    """Real time in MARKET_TZ. Long sleeps are chunked so suspend/resume or NTP steps are noticed."""
+
+    def __init__(self, tz=MARKET_TZ, max_nap_sec=60.0):
+        self.tz = tz
+        self.max_nap_sec = max_nap_sec
+
+    def now(self) -> pd.Timestamp:
+        return pd.Timestamp.now(tz=self.tz)
+
+    def sleep_until(self, when: pd.Timestamp):
+        while True:
+            remaining = (when - self.now()).total_seconds()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, self.max_nap_sec))
+
+    def deadline(self, when: pd.Timestamp):
+        """`when` as a time.monotonic() value (what the HTTP client's deadline expects)."""
+        return time.monotonic() + max((when - self.now()).total_seconds(), 0.0)
+
+
+class VirtualClock:
+    """Simulated time for backtests: sleeping jumps straight to the wake-up time."""
+
+    def __init__(self, start, tz=MARKET_TZ):
+        start = pd.Timestamp(start)
+        self._now = start.tz_localize(tz) if start.tzinfo is None else start.tz_convert(tz)
+
+    def now(self) -> pd.Timestamp:
+        return self._now
+
+    def sleep_until(self, when: pd.Timestamp):
+        self._now = max(self._now, when)
+
+    def deadline(self, when):
+        return None          # nothing to race against when time is simulated
+
+
+# ────────────────────────────────────────────────
+# Scheduler
+# ────────────────────────────────────────────────
+
+class BarScheduler:
+    """
+    Wakes `offset_sec` after each `interval_min` bar boundary of the regular
+    session (MARKET_OPEN..MARKET_CLOSE in MARKET_TZ), on trading days only.
+
+    Wake-ups are absolute times, so the time a tick takes never accumulates as
+    drift. If a tick overruns one or more bars, the missed bars are skipped
+    and the next wake-up is the next upcoming bar. Outside the session
+    (nights, weekends, NYSE holidays) it sleeps until the next session's
+    first bar. Pass a VirtualClock to drive backtests at full speed.
+
+    With start_now=True (live runs), the first wait() inside the session
+    returns the bar that closed last straight away, so start-up evaluates the
+    market immediately instead of idling until the next bar closes.
+    """
+
+    def __init__(self, interval_min, offset_sec=5.0, clock=None, holidays=None, start_now=False):
+        self.interval = pd.Timedelta(minutes=interval_min)
+        self.offset = pd.Timedelta(seconds=offset_sec)
+        self.clock = clock or WallClock()
+        self.start_now = start_now
+        self.extra_holidays = {pd.Timestamp(d).date() for d in (holidays or [])}
+        self._holidays = {}        # year → set of dates
+        self.last_bar = None
+        self.skipped = 0
+
+    def is_trading_day(self, day) -> bool:
+        day = pd.Timestamp(day).date()
+        if day.weekday() >= 5 or day in self.extra_holidays:
+            return False
+        if day.year not in self._holidays:
+            dates = NYSEHolidayCalendar().holidays(f"{day.year}-01-01", f"{day.year}-12-31")
+            self._holidays[day.year] = set(dates.date)
+        return day not in self._holidays[day.year]
+
+    def _session(self, day):
+        tz = self.clock.now().tz
+        start = pd.Timestamp(day.year, day.month, day.day, *MARKET_OPEN).tz_localize(tz)
+        end = pd.Timestamp(day.year, day.month, day.day, *MARKET_CLOSE).tz_localize(tz)
+        return start, end
+
+    def next_bar(self, now=None) -> pd.Timestamp:
+        """The first session bar whose wake-up time (bar + offset) is not in the past."""
+        now = self.clock.now() if now is None else now
+        day = now.date()
+        for _ in range(15):                         # longest closure is a few days
+            if self.is_trading_day(day):
+                start, end = self._session(day)
+                steps = max(-(-(now - self.offset - start) // self.interval), 0)   # ceil, not before open
+                bar = start + steps * self.interval
+                if bar <= end:
+                    return bar
+            day = (pd.Timestamp(day) + pd.Timedelta(days=1)).date()
+        raise RuntimeError(f"no trading session found within 15 days of {now}")
+
+    def wait(self) -> pd.Timestamp:
+        """Sleep until the next bar's wake-up time and return that bar's timestamp."""
+        now = self.clock.now()
+        if self.start_now and self.last_bar is None and self.is_trading_day(now) and is_market_window(now):
+            start, _ = self._session(now.date())
+            if now - self.offset >= start:
+                self.last_bar = start + ((now - self.offset - start) // self.interval) * self.interval
+                return self.last_bar
+
+        bar = self.next_bar(now)
+        if self.last_bar is not None and bar <= self.last_bar:     # woke exactly on time last tick
+            bar = self.next_bar(self.last_bar + self.interval + self.offset)
+        wake = bar + self.offset
+
+        if self.last_bar is not None and bar.date() == self.last_bar.date():
+            missed = int((bar - self.last_bar) / self.interval) - 1
+            if missed > 0:
+                self.skipped += missed
+                print(f"⏭️ Skipped {missed} missed bar(s) — evaluating {bar.strftime('%H:%M')} instead")
+        if not (self.is_trading_day(now) and is_market_window(now)):
+            print(f"🌙 Market closed — sleeping until {wake.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+
+        self.clock.sleep_until(wake)
+        self.last_bar = bar
+        return bar
+
+    def deadline(self):
+        """Monotonic deadline for the current tick: the next bar's wake-up time (None on a virtual clock)."""
+        if self.last_bar is None:
+            return None
+        return self.clock.deadline(self.last_bar + self.interval + self.offset)
@@ -0,0 +1,98 @@
+import math
+
+import pandas as pd
+
+
+# Drift settings — override any of them under `drift:` in config/strategy.yaml
+DEFAULT_DRIFT = {
+    "enabled": True,
+    "max_age_minutes": 30,           # re-ask the agent at least this often, drift or not
+    "alert_price_points": 18,        # after an alert, skip while SPX is this close to the alert price (same day)
+    "tolerances": {                  # |change| since the last evaluated bar that still counts as "the same setup"
+        "current_price": 3.0,
+        "rsi": 2.0,
+        "ema21_slope_5min": 0.3,
+        "ret_5min_pct": 0.05,
+        "premium_ratio": 0.25,
+        "vix": 0.5,
+    },
+}
+
+
+def load_drift(config, overrides=None) -> dict:
+    """DEFAULT_DRIFT ← config `drift:` ← overrides (e.g. one strategy's `drift:`), tolerances merged key by key."""
+    settings = {**DEFAULT_DRIFT, "tolerances": dict(DEFAULT_DRIFT["tolerances"])}
+    for layer in (config.get("drift"), overrides):
+        layer = layer or {}
+        settings.update({k: v for k, v in layer.items() if k != "tolerances"})
+        settings["tolerances"].update(layer.get("tolerances") or {})
+    return settings
+
+
+def _timestamp(features) -> pd.Timestamp:
+    # FeatureRecord carries the bar time; a plain feature dict only has the formatted current_time
+    return features.timestamp if hasattr(features, "timestamp") else pd.Timestamp(features["current_time"])
+
+
+class DriftDetector:
+    """
+    Debounce for agent calls. A bar that passed the gate is only worth a new
+    agent call if something material moved since the last bar that was
+    evaluated: check() compares the feature record with that bar, feature by
+    feature against `tolerances`, and with the price of the last alert.
+
+        ("near_alert", msg)  SPX is still within alert_price_points of today's last alert → skip
+        ("no_drift", msg)    every tolerance holds and the last answer is fresh → reuse `decision`
+        ("first" | "drift" | "stale" | "new_day" | "disabled", "")  → ask the agent, then remember()
+    """
+
+    def __init__(self, enabled=True, max_age_minutes=30, alert_price_points=18, tolerances=None):
+        self.enabled = enabled
+        self.max_age = pd.Timedelta(minutes=max_age_minutes)
+        self.alert_price_points = alert_price_points
+        self.tolerances = dict(DEFAULT_DRIFT["tolerances"] if tolerances is None else tolerances)
+        self.decision = None
+        self._last = None            # (timestamp, {feature: value}) of the last evaluated bar
+        self._alert = None           # (timestamp, price) of the last alert
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(**load_drift(config))
+
+    def check(self, features):
+        """(reason, message) — message is empty when the agent should be asked."""
+        if not self.enabled:
+            return "disabled", ""
+        now = _timestamp(features)
+        price = features["current_price"]
+
+        if self._alert is not None and self._alert[0].date() == now.date():
+            alert_price = self._alert[1]
+            if abs(price - alert_price) < self.alert_price_points:
+                return "near_alert", (f"🔁 SPX {price} is within {self.alert_price_points} pts of the last alert "
+                                      f"({alert_price}) — same setup, not asking again.")
+
+        if self._last is None:
+            return "first", ""
+        last_time, last = self._last
+        if last_time.date() != now.date():
+            return "new_day", ""
+        if now - last_time >= self.max_age:
+            return "stale", ""
+        for name, tolerance in self.tolerances.items():
+            change = abs(features[name] - last[name])
+            if math.isnan(change) or change > tolerance:
+                return "drift", ""
+        return "no_drift", (f"🔁 Features within tolerance of {last_time.strftime('%H:%M')} "
+                            f"(SPX {last['current_price']} → {price}, RSI {last['rsi']} → {features['rsi']}) "
+                            f"— reusing that decision.")
+
+    def remember(self, features, decision):
+        """Record the bar the agent just answered for (and its answer) as the new reference."""
+        now = _timestamp(features)
+        self._last = (now, {name: features[name] for name in {"current_price", "rsi", *self.tolerances}})
+        self.decision = decision
+
+    def record_alert(self, timestamp, price):
+        if timestamp is not None and price is not None:
+            self._alert = (pd.Timestamp(timestamp), float(price))
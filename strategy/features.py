@@ -0,0 +1,209 @@
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+
+# feature name → (indicator column, decimals); time fields are handled separately
+FEATURE_COLUMNS = {
+    # ─── Core level & fear ───
+    "current_price": ("spx", 2),
+    "expected_move": ("spxExpectedMove", 2),
+    "vix": ("vix", 2),
+
+    # ─── Momentum classics ───
+    "rsi": ("rsi", 1),
+    "macd": ("macd", 4),
+    "macd_hist": ("macd_hist", 4),
+    "macd_signal": ("macd_signal", 4),
+
+    # ─── Bollinger Bands ───
+    "bb_upper": ("bb_upper", 2),
+    "bb_lower": ("bb_lower", 2),
+    "bb_middle": ("bb_middle", 2),
+
+    # ─── 0DTE + time sensitive ───
+    "premium_ratio": ("premium_ratio", 2),
+
+    # ─── Position vs structure ───
+    "ema9": ("ema9", 4),
+    "ema21": ("ema21", 4),
+    "ema50": ("ema50", 4),
+
+    "ema21_slope_5min": ("ema21_slope_5min", 6),
+    "ema21_slope_15min": ("ema21_slope_15min", 6),
+    "ema21_slope_30min": ("ema21_slope_30min", 6),
+
+    "ret_5min_pct": ("ret_5min", 2),
+    "ret_15min_pct": ("ret_15min", 2),
+    "ret_30min_pct": ("ret_30min", 2),
+}
+
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# column-store layout: one row per numeric feature, in build_features() key order
+FEATURE_NAMES = list(FEATURE_COLUMNS) + ["time_to_close_min"]
+FEATURE_KEYS = FEATURE_NAMES + ["current_time"]
+_SOURCES = [col for col, _ in FEATURE_COLUMNS.values()] + ["time_to_close"]
+_SCALE = 10.0 ** np.array([decimals for _, decimals in FEATURE_COLUMNS.values()] + [0])
+_ROW = {name: i for i, name in enumerate(FEATURE_NAMES)}
+_TIME_TO_CLOSE = _ROW["time_to_close_min"]
+
+
+def build_features(latest) -> dict:
+    """Feature dict for the agent/gate from one indicator row (a Series named by its timestamp)."""
+    features = {
+        name: round(latest.get(col, np.nan), decimals)
+        for name, (col, decimals) in FEATURE_COLUMNS.items()
+    }
+    features["time_to_close_min"] = int(latest["time_to_close"])
+    features["current_time"] = latest.name.strftime(TIME_FORMAT)
+    return features
+
+
+def build_feature_frame(df) -> pd.DataFrame:
+    """Vectorized build_features() over every row of an indicator frame."""
+    frame = pd.DataFrame(
+        {
+            name: np.round(df[col].to_numpy(dtype="float64"), decimals) if col in df else np.nan
+            for name, (col, decimals) in FEATURE_COLUMNS.items()
+        },
+        index=df.index,
+    )
+    frame["time_to_close_min"] = df["time_to_close"].to_numpy(dtype="int64")
+    frame["current_time"] = df.index.strftime(TIME_FORMAT)
+    return frame
+
+
+# ────────────────────────────────────────────────
+# Column store: a session's features in one preallocated array
+# ────────────────────────────────────────────────
+
+class FeatureRecord(Mapping):
+    """
+    One bar of a FeatureStore, read in place: a mapping with the same keys
+    and value types as build_features(), so the gate, the prompt, the
+    decision cache, the journal and the alert all take it unchanged, but no
+    dict is built for it. Valid until the store is cleared; to_dict() copies.
+    """
+
+    __slots__ = ("_store", "_i", "_time")
+
+    def __init__(self, store, i):
+        self._store = store
+        self._i = i
+        self._time = None
+
+    def __getitem__(self, name):
+        if name == "current_time":
+            if self._time is None:
+                self._time = self.timestamp.strftime(TIME_FORMAT)
+            return self._time
+        row = _ROW[name]
+        value = self._store.values[row, self._i]
+        return int(value) if row == _TIME_TO_CLOSE else float(value)
+
+    def __iter__(self):
+        return iter(FEATURE_KEYS)
+
+    def __len__(self):
+        return len(FEATURE_KEYS)
+
+    @property
+    def timestamp(self) -> pd.Timestamp:
+        return pd.Timestamp(int(self._store.ts[self._i]), tz="UTC").tz_convert(self._store.tz)
+
+    def to_dict(self) -> dict:
+        features = dict(zip(FEATURE_NAMES, self._store.values[:, self._i].tolist()))
+        features["time_to_close_min"] = int(features["time_to_close_min"])
+        features["current_time"] = self["current_time"]
+        return features
+
+
+class FeatureStore:
+    """
+    Preallocated column store of feature rows: one contiguous float64 row per
+    feature (FEATURE_NAMES) and one column per bar, plus the bar timestamps.
+    append() rounds and writes one bar in place and returns a FeatureRecord
+    view of it; to_frame() exports the filled part as a DataFrame without
+    copying. Capacity doubles if it runs out, and clear() keeps the
+    allocation for the next session. Rounding is the same as
+    build_feature_frame(), so live and vectorized features agree exactly.
+    """
+
+    def __init__(self, capacity=128, tz="America/New_York"):
+        self.values = np.full((len(FEATURE_NAMES), capacity), np.nan)
+        self.ts = np.zeros(capacity, dtype="int64")          # epoch ns
+        self.tz = tz
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i) -> FeatureRecord:
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError(f"feature row {i} out of range ({self.size} rows)")
+        return FeatureRecord(self, i)
+
+    @property
+    def capacity(self):
+        return self.ts.shape[0]
+
+    def _reserve(self, rows):
+        if rows <= self.capacity:
+            return
+        capacity = max(rows, 2 * self.capacity)
+        values = np.full((len(FEATURE_NAMES), capacity), np.nan)
+        values[:, :self.size] = self.values[:, :self.size]
+        ts = np.zeros(capacity, dtype="int64")
+        ts[:self.size] = self.ts[:self.size]
+        self.values, self.ts = values, ts
+
+    def append(self, ts, row) -> FeatureRecord:
+        """Add one bar from an indicator row (a StreamingIndicators.update() dict or a Series)."""
+        self._reserve(self.size + 1)
+        i = self.size
+        raw = np.fromiter((row.get(col, np.nan) for col in _SOURCES), dtype="float64", count=len(_SOURCES))
+        self.values[:, i] = np.rint(raw * _SCALE) / _SCALE
+        self.ts[i] = pd.Timestamp(ts).value
+        self.size += 1
+        return FeatureRecord(self, i)
+
+    def extend(self, df) -> range:
+        """Add every row of an indicator frame in one vectorized pass; returns the positions written."""
+        start, rows = self.size, len(df)
+        self._reserve(start + rows)
+        for row, col in enumerate(_SOURCES):
+            values = df[col].to_numpy(dtype="float64") if col in df else np.nan
+            self.values[row, start:start + rows] = np.rint(values * _SCALE[row]) / _SCALE[row]
+        self.ts[start:start + rows] = df.index.as_unit("ns").asi8
+        self.size += rows
+        return range(start, start + rows)
+
+    @classmethod
+    def from_frame(cls, df, tz=None):
+        """A store holding every row of an indicator frame (e.g. one backtest session)."""
+        store = cls(capacity=max(len(df), 1), tz=tz or df.index.tz or "America/New_York")
+        store.extend(df)
+        return store
+
+    def rollover(self, ts):
+        """clear() when `ts` falls on a later day than the stored bars (one store per session)."""
+        if self.size and pd.Timestamp(ts).tz_convert(self.tz).date() != self[-1].timestamp.date():
+            self.clear()
+
+    def clear(self):
+        self.size = 0
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        The filled rows as a float64 DataFrame indexed by bar time, as a view
+        of the store (no copy; take .copy() to keep it past the next clear()).
+        current_time is the index and time_to_close_min stays a float here.
+        """
+        index = pd.DatetimeIndex(pd.to_datetime(self.ts[:self.size], unit="ns", utc=True),
+                                 name="dateTime").tz_convert(self.tz)
+        return pd.DataFrame(self.values[:, :self.size].T, index=index, columns=FEATURE_NAMES, copy=False)
@@ -0,0 +1,131 @@
+import numpy as np
+
+from alerts.console_alert import alert
+from monitor.metrics import get_metrics
+
+
+ALERT_COOLDOWN_MINUTES = 30          # minimum time between alerts
+MIN_ALERT_CONFIDENCE = 0.7           # agent confidence needed to send an alert
+
+# Gate thresholds — override any of them under `gate:` in config/strategy.yaml
+# (tune with `python -m backtest.sweep`)
+DEFAULT_THRESHOLDS = {
+    "min_vix": 14.0,
+    "max_vix": 38.0,
+    "max_minutes_to_close": 360,     # before ~9:45–10:00 ET
+    "min_minutes_to_close": 60,      # last hour
+    "max_abs_ret_5min_pct": 0.80,
+    "max_abs_ret_15min_pct": 1.40,
+    "max_abs_ema21_slope_5min": 3.0, # ~3–4 pts/min is fast
+    "min_premium_ratio": 3.0,
+    "rsi_extreme_low": 18,
+    "rsi_extreme_high": 82,
+    "rsi_neutral_low": 40,
+    "rsi_neutral_high": 60,
+}
+
+
+def load_thresholds(config) -> dict:
+    return {**DEFAULT_THRESHOLDS, **(config.get("gate") or {})}
+
+
+def is_actionable(decision) -> bool:
+    return bool(decision.trade) and decision.confidence >= MIN_ALERT_CONFIDENCE
+
+
+def gate_check(features: dict, thresholds=None):
+    """
+    Returns (reason, message) for the first gate rule that rejects the bar,
+    or ("pass", "") if the bar is okay to send on to the agent.
+    """
+    t = thresholds or DEFAULT_THRESHOLDS
+
+    # ─── Required minimum conditions ────────────────────────────────────────
+
+    # 1. VIX not too low → premiums need to be decent
+    if features["vix"] < t["min_vix"]:
+        return "vix_low", f"VIX too low ({features['vix']}) — premiums likely too thin for good credit spreads."
+
+    # 2. Not ridiculously high VIX (extreme fear / gap risk)
+    if features["vix"] > t["max_vix"]:
+        return "vix_high", f"VIX too high ({features['vix']}) — extreme fear, gap risk, and likely not ideal for new credit spreads."
+
+    # 3. Time window — best theta decay & lower gamma risk
+    minutes_left = features["time_to_close_min"]
+    if minutes_left > t["max_minutes_to_close"]:   # before ~9:45–10:00 ET
+        return "too_early", f"Too early in the day ({features['current_time']}) — market just opened, not ideal for new credit spreads."
+    if minutes_left < t["min_minutes_to_close"]:    # last hour — gamma explosion risk, especially 0DTE
+        return "too_late", f"Too late in the day ({features['current_time']}) — last hour, gamma risk increases significantly for 0DTE credit spreads."
+
+    # 4. Trend filter — avoid fighting very strong short-term momentum
+    #    We want mild trend or range → good for credit spreads
+    slope_5  = features["ema21_slope_5min"]
+    ret5     = features["ret_5min_pct"]
+    ret15    = features["ret_15min_pct"]
+
+    # Very strong momentum in last 5–15 min → usually bad for new credit spreads
+    if abs(ret5) > t["max_abs_ret_5min_pct"] or abs(ret15) > t["max_abs_ret_15min_pct"]:
+        return "momentum", f"Strong momentum detected (5min: {ret5}%, 15min: {ret15}%) — usually not ideal for new credit spreads."
+    # Very steep short-term slope → momentum is probably not exhausted yet
+    if abs(slope_5) > t["max_abs_ema21_slope_5min"]:
+        return "steep_slope", f"Steep short-term slope detected (5min EMA21 slope: {slope_5} pts/min) — momentum may not be exhausted, not ideal for new credit spreads."
+
+    # ─── Optional / tunable filters (comment out if too restrictive) ─────────
+    if features["premium_ratio"] <= t["min_premium_ratio"]:
+        return "premium_ratio", f"Premium ratio too low ({features['premium_ratio']}) — may indicate directional bias, not ideal for balanced credit spreads."
+    if features["rsi"] < t["rsi_extreme_low"] or features["rsi"] > t["rsi_extreme_high"]:
+        return "rsi_extreme", f"RSI in extreme territory ({features['rsi']}) — may indicate overbought/oversold conditions, often better to wait for mean reversion before opening new credit spreads."
+    if features["rsi"] > t["rsi_neutral_low"] and features["rsi"] < t["rsi_neutral_high"]:
+        return "rsi_neutral", f"RSI is neutral ({features['rsi']}) — may indicate lack of momentum, not ideal for new credit spreads which often benefit from some directional bias."
+
+    return "pass", ""
+
+
+def should_consider_trade(features: dict, thresholds=None, label=None) -> bool:
+    """
+    Basic gate / pre-filter: should we even look at PCS or CCS setups right now?
+    Returns True only if general conditions are acceptable to consider a credit spread.
+    `label` (a strategy name) prefixes the reject message when several strategies share a feed.
+    """
+    reason, message = gate_check(features, thresholds)
+    get_metrics().inc("gate_total", reason=reason)
+
+    # ─── If we passed everything → okay to evaluate PCS / CCS logic next ─────
+    if not message:
+        return True
+
+    if label:
+        message = f"[{label}] {message}"
+    alert(features["current_time"] + "--" + message,silent=True)
+    print(message)
+    return False
+
+
+def gate_mask(frame, thresholds=None):
+    """
+    Vectorized gate_check() over a whole feature frame (see build_feature_frame).
+    Returns (mask, reasons): a boolean pass mask and the rejecting rule per row.
+    """
+    t = thresholds or DEFAULT_THRESHOLDS
+    vix = frame["vix"].to_numpy()
+    minutes_left = frame["time_to_close_min"].to_numpy()
+    ret5 = frame["ret_5min_pct"].to_numpy()
+    ret15 = frame["ret_15min_pct"].to_numpy()
+    slope_5 = frame["ema21_slope_5min"].to_numpy()
+    premium_ratio = frame["premium_ratio"].to_numpy()
+    rsi = frame["rsi"].to_numpy()
+
+    # same order as gate_check — the first matching rule wins
+    rules = [
+        ("vix_low", vix < t["min_vix"]),
+        ("vix_high", vix > t["max_vix"]),
+        ("too_early", minutes_left > t["max_minutes_to_close"]),
+        ("too_late", minutes_left < t["min_minutes_to_close"]),
+        ("momentum", (np.abs(ret5) > t["max_abs_ret_5min_pct"]) | (np.abs(ret15) > t["max_abs_ret_15min_pct"])),
+        ("steep_slope", np.abs(slope_5) > t["max_abs_ema21_slope_5min"]),
+        ("premium_ratio", premium_ratio <= t["min_premium_ratio"]),
+        ("rsi_extreme", (rsi < t["rsi_extreme_low"]) | (rsi > t["rsi_extreme_high"])),
+        ("rsi_neutral", (rsi > t["rsi_neutral_low"]) & (rsi < t["rsi_neutral_high"])),
+    ]
+    reasons = np.select([cond for _, cond in rules], [name for name, _ in rules], default="pass")
+    return reasons == "pass", reasons
@@ -0,0 +1,54 @@
+import pytest
+
+import agent.agent as agent
+from agent.batch import evaluate_many
+from agent.cache import DecisionCache
+from agent.stub import StubChatModel
+
+
+FIELDS = ["current_price", "expected_move", "vix", "rsi", "macd", "macd_signal", "macd_hist",
+          "bb_upper", "bb_middle", "bb_lower", "premium_ratio", "time_to_close_min", "ema9", "ema21", "ema50",
+          "ema21_slope_5min", "ema21_slope_30min", "ret_5min_pct", "ret_30min_pct"]
+
+
+def _features(rsi, i=0):
+    features = {field: 1.0 for field in FIELDS}
+    features.update(current_time=f"2026-01-30 10:{i:02d}:00", current_price=6900.0 + i, rsi=rsi)
+    return features
+
+
+@pytest.fixture
+def stub_agent(tmp_path, monkeypatch):
+    """The real chain on the offline stub model, caching into a throwaway SQLite file."""
+    for name in ("llm", "chain", "parser", "PROMPT_TEXT", "MODEL_NAME", "rules", "decision_cache"):
+        monkeypatch.setattr(agent, name, getattr(agent, name))
+    agent.use_llm(StubChatModel())
+    agent.decision_cache = DecisionCache(tmp_path / "agent_cache.sqlite")
+    return agent
+
+
+def test_decisions_in_input_order(stub_agent):
+    decisions = evaluate_many([_features(80, 0), _features(20, 1), _features(50, 2)])
+    assert [d.trade for d in decisions] == ["SELL_CALL", "SELL_PUT", "NONE"]
+
+
+def test_return_cached_flags(stub_agent):
+    batch = [_features(80, i) for i in range(5)]
+    decisions, cached = evaluate_many(batch[:3], return_cached=True)
+    assert cached == [False] * 3
+
+    decisions, cached = evaluate_many(batch, return_cached=True)
+    assert cached == [True] * 3 + [False] * 2
+    assert stub_agent.decision_cache.hits == 3
+    assert all(d.trade == "SELL_CALL" for d in decisions)
+
+
+def test_matches_evaluate_with_agent(stub_agent):
+    batch = [_features(rsi, i) for i, rsi in enumerate((10, 40, 70, 90))]
+    expected = [stub_agent.evaluate_with_agent(f, use_cache=False) for f in batch]
+    assert evaluate_many(batch, use_cache=False) == expected
+
+
+def test_empty_batch(stub_agent):
+    assert evaluate_many([]) == []
+    assert evaluate_many([], return_cached=True) == ([], [])
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from data.cache import load_session, save_session
+
+
+SERIES = "spx,vix,spxExpectedMove,spxOTMBids"
+
+
+def test_round_trip(tmp_path):
+    index = pd.date_range("2026-01-30 09:30", periods=78, freq="5min", tz="America/New_York",
+                          name="dateTime").as_unit("ns")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({col: rng.normal(size=78) for col in SERIES.split(",")}, index=index)
+    df.iloc[3, 1] = np.nan
+
+    assert load_session(tmp_path, "2026-01-30", SERIES, 5) is None
+    save_session(tmp_path, "2026-01-30", SERIES, 5, df)
+    loaded = load_session(tmp_path, "2026-01-30", SERIES, 5)
+    pd.testing.assert_frame_equal(loaded[df.columns], df, check_freq=False)
+    assert load_session(tmp_path, "2026-01-30", SERIES, None) is None      # raw stream is cached separately
+
+    loaded.iloc[0, 0] = 1.0                      # a loaded frame is an ordinary writable frame
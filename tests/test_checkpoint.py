@@ -0,0 +1,72 @@
+import math
+
+import pandas as pd
+import pytest
+
+from bench.synthetic import generate_days
+from data.history import BarHistory
+from indicators.resample import resample_frame
+from indicators.streaming import INPUT_COLUMNS, StreamingIndicators
+from monitor.checkpoint import Checkpoint
+
+
+SETTINGS = {"interval_min": 5, "history_size": 120, "rsi_period": 14}
+
+
+@pytest.fixture
+def bars():
+    frame = pd.concat(generate_days("2026-01-28", days=3, seed=1).values())
+    return resample_frame(frame, 5)[INPUT_COLUMNS]
+
+
+@pytest.fixture
+def checkpoint(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)          # no stray last_alert_state.json is picked up
+    return Checkpoint(tmp_path / "monitor_state.sqlite")
+
+
+def _session(bars):
+    history = BarHistory(SETTINGS["history_size"])
+    history.extend(bars)
+    indicators = StreamingIndicators.from_history(history.to_frame(), SETTINGS["rsi_period"], bar_minutes=5)
+    return history, indicators
+
+
+def test_round_trip(bars, checkpoint):
+    history, indicators = _session(bars.iloc[:-10])
+    alert_time = pd.Timestamp("2026-01-30 11:05", tz="America/New_York")
+    checkpoint.save(SETTINGS, history, indicators, alert_time, 6912.5)
+
+    restored_history, restored_indicators = Checkpoint(checkpoint.path).load_session(SETTINGS)
+    pd.testing.assert_frame_equal(restored_history.to_frame(), history.to_frame())
+    assert restored_indicators.last_timestamp == indicators.last_timestamp
+    assert checkpoint.load_alert() == {"last_alert_time": alert_time, "last_alert_price": 6912.5}
+
+    # the restored state carries on exactly like the one that never stopped
+    for ts, bar in bars.iloc[-10:].iterrows():
+        assert restored_indicators.update(ts, bar) == pytest.approx(indicators.update(ts, bar), nan_ok=True)
+    assert len(restored_history.extend(bars.iloc[-10:])) == 10
+
+
+def test_alert_state_alone(checkpoint):
+    assert checkpoint.load_alert() == {"last_alert_time": None, "last_alert_price": None}
+    checkpoint.save_alert(pd.Timestamp("2026-01-30 15:00", tz="UTC"), 6900.0)
+    assert checkpoint.load_alert()["last_alert_time"] == pd.Timestamp("2026-01-30 10:00", tz="America/New_York")
+
+
+def test_other_settings_cold_start(bars, checkpoint):
+    history, indicators = _session(bars)
+    checkpoint.save(SETTINGS, history, indicators, None, None)
+    assert checkpoint.load_session({**SETTINGS, "rsi_period": 9}) is None
+    assert Checkpoint(checkpoint.path.with_name("empty.sqlite")).load_session(SETTINGS) is None
+
+
+def test_nan_indicator_state_is_rebuilt(bars, checkpoint):
+    history, indicators = _session(bars)
+    indicators._ema21.value = math.nan          # as a checkpoint from before NaN prints were skipped
+    assert not indicators.is_valid()
+    checkpoint.save(SETTINGS, history, indicators, None, None)
+
+    _, restored = checkpoint.load_session(SETTINGS)
+    assert restored.is_valid()
+    assert restored.last_row == pytest.approx(_session(bars)[1].last_row, nan_ok=True)
@@ -0,0 +1,112 @@
+import time
+
+import pytest
+
+import alerts.console_alert as console_alert
+from alerts.dispatcher import AlertDispatcher, FakeTransport
+
+
+@pytest.fixture
+def dispatcher(monkeypatch):
+    """Dispatcher on a fake transport, installed as console_alert's process-wide one."""
+    created = []
+
+    def make(transport, **kwargs):
+        d = AlertDispatcher(transport, **{"backoff_sec": 0.01, **kwargs}).start()
+        created.append(d)
+        monkeypatch.setattr(console_alert, "_dispatcher", d)
+        return d
+
+    yield make
+    for d in created:
+        d.close()
+
+
+def test_retries_then_sends(dispatcher):
+    transport = FakeTransport(fail_times=2)
+    d = dispatcher(transport, coalesce_sec=0)
+    assert console_alert.alert("SELL_CALL 6950")
+    assert console_alert.flush_alerts(5)
+    assert transport.attempts == 3
+    assert transport.sent == [("SELL_CALL 6950", False)]
+    assert (d.sent, d.failed) == (1, 0)
+
+
+def test_gives_up_after_max_retries(dispatcher):
+    transport = FakeTransport(fail_times=10)
+    d = dispatcher(transport, coalesce_sec=0, max_retries=2)
+    d.submit("lost")
+    assert d.flush(5)
+    assert transport.attempts == 3
+    assert transport.sent == []
+    assert (d.sent, d.failed) == (0, 1)
+
+
+def test_submit_does_not_wait_for_the_transport(dispatcher):
+    dispatcher(FakeTransport(latency_sec=0.1), coalesce_sec=0)
+    started = time.perf_counter()
+    for i in range(5):
+        console_alert.alert(f"alert {i}")
+    assert time.perf_counter() - started < 0.05
+    assert console_alert.flush_alerts(5)
+
+
+def test_silent_messages_coalesce_loud_ones_do_not(dispatcher):
+    transport = FakeTransport()
+    d = dispatcher(transport, coalesce_sec=0.2)
+    for i in range(20):
+        console_alert.alert(f"log {i}", silent=True)
+    console_alert.alert("ALERT", silent=False)
+    for i in range(5):
+        console_alert.alert(f"log2 {i}", silent=True)
+    assert console_alert.flush_alerts(5)
+
+    assert transport.sent == [
+        ("\n\n".join(f"log {i}" for i in range(20)), True),
+        ("ALERT", False),
+        ("\n\n".join(f"log2 {i}" for i in range(5)), True),
+    ]
+    assert d.sent == 3
+
+
+def test_full_queue_drops(dispatcher):
+    d = dispatcher(FakeTransport(latency_sec=0.2), maxsize=2, coalesce_sec=0)
+    accepted = [d.submit(f"alert {i}") for i in range(6)]
+    assert accepted[:2] == [True, True]
+    assert d.dropped == accepted.count(False) >= 3
+    assert d.flush(5)
+    assert d.sent == accepted.count(True)
+
+
+def test_close_flushes_and_stops(dispatcher):
+    transport = FakeTransport(latency_sec=0.05)
+    d = dispatcher(transport, coalesce_sec=0)
+    for i in range(3):
+        d.submit(f"alert {i}")
+    d.close()
+    assert len(transport.sent) == 3
+    assert d._thread is None
+
+
+def test_close_gives_up_on_a_stuck_sender(dispatcher):
+    d = dispatcher(FakeTransport(latency_sec=1.0), maxsize=1, coalesce_sec=0)
+    d.submit("in flight")
+    time.sleep(0.05)                         # the sender picks it up and blocks in send()
+    assert d.submit("queued")                # ...so the queue is full
+    started = time.perf_counter()
+    d.close(timeout=0.2)
+    assert time.perf_counter() - started < 0.5
+    assert d._thread is None
+
+
+def test_use_transport_registers_one_exit_hook(monkeypatch):
+    hooks = []
+    monkeypatch.setattr(console_alert.atexit, "register", hooks.append)
+    monkeypatch.setattr(console_alert, "_close_at_exit", False)
+    monkeypatch.setattr(console_alert, "_dispatcher", None)
+    first = console_alert.use_transport(FakeTransport())
+    second = console_alert.use_transport(FakeTransport())
+    assert first._thread is None              # replaced dispatchers are closed right away
+    assert len(hooks) == 1
+    hooks[0]()
+    assert second._thread is None
@@ -0,0 +1,112 @@
+import math
+
+import pytest
+
+from strategy.drift import DEFAULT_DRIFT, DriftDetector, load_drift
+
+
+def features(time="2026-03-02 10:00:00", **changes):
+    record = {"current_time": time, "current_price": 6800.0, "rsi": 40.0, "ema21_slope_5min": -0.5,
+              "ret_5min_pct": -0.10, "premium_ratio": 1.2, "vix": 18.0}
+    record.update(changes)
+    return record
+
+
+@pytest.fixture
+def detector():
+    detector = DriftDetector()
+    detector.remember(features(), "NO_TRADE")
+    return detector
+
+
+def test_first_bar_asks_the_agent():
+    assert DriftDetector().check(features()) == ("first", "")
+
+
+def test_disabled_always_asks():
+    detector = DriftDetector(enabled=False)
+    detector.remember(features(), "NO_TRADE")
+    assert detector.check(features("2026-03-02 10:05:00")) == ("disabled", "")
+
+
+def test_changes_within_tolerance_reuse_the_decision(detector):
+    reason, message = detector.check(features("2026-03-02 10:05:00", current_price=6802.5, rsi=41.5, vix=18.4))
+    assert reason == "no_drift"
+    assert "10:00" in message
+    assert detector.decision == "NO_TRADE"
+
+
+@pytest.mark.parametrize("name", list(DEFAULT_DRIFT["tolerances"]))
+def test_any_feature_beyond_its_tolerance_is_drift(detector, name):
+    base = features()[name]
+    tolerance = DEFAULT_DRIFT["tolerances"][name]
+    within = features("2026-03-02 10:05:00", **{name: base + 0.99 * tolerance})
+    assert detector.check(within)[0] == "no_drift"
+    beyond = features("2026-03-02 10:05:00", **{name: base - 1.01 * tolerance})
+    assert detector.check(beyond) == ("drift", "")
+
+
+def test_nan_feature_is_drift(detector):
+    assert detector.check(features("2026-03-02 10:05:00", vix=math.nan)) == ("drift", "")
+
+
+def test_custom_tolerances_only_compare_their_features():
+    detector = DriftDetector(tolerances={"rsi": 5.0})
+    detector.remember(features(), "NO_TRADE")
+    assert detector.check(features("2026-03-02 10:05:00", rsi=44.0, vix=30.0))[0] == "no_drift"
+    assert detector.check(features("2026-03-02 10:05:00", rsi=46.0))[0] == "drift"
+
+
+def test_answer_expires_after_max_age(detector):
+    assert detector.check(features("2026-03-02 10:25:00"))[0] == "no_drift"
+    assert detector.check(features("2026-03-02 10:30:00")) == ("stale", "")
+
+    short = DriftDetector(max_age_minutes=5)
+    short.remember(features(), "NO_TRADE")
+    assert short.check(features("2026-03-02 10:05:00")) == ("stale", "")
+
+
+def test_new_day_asks_again(detector):
+    assert detector.check(features("2026-03-03 09:30:00")) == ("new_day", "")
+
+
+def test_remember_moves_the_reference(detector):
+    moved = features("2026-03-02 10:05:00", current_price=6810.0)
+    assert detector.check(moved)[0] == "drift"
+    detector.remember(moved, "BUY_PUT")
+    assert detector.check(features("2026-03-02 10:10:00", current_price=6811.0))[0] == "no_drift"
+    assert detector.decision == "BUY_PUT"
+
+
+def test_alert_suppresses_nearby_prices_for_the_rest_of_the_day(detector):
+    detector.record_alert("2026-03-02 10:00:00", 6800.0)
+    reason, message = detector.check(features("2026-03-02 11:30:00", current_price=6817.0))
+    assert reason == "near_alert"
+    assert "6800.0" in message
+    # far enough from the alert price: the usual drift rules apply
+    assert detector.check(features("2026-03-02 10:05:00", current_price=6818.0)) == ("drift", "")
+    # the suppression only lasts for the alert's session
+    assert detector.check(features("2026-03-03 09:30:00", current_price=6801.0)) == ("new_day", "")
+
+
+def test_alert_suppression_wins_over_staleness():
+    detector = DriftDetector(alert_price_points=10)
+    detector.record_alert("2026-03-02 10:00:00", 6800.0)
+    assert detector.check(features("2026-03-02 12:00:00", current_price=6795.0))[0] == "near_alert"
+    assert detector.check(features("2026-03-02 12:00:00", current_price=6790.0)) == ("first", "")
+
+
+def test_record_alert_ignores_missing_state():
+    detector = DriftDetector()
+    detector.record_alert(None, None)
+    assert detector.check(features()) == ("first", "")
+
+
+def test_load_drift_merges_tolerances_key_by_key():
+    config = {"drift": {"max_age_minutes": 15, "tolerances": {"rsi": 1.0}}}
+    settings = load_drift(config, overrides={"alert_price_points": 10, "tolerances": {"vix": 2.0}})
+    assert settings["max_age_minutes"] == 15
+    assert settings["alert_price_points"] == 10
+    assert settings["tolerances"] == {**DEFAULT_DRIFT["tolerances"], "rsi": 1.0, "vix": 2.0}
+    assert DEFAULT_DRIFT["tolerances"]["rsi"] == 2.0                # defaults are not mutated
+    assert DriftDetector.from_config(config).max_age.total_seconds() == 15 * 60
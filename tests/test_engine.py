@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+import agent.agent as agent
+import alerts.console_alert as console_alert
+import alerts.journal as journal
+import monitor.loop as loop
+from agent.schema import TradeDecision
+from alerts.dispatcher import AlertDispatcher, FakeTransport
+from backtest.engine import run_session
+from bench.replay import ReplayClock, ReplayServer, SessionSource
+from data.fetcher import MarketDataFetcher, fetch_market_data
+from data.history import BarHistory
+from indicators.streaming import StreamingIndicators
+from monitor.loop import LoopState, run_tick
+from strategy.drift import DriftDetector
+from strategy.features import FeatureStore
+from strategy.gate import load_thresholds
+
+
+SERIES = "spx,vix,spxExpectedMove,spxOTMBids"
+
+
+def stub(features):
+    """Deterministic agent: side from RSI, confidence from the price's cents (about a third of answers alert)."""
+    confidence = round(0.4 + int(round(features["current_price"] * 100)) % 50 / 100, 2)
+    trade = "SELL_CALL" if features["rsi"] > 50 else "SELL_PUT"
+    return TradeDecision(trade=trade, confidence=confidence, reasons=["stub"], risk_flags=[])
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """Both engines against one local server replaying synthetic sessions; alerts and journal stay in memory."""
+    server = ReplayServer(source=SessionSource(seed=7), clock=ReplayClock(start="2026-03-01", speed=0), port=0).start()
+    monkeypatch.setattr(console_alert, "_dispatcher", AlertDispatcher(FakeTransport(), coalesce_sec=0))
+    monkeypatch.setattr(journal, "_journal", journal.DecisionJournal(tmp_path))
+    yield {
+        "api": {"url": server.url, "params": {"series": SERIES}, "cache_dir": None},
+        "indicators": {"rsi_period": 14},
+        "backtest": {"interval_min": 5, "history_size": 200},
+        "gate": {"rsi_neutral_low": 101},          # let most bars reach the agent
+    }
+    console_alert._dispatcher.close()
+    server.stop()
+
+
+def _stepwise(config, date_in, monkeypatch):
+    """The live loop (monitor.loop.run_tick) stepped through the session one bar at a time, as main() backtests."""
+    calls, logged, alerted = [], {}, []
+    monkeypatch.setattr(agent, "evaluate_with_agent", lambda f: calls.append(f.timestamp) or stub(f))
+    monkeypatch.setattr(loop, "log_decision", lambda d, f: logged.__setitem__(f.timestamp, (d["trade"], d["confidence"])))
+    monkeypatch.setattr(loop, "send_alert", lambda d, f: alerted.append(f.timestamp))
+
+    warmup_day = (pd.Timestamp(date_in) - pd.offsets.BDay(1)).strftime("%Y-%m-%d")
+    history = BarHistory(config["backtest"]["history_size"])
+    history.extend(fetch_market_data(config["api"], 5, date_in=warmup_day))
+    indicators = StreamingIndicators.from_history(history.to_frame(), 14, bar_minutes=5)
+    fetcher = MarketDataFetcher(config["api"], 5, last_seen=history.last_timestamp)
+    state = LoopState(history, indicators, fetcher, FeatureStore(capacity=79), load_thresholds(config),
+                      DriftDetector.from_config(config))
+    for bar in pd.date_range(f"{date_in} 09:30", f"{date_in} 15:55", freq="5min"):
+        assert run_tick(state, date_in=date_in, time_in=bar.strftime("%H:%M:%S"))["error"] is None
+    return calls, logged, alerted
+
+
+@pytest.mark.parametrize("date_in", ["2026-01-30", "2026-02-10", "2026-02-24"])
+def test_vectorized_session_matches_the_live_loop(config, date_in, monkeypatch):
+    calls = []
+    results = run_session(config, date_in, evaluate=lambda f: calls.append(f.timestamp) or stub(f))
+    step_calls, step_logged, step_alerted = _stepwise(config, date_in, monkeypatch)
+
+    evaluated = results[results["evaluated"]]
+    assert dict(zip(evaluated.index, zip(evaluated["trade"], evaluated["confidence"]))) == step_logged
+    assert list(results.index[results["alerted"]]) == step_alerted
+    assert calls == step_calls
+    assert results.attrs["agent_calls"] == len(step_calls)
+
+    assert results["in_cooldown"].any()
+    assert not (results["evaluated"] & results["in_cooldown"]).any()
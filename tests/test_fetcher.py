@@ -0,0 +1,118 @@
+import random
+import time
+
+import pytest
+import requests
+
+from bench.replay import ReplayClock, ReplayServer
+from data.fetcher import fetch_market_data
+from data.http import FetchClient, RetryableError
+
+
+DATE = "2026-01-30"
+PARAMS = {"series": "spx,vix,spxExpectedMove,spxOTMBids", "date": DATE, "interval": "300"}
+
+
+@pytest.fixture
+def server():
+    """Local aggregateData on a free port, its clock stopped after the session's close."""
+    server = ReplayServer(clock=ReplayClock(start=f"{DATE} 16:30", speed=0), port=0).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client():
+    client = FetchClient(timeout_sec=2, max_retries=3, backoff_sec=0.01)
+    yield client
+    client.close()
+
+
+def _failures_before_success(seed, error_rate):
+    """Injected errors in a row the server draws for `seed` (one latency and one error draw per request)."""
+    rng = random.Random(seed)
+    failures = 0
+    while True:
+        rng.uniform(0, 0)
+        if rng.random() >= error_rate:
+            return failures
+        failures += 1
+
+
+def test_success(server, client):
+    response = client.get(server.url, params=PARAMS)
+    assert len(response.json()) == 78
+    stats = client.stats()
+    assert (stats["requests"], stats["errors"], stats["retried"]) == (1, 0, 0)
+    assert server.stats["requests"] == 1
+
+
+def test_retries_until_success(client):
+    seed = next(s for s in range(100) if 1 <= _failures_before_success(s, 0.5) <= client.max_retries)
+    failures = _failures_before_success(seed, 0.5)
+    server = ReplayServer(clock=ReplayClock(start=f"{DATE} 16:30", speed=0), port=0, error_rate=0.5, seed=seed).start()
+    try:
+        response = client.get(server.url, params=PARAMS)
+    finally:
+        server.stop()
+    assert response.status_code == 200
+    assert server.stats["errors_injected"] == failures
+    assert client.errors == failures
+    assert client.metrics[-1]["attempts"] == failures + 1
+    assert client.stats()["retried"] == 1
+
+
+def test_gives_up_after_max_retries(server, client):
+    server.faults["error_rate"] = 1.0
+    with pytest.raises(RetryableError, match="503"):
+        client.get(server.url, params=PARAMS)
+    assert server.stats["requests"] == client.max_retries + 1
+    assert client.errors == client.max_retries + 1
+    assert client.stats()["requests"] == 0
+
+
+def test_no_backoff_past_the_deadline(server):
+    client = FetchClient(timeout_sec=2, max_retries=5, backoff_sec=0.5)
+    server.faults["error_rate"] = 1.0
+    started = time.perf_counter()
+    with pytest.raises(RetryableError):
+        client.get(server.url, params=PARAMS, deadline=time.monotonic() + 0.2)
+    assert time.perf_counter() - started < 0.2
+    assert server.stats["requests"] == 1
+    client.close()
+
+
+def test_slow_answer_times_out_at_the_deadline(server, client):
+    server.faults["latency_ms"] = 500
+    started = time.perf_counter()
+    with pytest.raises(requests.Timeout):
+        client.get(server.url, params=PARAMS, deadline=time.monotonic() + 0.1)
+    assert time.perf_counter() - started < 0.4
+
+
+def test_fetch_market_data_through_the_client(server):
+    api = {"url": server.url, "params": {"series": PARAMS["series"]}, "cache_dir": None, "backoff_sec": 0.01}
+    server.faults["error_rate"] = 0.3
+    df = fetch_market_data(api, 5, date_in=DATE, time_in="12:00:00")
+    assert len(df) == 31
+    assert str(df.index[-1]) == f"{DATE} 12:00:00-05:00"
+
+
+def test_hedged_request_stays_within_the_deadline(monkeypatch):
+    client = FetchClient(timeout_sec=2, max_retries=0, hedge_after_sec=0.05)
+    calls = []
+
+    def attempt(url, params, timeout):
+        calls.append(timeout)
+        if len(calls) == 1:
+            time.sleep(0.2)                     # the first request fails late...
+            raise requests.ConnectionError("reset")
+        time.sleep(1.0)                         # ...and the hedge hangs past its timeout
+
+    monkeypatch.setattr(client, "_attempt", attempt)
+    started = time.perf_counter()
+    with pytest.raises(requests.ConnectionError):
+        client.get("http://unused", deadline=time.monotonic() + 0.3)
+    assert time.perf_counter() - started < 0.45
+    assert len(calls) == 2 and calls[1] < 0.3
+    client.close()
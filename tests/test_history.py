@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.history import BarHistory
+from indicators.streaming import INPUT_COLUMNS
+
+
+@pytest.fixture
+def bars():
+    index = pd.date_range("2026-01-30 09:30", periods=30, freq="5min", tz="America/New_York",
+                          name="dateTime").as_unit("ns")
+    values = np.arange(30 * len(INPUT_COLUMNS), dtype="float64").reshape(30, len(INPUT_COLUMNS))
+    return pd.DataFrame(values, index=index, columns=INPUT_COLUMNS)
+
+
+def test_to_frame_is_oldest_to_newest_after_wraparound(bars):
+    history = BarHistory(8)
+    for start in range(0, 30, 7):           # chunks that straddle the end of the buffer
+        history.extend(bars.iloc[start:start + 7])
+    assert len(history) == 8
+    pd.testing.assert_frame_equal(history.to_frame(), bars.iloc[-8:], check_freq=False)
+    assert history.last_timestamp == bars.index[-1]
+
+
+def test_append_wraps_around(bars):
+    history = BarHistory(5)
+    for ts, row in bars.iloc[:13].iterrows():
+        assert history.append(ts, row)
+    pd.testing.assert_frame_equal(history.to_frame(), bars.iloc[8:13], check_freq=False)
+
+
+def test_extend_longer_than_capacity_keeps_the_newest(bars):
+    history = BarHistory(4)
+    accepted = history.extend(bars)
+    assert len(accepted) == 30              # every bar was new, only the window is kept
+    pd.testing.assert_frame_equal(history.to_frame(), bars.iloc[-4:], check_freq=False)
+
+
+def test_append_rejects_stale_and_duplicate_bars(bars):
+    history = BarHistory(10)
+    history.extend(bars.iloc[:5])
+    assert not history.append(bars.index[4], bars.iloc[4])          # duplicate
+    assert not history.append(bars.index[2], bars.iloc[2])          # stale
+    assert len(history) == 5
+    assert history.append(bars.index[5], bars.iloc[5])
+
+
+def test_extend_returns_only_new_rows(bars):
+    history = BarHistory(50)
+    history.extend(bars.iloc[:10])
+    accepted = history.extend(bars.iloc[5:15])                      # re-fetched overlap
+    pd.testing.assert_index_equal(accepted.index, bars.index[10:15])
+    assert history.extend(bars.iloc[:15]).empty
+    assert len(history) == 15
+
+
+def test_extend_drops_repeats_and_out_of_order_rows_in_a_frame(bars):
+    messy = bars.iloc[[0, 1, 1, 3, 2, 4]]
+    history = BarHistory(10)
+    accepted = history.extend(messy)
+    pd.testing.assert_index_equal(accepted.index, bars.index[[0, 1, 3, 4]])
+    pd.testing.assert_frame_equal(history.to_frame(), bars.iloc[[0, 1, 3, 4]])
+
+
+def test_empty(bars):
+    history = BarHistory(3)
+    assert history.last_timestamp is None
+    assert history.to_frame().empty
+    assert history.extend(bars.iloc[:0]).empty
@@ -0,0 +1,93 @@
+import json
+
+import pandas as pd
+
+import alerts.journal as journal
+from alerts.journal import DecisionJournal, journal_paths, load_journals
+
+
+def _row(ts, **extra):
+    return {"timestamp": ts, "spx_price": 6900.0, "rsi": 71.5, "suggestion": "SELL_CALL", "confidence": 0.8, **extra}
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+def test_flushes_every_flush_rows(tmp_path):
+    j = DecisionJournal(tmp_path, flush_rows=3, flush_sec=3600)
+    path = j.path_for("2026-01-30 10:00:00")
+    for minute in range(5):
+        j.append(_row(f"2026-01-30 10:{minute:02d}:00"))
+    assert len(_lines(path)) == 3
+    j.flush()
+    assert [r["timestamp"] for r in _lines(path)] == [f"2026-01-30 10:{m:02d}:00" for m in range(5)]
+
+
+def test_flush_if_due(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(journal.time, "monotonic", lambda: now[0])
+    j = DecisionJournal(tmp_path, flush_rows=50, flush_sec=30)
+    path = j.path_for("2026-01-30")
+
+    j.append(_row("2026-01-30 10:00:00"))
+    j.flush_if_due()
+    assert not path.exists()
+
+    now[0] += 30          # a quiet stretch: no append, the loop's per-tick call writes it out
+    j.flush_if_due()
+    assert len(_lines(path)) == 1
+
+    j.flush_if_due()      # nothing buffered, nothing written
+    assert len(_lines(path)) == 1
+
+
+def test_one_file_per_session_day(tmp_path):
+    j = DecisionJournal(tmp_path, flush_rows=50)
+    j.append(_row("2026-01-29 15:55:00"))
+    j.append(_row("2026-01-30 09:35:00"))
+    j.flush()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["2026-01-29_alert_log.jsonl", "2026-01-30_alert_log.jsonl"]
+
+
+def test_nan_and_numpy_values(tmp_path):
+    j = DecisionJournal(tmp_path)
+    j.append(_row("2026-01-30 10:00:00", rsi=float("nan"), vix=pd.Series([16.5]).iloc[0]))
+    j.flush()
+    record = _lines(j.path_for("2026-01-30"))[0]
+    assert record["rsi"] is None
+    assert record["vix"] == 16.5
+    assert record["result"] == ""
+    assert list(record) == journal.JOURNAL_FIELDS
+
+
+def test_load_journals_reads_jsonl_and_legacy_csv(tmp_path):
+    j = DecisionJournal(tmp_path)
+    j.append(_row("2026-01-30 10:05:00", result="profit"))
+    j.append(_row("2026-01-30 09:45:00"))
+    j.flush()
+    pd.DataFrame([_row("2026-01-29 14:00:00", suggestion="SELL_PUT")]).to_csv(tmp_path / "2026-01-29_alert_log.csv",
+                                                                             index=False)
+
+    patterns = [str(tmp_path / pattern) for pattern in journal.JOURNAL_PATTERNS]
+    assert [p.rsplit("/", 1)[-1] for p in journal_paths(patterns)] == ["2026-01-29_alert_log.csv",
+                                                                        "2026-01-30_alert_log.jsonl"]
+    df = load_journals(patterns)
+    assert list(df.columns) == journal.JOURNAL_FIELDS
+    assert list(df["timestamp"]) == [pd.Timestamp("2026-01-29 14:00"), pd.Timestamp("2026-01-30 09:45"),
+                                     pd.Timestamp("2026-01-30 10:05")]
+    assert list(df["suggestion"]) == ["SELL_PUT", "SELL_CALL", "SELL_CALL"]
+    assert df["result"].iloc[-1] == "profit"
+
+
+def test_journal_paths_deduplicates(tmp_path):
+    path = tmp_path / "2026-01-30_alert_log.jsonl"
+    path.write_text("")
+    assert journal_paths([str(path), str(tmp_path / "*.jsonl")]) == [str(path)]
+    assert journal_paths(path) == [str(path)]
+
+
+def test_load_journals_with_no_files(tmp_path):
+    df = load_journals(str(tmp_path / "*_alert_log.jsonl"))
+    assert df.empty
+    assert list(df.columns) == journal.JOURNAL_FIELDS
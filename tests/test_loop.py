@@ -0,0 +1,90 @@
+import pandas as pd
+import pytest
+
+import agent.agent as agent
+import alerts.console_alert as console_alert
+import alerts.journal as journal
+from agent.rules import RulesDecider
+from alerts.dispatcher import AlertDispatcher, FakeTransport
+from bench.replay import ReplayClock, ReplayServer
+from data.fetcher import MarketDataFetcher, fetch_market_data
+from data.history import BarHistory
+from indicators.streaming import StreamingIndicators
+from monitor.loop import LoopState, run_tick
+from monitor.metrics import get_metrics
+from strategy.drift import DriftDetector
+from strategy.features import FeatureStore
+from strategy.gate import load_thresholds
+
+
+DATE = "2026-01-30"
+
+
+@pytest.fixture
+def server():
+    server = ReplayServer(clock=ReplayClock(start=f"{DATE} 10:00:05", speed=0), port=0).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def state(server, tmp_path, monkeypatch):
+    """The live loop's state against the replay server: rules agent, fake Telegram, journal in tmp_path."""
+    monkeypatch.setattr(agent, "rules", RulesDecider())
+    monkeypatch.setattr(console_alert, "_dispatcher", AlertDispatcher(FakeTransport(), coalesce_sec=0))
+    monkeypatch.setattr(journal, "_journal", journal.DecisionJournal(tmp_path, flush_sec=0))
+
+    api = {"url": server.url, "params": {"series": "spx,vix,spxExpectedMove,spxOTMBids"}, "cache_dir": None,
+           "max_retries": 0, "backoff_sec": 0.01}
+    history = BarHistory(240)
+    history.extend(fetch_market_data(api, 5, date_in="2026-01-29"))
+    indicators = StreamingIndicators.from_history(history.to_frame(), 14, bar_minutes=5)
+    fetcher = MarketDataFetcher(api, 5, last_seen=history.last_timestamp)
+    thresholds = {**load_thresholds({}), "rsi_neutral_low": 101}        # let most bars reach the agent
+    yield LoopState(history, indicators, fetcher, FeatureStore(capacity=79), thresholds, DriftDetector.from_config({}))
+    console_alert._dispatcher.close()
+
+
+def _counter(name):
+    return get_metrics().counters().get(name, 0)
+
+
+def _journal_rows(tmp_path):
+    path = tmp_path / f"{DATE}_alert_log.jsonl"
+    return len(path.read_text().splitlines()) if path.exists() else 0
+
+
+def test_ticks_follow_the_session(server, state, tmp_path):
+    result = run_tick(state, date_in="live")
+    assert (result["new_bars"], result["error"]) == (7, None)           # 09:30 … 10:00
+    assert state.history.last_timestamp == pd.Timestamp(f"{DATE} 10:00", tz="America/New_York")
+    logged = _journal_rows(tmp_path)
+    assert logged == 1
+
+    server.clock.set(at=f"{DATE} 10:05:05")
+    result = run_tick(state, date_in="live")
+    assert result["new_bars"] == 1
+    assert state.feature_store[-1].timestamp == pd.Timestamp(f"{DATE} 10:05", tz="America/New_York")
+
+
+def test_no_new_bar_is_not_evaluated_again(state, tmp_path):
+    run_tick(state, date_in="live")
+    logged, stale = _journal_rows(tmp_path), _counter("stale_ticks_total")
+
+    result = run_tick(state, date_in="live")
+    assert (result["new_bars"], result["agent"], result["alerted"]) == (0, False, False)
+    assert _counter("stale_ticks_total") == stale + 1
+    assert _journal_rows(tmp_path) == logged
+
+
+def test_errors_are_counted_not_raised(server, state):
+    server.faults["error_rate"] = 1.0
+    errors, ticks = _counter('tick_errors_total{error="RetryableError"}'), get_metrics().ticks
+
+    result = run_tick(state, date_in="live")
+    assert result["error"] == "RetryableError"
+    assert _counter('tick_errors_total{error="RetryableError"}') == errors + 1
+    assert get_metrics().ticks == ticks + 1
+
+    server.faults["error_rate"] = 0.0
+    assert run_tick(state, date_in="live")["new_bars"] == 7
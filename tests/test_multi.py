@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+import alerts.console_alert as console_alert
+import alerts.journal as journal
+from agent.schema import TradeDecision
+from alerts.dispatcher import AlertDispatcher, FakeTransport
+from bench.synthetic import generate_session
+from indicators.resample import resample_frame
+from indicators.streaming import INPUT_COLUMNS, StreamingIndicators
+from monitor.checkpoint import Checkpoint
+from monitor.multi import load_strategies
+from strategy.features import FeatureStore
+
+
+CONFIG = {
+    "live": {"interval_min": 5, "history_size": 120},
+    "indicators": {"rsi_period": 14},
+    "api": {"params": {"series": "spx,vix,spxExpectedMove,spxOTMBids"}},
+    "strategies": [{"name": "fast", "cooldown_minutes": 15}, {"name": "slow", "cooldown_minutes": 60}],
+}
+
+
+@pytest.fixture
+def features():
+    """Feature records for every 5-minute bar of one synthetic session."""
+    bars = resample_frame(generate_session("2026-01-30", seed=4), 5)[INPUT_COLUMNS]
+    indicators, store = StreamingIndicators(bar_minutes=5), FeatureStore(capacity=79)
+    return [store.append(ts, indicators.update(ts, bar)) for ts, bar in bars.iterrows()]
+
+
+@pytest.fixture
+def checkpoint(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(console_alert, "_dispatcher", AlertDispatcher(FakeTransport(), coalesce_sec=0))
+    monkeypatch.setattr(journal, "_journal", journal.DecisionJournal(tmp_path))
+    yield Checkpoint(tmp_path / "monitor_state.sqlite")
+    console_alert._dispatcher.close()
+
+
+def _restart(checkpoint):
+    strategies = {s.name: s for s in load_strategies(CONFIG)}
+    for strategy in strategies.values():
+        strategy.restore(checkpoint)
+    return strategies
+
+
+def test_alert_state_survives_a_restart(features, checkpoint):
+    fast, slow = _restart(checkpoint).values()
+    alert_bar = features[12]
+    fast.on_decision(TradeDecision(trade="SELL_CALL", confidence=0.9, reasons=["test"], risk_flags=[]), alert_bar)
+    assert (fast.last_alert_time, fast.last_alert_price) == (alert_bar.timestamp, alert_bar["current_price"])
+
+    restarted = _restart(checkpoint)
+    assert restarted["fast"].last_alert_time == alert_bar.timestamp
+    assert restarted["fast"].last_alert_price == alert_bar["current_price"]
+    assert restarted["slow"].last_alert_time is None
+
+    # inside the cooldown the restarted strategy still does not ask the agent
+    assert not restarted["fast"].wants_agent(features[13], features[13].timestamp)
+    # and the rest of the day, its drift filter still knows the alert price
+    assert restarted["fast"].drift.check(alert_bar)[0] == "near_alert"
+
+
+def test_strategies_without_a_record_inherit_the_shared_state(checkpoint):
+    alert_time = pd.Timestamp("2026-01-30 11:00", tz="America/New_York")
+    checkpoint.save_alert(alert_time, 6900.0)
+    checkpoint.save_alert(alert_time + pd.Timedelta(minutes=30), 6950.0, "alert:slow")
+
+    strategies = _restart(checkpoint)
+    assert strategies["fast"].last_alert_time == alert_time
+    assert strategies["slow"].last_alert_price == 6950.0
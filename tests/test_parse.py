@@ -0,0 +1,53 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import generate_session, to_payload
+from data.parse import SERIES_COLUMNS, parse_aggregate
+
+
+@pytest.fixture
+def session():
+    return generate_session("2026-01-30", seed=2)
+
+
+def _records(session):
+    return json.loads(to_payload(session))
+
+
+def test_fast_path_matches_full_decode(session):
+    payload = to_payload(session)
+    fast = parse_aggregate(payload, 5)
+    # a space after every colon defeats the byte scanner, so this goes through the fallback
+    slow = parse_aggregate(json.dumps(_records(session), separators=(", ", " : ")), 5)
+    pd.testing.assert_frame_equal(fast, slow)
+    assert len(fast) == 78
+    pd.testing.assert_frame_equal(parse_aggregate(payload, None), session[SERIES_COLUMNS], check_names=False)
+
+
+def test_since_keeps_only_newer_bars(session):
+    since = pd.Timestamp("2026-01-30 15:30", tz="America/New_York")
+    df = parse_aggregate(to_payload(session), 5, since=since)
+    assert df.index[0] == since + pd.Timedelta(minutes=5)
+    assert len(df) == 5
+
+
+@pytest.mark.parametrize("separators", [(",", ":"), (", ", " : ")])     # fast path, fallback
+def test_missing_key_is_nan(session, separators):
+    records = _records(session)
+    del records[60]["vix"]
+    records[66]["spxOTMBids"] = None
+    df = parse_aggregate(json.dumps(records, separators=separators), None)
+    assert len(df) == len(records)
+    assert np.isnan(df["vix"].iloc[60])
+    assert np.isnan(df["spxOTMBids"].iloc[66])
+    assert df["vix"].isna().sum() == 1
+    assert df["spx"].notna().all()
+
+
+def test_dict_of_columns(session):
+    records = _records(session)
+    columns = {key: [row[key] for row in records] for key in records[0]}
+    pd.testing.assert_frame_equal(parse_aggregate(json.dumps(columns), 5), parse_aggregate(to_payload(session), 5))
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import generate_days
+from indicators.resample import TIMEFRAMES, BarResampler, resample_all, resample_frame
+
+
+@pytest.fixture
+def points():
+    """Two synthetic sessions of 30-second rows, with ~10% of the rows (bar boundaries included) missing."""
+    frame = pd.concat(generate_days("2026-01-29", days=2, seed=3).values())
+    keep = np.random.default_rng(0).random(len(frame)) > 0.1
+    return frame[keep]
+
+
+def test_resampler_matches_resample_frame(points):
+    bars = BarResampler().extend(points)
+    for minutes in TIMEFRAMES:
+        expected = resample_frame(points, minutes)
+        # the still-open last bar is only emitted by the vectorized version
+        pd.testing.assert_frame_equal(bars[minutes], expected.iloc[:len(bars[minutes])], check_freq=False)
+        assert len(expected) - len(bars[minutes]) <= 1
+
+
+def test_resample_all_matches_resample_frame(points):
+    for minutes, frame in resample_all(points).items():
+        pd.testing.assert_frame_equal(frame, resample_frame(points, minutes), check_freq=False)
+
+
+def test_point_by_point_matches_one_pass(points):
+    streamed = BarResampler()
+    chunks = {tf: [] for tf in TIMEFRAMES}
+    for lo in range(0, len(points), 7):
+        for tf, frame in streamed.extend(points.iloc[lo:lo + 7]).items():
+            chunks[tf].append(frame)
+    one_pass = BarResampler().extend(points)
+    for tf in TIMEFRAMES:
+        pd.testing.assert_frame_equal(pd.concat(chunks[tf]), one_pass[tf], check_freq=False)
+
+
+def test_bar_closes_on_its_boundary_point(points):
+    resampler = BarResampler(timeframes=(5,))
+    session = points.loc["2026-01-30"]
+    boundary = session.index[(session.index.minute % 5 == 0) & (session.index.second == 0)][3]
+    done = []
+    for ts, row in session.loc[:boundary].iterrows():
+        done = resampler.update(ts, row)
+    assert [(tf, ts) for tf, ts, _ in done] == [(5, boundary)]
+    assert done[0][2]["spx"] == session.loc[boundary, "spx"]
+
+
+def test_repeated_points_are_ignored(points):
+    resampler = BarResampler()
+    resampler.extend(points.iloc[:100])
+    assert resampler.update(points.index[50], points.iloc[50]) == []
@@ -0,0 +1,104 @@
+import pandas as pd
+import pytest
+
+from monitor.scheduler import BarScheduler, VirtualClock
+
+
+def et(s):
+    return pd.Timestamp(s, tz="America/New_York")
+
+
+def scheduler_at(start, **kwargs):
+    return BarScheduler(5, offset_sec=5, clock=VirtualClock(pd.Timestamp(start)), **kwargs)
+
+
+def test_virtual_clock_jumps_forward_only():
+    clock = VirtualClock(pd.Timestamp("2026-03-02 10:00"))
+    assert clock.now() == et("2026-03-02 10:00")
+    clock.sleep_until(et("2026-03-02 10:05"))
+    assert clock.now() == et("2026-03-02 10:05")
+    clock.sleep_until(et("2026-03-02 09:00"))               # never goes back
+    assert clock.now() == et("2026-03-02 10:05")
+    assert clock.deadline(et("2026-03-02 10:10")) is None
+
+
+@pytest.mark.parametrize("now, expected", [
+    ("2026-03-02 08:00:00", "2026-03-02 09:30"),        # before the open
+    ("2026-03-02 10:02:00", "2026-03-02 10:05"),        # mid-bar
+    ("2026-03-02 10:05:03", "2026-03-02 10:05"),        # bar closed, wake-up still ahead
+    ("2026-03-02 10:05:06", "2026-03-02 10:10"),        # wake-up passed
+    ("2026-03-02 15:58:00", "2026-03-02 16:00"),        # the closing bar is a session bar
+    ("2026-03-02 16:00:06", "2026-03-03 09:30"),        # after the close
+    ("2026-03-06 16:30:00", "2026-03-09 09:30"),        # Friday evening → Monday
+    ("2026-01-16 17:00:00", "2026-01-20 09:30"),        # weekend + MLK day
+    ("2026-04-02 16:30:00", "2026-04-06 09:30"),        # Good Friday
+    ("2026-12-24 16:30:00", "2026-12-28 09:30"),        # Christmas Friday + weekend
+])
+def test_next_bar(now, expected):
+    scheduler = scheduler_at(now)
+    assert scheduler.next_bar(et(now)) == et(expected)
+
+
+def test_configured_holidays_are_skipped():
+    scheduler = scheduler_at("2026-03-02 16:30", holidays=["2026-03-03"])
+    assert not scheduler.is_trading_day("2026-03-03")
+    assert scheduler.next_bar() == et("2026-03-04 09:30")
+
+
+def test_early_close_days_trade_the_full_session():
+    # early closes are not modelled: the day still trades and bars run to the regular close
+    scheduler = scheduler_at("2026-11-27 12:58")
+    assert scheduler.is_trading_day("2026-11-27")
+    assert not scheduler.is_trading_day("2026-11-26")
+    assert scheduler.next_bar(et("2026-11-27 13:01")) == et("2026-11-27 13:05")
+    assert scheduler.next_bar(et("2026-11-27 15:58")) == et("2026-11-27 16:00")
+
+
+def test_wait_returns_consecutive_bars_at_their_wake_up_time():
+    scheduler = scheduler_at("2026-03-02 09:29:55")
+    for expected in ["09:30", "09:35", "09:40"]:
+        bar = scheduler.wait()
+        assert bar == et(f"2026-03-02 {expected}")
+        assert scheduler.clock.now() == bar + pd.Timedelta(seconds=5)
+    assert scheduler.skipped == 0
+
+
+def test_wait_skips_bars_missed_by_a_slow_tick():
+    scheduler = scheduler_at("2026-03-02 09:59:55")
+    assert scheduler.wait() == et("2026-03-02 10:00")
+    scheduler.clock.sleep_until(et("2026-03-02 10:12"))       # the tick overran two bars
+    assert scheduler.wait() == et("2026-03-02 10:15")
+    assert scheduler.skipped == 2
+
+
+def test_wait_rolls_over_to_the_next_session():
+    scheduler = scheduler_at("2026-03-06 15:59:55")
+    assert scheduler.wait() == et("2026-03-06 16:00")
+    assert scheduler.wait() == et("2026-03-09 09:30")
+    assert scheduler.clock.now() == et("2026-03-09 09:30:05")
+    assert scheduler.skipped == 0                            # overnight gaps are not missed bars
+
+
+def test_start_now_returns_the_last_closed_bar_immediately():
+    scheduler = scheduler_at("2026-03-02 10:07", start_now=True)
+    assert scheduler.wait() == et("2026-03-02 10:05")
+    assert scheduler.clock.now() == et("2026-03-02 10:07")   # no sleep
+    assert scheduler.wait() == et("2026-03-02 10:10")
+
+    assert scheduler_at("2026-03-02 10:07").wait() == et("2026-03-02 10:10")
+
+
+def test_start_now_outside_the_session_waits_for_the_open():
+    scheduler = scheduler_at("2026-03-02 09:30:02", start_now=True)   # opening bar not due yet
+    assert scheduler.wait() == et("2026-03-02 09:30")
+    assert scheduler.clock.now() == et("2026-03-02 09:30:05")
+
+    scheduler = scheduler_at("2026-03-07 11:00", start_now=True)      # Saturday
+    assert scheduler.wait() == et("2026-03-09 09:30")
+
+
+def test_deadline_is_none_on_a_virtual_clock():
+    scheduler = scheduler_at("2026-03-02 09:29:55")
+    assert scheduler.deadline() is None
+    scheduler.wait()
+    assert scheduler.deadline() is None
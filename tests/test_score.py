@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtest.score as score_module
+from alerts.journal import DecisionJournal, lock_journal
+from backtest.score import fill_results, score
+from bench.synthetic import generate_session
+
+
+DATE = "2026-01-30"
+
+
+@pytest.fixture
+def bars():
+    session = generate_session(DATE, seed=5)
+    n = len(session)
+    return session, {"ts": session.index.as_unit("ns").asi8, "spx": session["spx"].to_numpy(),
+                     "session": np.zeros(n, dtype=int), "last": np.array([n - 1]), "dates": [DATE]}
+
+
+def _decision(session, at, suggestion, expected_move, **extra):
+    return {"timestamp": f"{DATE} {at}", "suggestion": suggestion, "confidence": 0.8,
+            "spx_price": float(session.loc[f"{DATE} {at}", "spx"]), "expected_move": expected_move, **extra}
+
+
+def test_wide_strikes_win_and_tight_ones_breach(bars):
+    session, path = bars
+    rows = [_decision(session, "10:00:00", "SELL_CALL", 1000.0), _decision(session, "10:00:00", "SELL_PUT", 0.01),
+            _decision(session, "10:00:00", "NONE", 40.0)]
+    frame = pd.DataFrame(rows)
+    frame["timestamp"] = pd.to_datetime(frame["timestamp"])
+    out = score(frame, path, multiples=[1.0])
+    assert out["win_1x"].iloc[0] == 1 and out["breach_1x"].iloc[0] == 0
+    assert out["breach_1x"].iloc[1] == 1
+    assert np.isnan(out["win_1x"].iloc[2])
+    assert out["close_price"].iloc[0] == session["spx"].iloc[-1]
+
+
+def test_fill_results_keeps_rows_appended_while_scoring(bars, tmp_path, monkeypatch):
+    session, path = bars
+    journal = DecisionJournal(tmp_path)
+    journal.append(_decision(session, "10:00:00", "SELL_CALL", 1000.0))
+    journal.append(_decision(session, "11:00:00", "SELL_PUT", 1000.0, result="loss"))      # entered by hand
+    journal.flush()
+
+    def load_bars(config, dates, interval=None):
+        # the live monitor flushes a new decision while the scorer is still working on its snapshot
+        journal.append(_decision(session, "15:00:00", "SELL_CALL", 1000.0))
+        journal.flush()
+        return path
+
+    monkeypatch.setattr(score_module, "load_bars", load_bars)
+    journal_path = journal.path_for(DATE)
+    assert fill_results(journal_path, {}, 1.0) == 1
+
+    records = [json.loads(line) for line in journal_path.read_text().splitlines()]
+    assert [r["timestamp"] for r in records] == [f"{DATE} 10:00:00", f"{DATE} 11:00:00", f"{DATE} 15:00:00"]
+    assert [r["result"] for r in records] == ["profit", "loss", ""]
+
+
+
+def test_append_waiting_on_a_rewrite_lands_in_the_new_file(tmp_path):
+    journal = DecisionJournal(tmp_path)
+    path = journal.path_for(DATE)
+    path.write_text('{"timestamp":"old"}\n')
+    journal.append({"timestamp": f"{DATE} 15:30:00"})
+
+    with lock_journal(path):
+        writer = threading.Thread(target=journal.flush)
+        writer.start()
+        time.sleep(0.1)                      # the writer has opened the old file and waits for the lock
+        tmp = path.with_name("rewritten.tmp")
+        tmp.write_text('{"timestamp":"rewritten"}\n')
+        os.replace(tmp, path)
+    writer.join(5)
+
+    assert [json.loads(line)["timestamp"] for line in path.read_text().splitlines()] == ["rewritten", f"{DATE} 15:30:00"]
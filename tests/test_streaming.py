@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.streaming import StreamingIndicators
+from indicators.technicals import add_indicators
+
+
+@pytest.fixture
+def bars():
+    """Random-walk 5-minute session, the four API series."""
+    rng = np.random.default_rng(0)
+    n = 300
+    index = pd.date_range("2026-01-30 09:30", periods=n, freq="5min", tz="America/New_York")
+    return pd.DataFrame({
+        "spx": 6900 + np.cumsum(rng.normal(0, 3, n)),
+        "vix": 16 + rng.normal(0, 0.2, n),
+        "spxExpectedMove": 40 + rng.normal(0, 1, n),
+        "spxOTMBids": 150 + rng.normal(0, 5, n),
+    }, index=index)
+
+
+def _assert_matches(rows, expected):
+    for col in rows.columns:
+        np.testing.assert_allclose(rows[col].astype(float), expected[col].astype(float), rtol=1e-9, atol=1e-8,
+                                   err_msg=col)
+
+
+def test_update_matches_add_indicators(bars):
+    expected = add_indicators(bars).iloc[100:]
+    engine = StreamingIndicators.from_history(bars.iloc[:100])
+    rows = pd.DataFrame([engine.update(ts, row) for ts, row in bars.iloc[100:].iterrows()], index=expected.index)
+    _assert_matches(rows, expected)
+
+
+@pytest.mark.parametrize("missing", [[150], [150, 151, 152], [10, 150]])
+def test_missing_spx_prints_match_add_indicators(bars, missing):
+    # a NaN print must not poison the EMAs / MACD / RSI for the rest of the run
+    bars.iloc[missing, bars.columns.get_loc("spx")] = np.nan
+    expected = add_indicators(bars).iloc[100:]
+    engine = StreamingIndicators.from_history(bars.iloc[:100])
+    rows = pd.DataFrame([engine.update(ts, row) for ts, row in bars.iloc[100:].iterrows()], index=expected.index)
+    _assert_matches(rows, expected)
+    assert not rows.iloc[-1].isna().any()
+
+
+@pytest.mark.parametrize("warm_up", [1, 40, 120])
+def test_from_history_last_row(bars, warm_up):
+    engine = StreamingIndicators.from_history(bars.iloc[:warm_up])
+    expected = add_indicators(bars.iloc[:warm_up]).iloc[-1]
+
+    assert engine.last_timestamp == bars.index[warm_up - 1]
+    for col, value in engine.last_row.items():
+        np.testing.assert_allclose(float(value), float(expected[col]), rtol=1e-9, atol=1e-8, err_msg=col)
+
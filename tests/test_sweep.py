@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from backtest.sweep import build_grid, features_cache_path, sweep
+from strategy.gate import DEFAULT_THRESHOLDS, gate_mask
+
+
+@pytest.fixture
+def features():
+    """20 sessions of 5-minute bars with gate features spread across every rule's thresholds."""
+    rng = np.random.default_rng(0)
+    n = 20 * 78
+    f = {
+        "vix": rng.normal(16, 3, n).round(2),
+        "time_to_close_min": np.tile(390 - 5 * np.arange(78), 20).astype(float),
+        "ret_5min_pct": rng.normal(0, 0.5, n).round(2),
+        "ret_15min_pct": rng.normal(0, 0.9, n).round(2),
+        "ema21_slope_5min": rng.normal(0, 2, n).round(6),
+        "premium_ratio": rng.normal(3.5, 0.6, n).round(2),
+        "rsi": rng.uniform(0, 100, n).round(1),
+    }
+    f["rsi"][::97] = np.nan
+    return f
+
+
+def _expected(features, thresholds, bucket_minutes=30):
+    mask, _ = gate_mask(pd.DataFrame(features), thresholds)
+    n_buckets = int(np.ceil(390 / bucket_minutes))
+    bucket = np.clip((390 - features["time_to_close_min"]) // bucket_minutes, 0, n_buckets - 1).astype(int)
+    return mask.sum(), np.bincount(bucket[mask], minlength=n_buckets)
+
+
+def test_sweep_matches_gate_mask(features):
+    with open("config/sweep.yaml", "r") as f:
+        grid = build_grid(yaml.safe_load(f))
+    result = sweep(features, grid)
+
+    for i in np.random.default_rng(1).integers(0, len(grid), 25):
+        count, per_bucket = _expected(features, grid.iloc[i].to_dict())
+        assert result["pass_count"].iloc[i] == count
+        assert (result.iloc[i, -13:].to_numpy() == per_bucket).all()
+
+
+def test_uneven_buckets_and_chunks(features):
+    # drop bars so buckets are not multiples of 8 (padding bits must never count)
+    keep = np.random.default_rng(2).random(len(features["vix"])) < 0.7
+    features = {col: values[keep] for col, values in features.items()}
+    grid = build_grid({"min_vix": [13.0, 15.0], "min_premium_ratio": [3.0, 3.5, 4.0]})
+
+    result = sweep(features, grid, bucket_minutes=45, chunk_size=4)
+    assert result.equals(sweep(features, grid, bucket_minutes=45))
+    for i in range(len(grid)):
+        count, per_bucket = _expected(features, grid.iloc[i].to_dict(), bucket_minutes=45)
+        assert result["pass_count"].iloc[i] == count
+        assert (result.iloc[i, -len(per_bucket):].to_numpy() == per_bucket).all()
+
+
+def test_build_grid_keeps_base_thresholds():
+    grid = build_grid({"min_vix": [12.0, 14.0], "rsi_neutral_low": [35, 40, 45]})
+    assert len(grid) == 6
+    assert list(grid.columns) == list(DEFAULT_THRESHOLDS)
+    assert (grid["max_vix"] == DEFAULT_THRESHOLDS["max_vix"]).all()
+
+
+def test_win_rate_counts_outcomes_of_passed_bars(features):
+    rng = np.random.default_rng(3)
+    features = {**features, "win": rng.integers(0, 2, len(features["vix"])).astype(float)}
+    features["win"][::13] = np.nan                      # unknown outcomes count for neither side
+    grid = build_grid({"min_vix": [13.0, 15.0], "rsi_neutral_low": [35, 45]})
+
+    result = sweep(features, grid, chunk_size=3)
+    for i in range(len(grid)):
+        mask, _ = gate_mask(pd.DataFrame({k: v for k, v in features.items() if k != "win"}), grid.iloc[i].to_dict())
+        outcomes = features["win"][mask]
+        outcomes = outcomes[~np.isnan(outcomes)]
+        assert result["wins"].iloc[i] == outcomes.sum()
+        assert result["win_rate"].iloc[i] == pytest.approx(outcomes.mean())
+
+
+def test_no_outcome_column_means_no_win_rate(features):
+    result = sweep(features, build_grid({"min_vix": [13.0]}))
+    assert "win_rate" not in result
+
+
+def test_feature_cache_path_depends_on_the_feature_settings():
+    with open("config/strategy.yaml", "r") as f:
+        config = yaml.safe_load(f)
+    base = features_cache_path(config, "2026-01-02", "2026-01-30")
+    variants = [
+        {**config, "backtest": {**config["backtest"], "interval_min": 10}},
+        {**config, "indicators": {**config["indicators"], "rsi_period": 9}},
+        {**config, "api": {**config["api"], "params": {"series": "spx,vix"}}},
+        {**config, "risk": {"safe_move_multiplier": 2.0}},
+    ]
+    paths = {base} | {features_cache_path(c, "2026-01-02", "2026-01-30") for c in variants}
+    assert len(paths) == len(variants) + 1